@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Scalability benchmark: solver cost on synthetic leagues of growing size.
+
+Every league size (divisions x teams, see fix_gen.synthetic) is solved with
+every generator configuration, each run in a fresh process so its peak
+memory can be measured. Records model size, build time (everything before
+the solve), time to first feasible solution, time to the best solution,
+final penalty, validation issues and peak resident memory after the build
+and after the solve, and prints a comparison table. Times to first/best are from the start of the solve.
+
+Usage:
+    python benchmarks/bench_scaling.py                                # 4x10, 8x10, 18x10
+    python benchmarks/bench_scaling.py --sizes 18x10 24x12 --configs boolean week_var
+    python benchmarks/bench_scaling.py --save results.json            # Record a baseline
+    python benchmarks/bench_scaling.py --baseline results.json        # Flag regressions (exit 1)
+
+Configurations: boolean, week_var, table, symmetry, cold (no warm start),
+free (non-mirrored season), debug (named variables, i.e. not a lean build),
+reified (fully reified soft-constraint literals, the original encoding).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fix_gen import FixtureGenerator, validate_fixtures  # noqa: E402
+from fix_gen.config import NUM_SEARCH_WORKERS  # noqa: E402
+from fix_gen.instrumentation import peak_memory_mb  # noqa: E402
+from fix_gen.synthetic import synthetic_league  # noqa: E402
+
+CONFIGS = {
+    "boolean": {"engine": "boolean"},
+    "week_var": {"engine": "week_var"},
+    "table": {"sequence_mode": "table"},
+    "symmetry": {"symmetry_breaking": True},
+    "cold": {"warm_start": False},
+    "free": {"mirrored": False},
+    "debug": {"lean": False},
+    "reified": {"soft_encoding": "full"},
+}
+
+# Metrics compared against a baseline; lower is better for all of them
+COMPARED = ("build", "first", "best", "objective", "build_mb", "peak_mb")
+
+# Phases after model building
+SOLVE_PHASES = {"solve", "extract", "record"}
+
+
+def parse_size(spec: str) -> tuple[int, int]:
+    """Parse "NxM" (N divisions of M teams)."""
+    divisions, teams = spec.lower().split("x")
+    return int(divisions), int(teams)
+
+
+def run(size: str, config: str, league_options: dict, seed: int, time_limit: float, num_workers: int) -> dict:
+    """Solve one league with one configuration (runs in a fresh worker process)."""
+    num_divisions, teams_per_division = parse_size(size)
+    league = synthetic_league(num_divisions, teams_per_division, **league_options)
+    generator = FixtureGenerator(
+        league.divisions, league.fixed_matches, league.venue_requirements, league.venue_conflicts
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        fixtures = generator.generate(seed=seed, time_limit=time_limit, num_workers=num_workers, **CONFIGS[config])
+    trace = generator.trace
+    return {
+        "size": size,
+        "config": config,
+        "teams": sum(len(div.teams) for div in league.divisions),
+        "variables": trace.model_stats.get("variables"),
+        "constraints": trace.model_stats.get("constraints"),
+        "build": sum(t for phase, t in trace.phases.items() if phase not in SOLVE_PHASES),
+        "first": trace.first_solution_time(),
+        "best": trace.best_solution_time(),
+        "objective": generator.objective,
+        "status": generator.status,
+        "issues": len(validate_fixtures(fixtures, league.divisions)) if fixtures else None,
+        "build_mb": trace.memory.get("build"),
+        "peak_mb": peak_memory_mb(),
+    }
+
+
+def fmt(value: float | None, digits: int = 1) -> str:
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def print_table(rows: list[dict]) -> None:
+    print(
+        f"{'size':<7} {'config':<9} {'teams':>5} {'vars':>7} {'cons':>7} {'build (s)':>9} "
+        f"{'first (s)':>9} {'best (s)':>9} {'objective':>10} {'status':<9} {'issues':>6} {'build MiB':>9} {'peak MiB':>8}"
+    )
+    for row in rows:
+        print(
+            f"{row['size']:<7} {row['config']:<9} {row['teams']:>5} {row['variables'] or '-':>7} "
+            f"{row['constraints'] or '-':>7} {fmt(row['build'], 2):>9} {fmt(row['first']):>9} "
+            f"{fmt(row['best']):>9} {fmt(row['objective'], 0):>10} {row['status']:<9} "
+            f"{'-' if row['issues'] is None else row['issues']:>6} {fmt(row.get('build_mb'), 0):>9} "
+            f"{fmt(row['peak_mb'], 0):>8}"
+        )
+
+
+def regressions(rows: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Metrics more than `tolerance` times worse than the baseline run of the same size and config."""
+    previous = {(row["size"], row["config"]): row for row in baseline}
+    found = []
+    for row in rows:
+        before = previous.get((row["size"], row["config"]))
+        if before is None:
+            continue
+        for metric in COMPARED:
+            old, new = before.get(metric), row[metric]
+            if old is None or new is None:
+                if new is None and old is not None:
+                    found.append(f"{row['size']} {row['config']}: no {metric} (baseline {fmt(old)})")
+                continue
+            # Small absolute differences (e.g. 0.1s vs 0.2s) are noise
+            if new > max(old * tolerance, old + 1.0):
+                found.append(f"{row['size']} {row['config']}: {metric} {fmt(new)} vs baseline {fmt(old)}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the solver on synthetic leagues")
+    parser.add_argument("--sizes", nargs="+", default=["4x10", "8x10", "18x10"], help="League sizes as NxM")
+    parser.add_argument("--configs", nargs="+", choices=sorted(CONFIGS), default=["boolean", "week_var"])
+    parser.add_argument("--club-overlap", type=float, default=0.8)
+    parser.add_argument("--fixed-density", type=float, default=0.02, help="Fixed matches per team")
+    parser.add_argument("--venue-density", type=float, default=0.05, help="Venue requirements per team")
+    parser.add_argument("--conflict-groups", type=int, default=0, help="Venue conflict groups")
+    parser.add_argument("--league-seed", type=int, default=0, help="Seed for the synthetic leagues")
+    parser.add_argument("--seed", type=int, default=1, help="Solver seed")
+    parser.add_argument("--time-limit", type=float, default=60)
+    parser.add_argument("--workers", type=int, default=NUM_SEARCH_WORKERS, help="CP-SAT search workers")
+    parser.add_argument("--save", type=Path, default=None, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, default=None, help="Compare against saved results")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="Allowed slowdown factor vs the baseline")
+    args = parser.parse_args()
+
+    league_options = {
+        "club_overlap": args.club_overlap,
+        "fixed_match_density": args.fixed_density,
+        "venue_requirement_density": args.venue_density,
+        "venue_conflict_groups": args.conflict_groups,
+        "seed": args.league_seed,
+    }
+    for size in args.sizes:
+        num_divisions, teams_per_division = parse_size(size)
+        print(f"{size}: {synthetic_league(num_divisions, teams_per_division, **league_options).describe()}")
+    print(f"{args.time_limit:.0f}s limit, {args.workers} search workers, solver seed {args.seed}\n")
+
+    rows = []
+    for size in args.sizes:
+        for config in args.configs:
+            # A fresh process per run, so peak memory is per run
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                rows.append(pool.submit(
+                    run, size, config, league_options, args.seed, args.time_limit, args.workers
+                ).result())
+            print(f"  {size} {config}: {rows[-1]['status']} in {fmt(rows[-1]['build'], 2)}s + {fmt(rows[-1]['best'])}s")
+
+    print()
+    print_table(rows)
+
+    if args.save:
+        args.save.write_text(json.dumps(rows, indent=2))
+        print(f"\nResults written to {args.save}")
+
+    if args.baseline:
+        found = regressions(rows, json.loads(args.baseline.read_text()), args.tolerance)
+        print(f"\n{len(found)} regressions against {args.baseline}")
+        for line in found:
+            print(f"  {line}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark symmetry breaking: time to first solution and time to optimal.
+
+Solves the same league with and without symmetry breaking over several seeds
+and prints a comparison table. Times are from the start of the solve.
+
+Usage:
+    python benchmarks/bench_symmetry.py                      # All divisions, pins kept
+    python benchmarks/bench_symmetry.py --divisions 4        # First 4 divisions only
+    python benchmarks/bench_symmetry.py --no-pins --seeds 1 2 3 --time-limit 60
+
+--no-pins drops fixed matches and venue requirements, so the season
+rotation/reversal breakers apply as well as the interchangeable team ones.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fix_gen import (  # noqa: E402
+    FixtureGenerator,
+    load_divisions,
+    load_fixed_matches,
+    load_venue_requirements,
+)
+
+
+def run(generator: FixtureGenerator, seed: int, symmetry_breaking: bool, time_limit: float) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate(seed=seed, symmetry_breaking=symmetry_breaking, time_limit=time_limit)
+    return {
+        "status": generator.status,
+        "objective": generator.objective,
+        "first": generator.trace.first_solution_time(),
+        "best": generator.trace.best_solution_time(),
+    }
+
+
+def fmt(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark symmetry breaking")
+    parser.add_argument("--divisions", type=int, default=None, help="Only use the first N divisions")
+    parser.add_argument("--no-pins", action="store_true", help="Drop fixed matches and venue requirements")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--time-limit", type=float, default=60)
+    args = parser.parse_args()
+
+    data_dir = Path(__file__).resolve().parent.parent / "data"
+    divisions = load_divisions(data_dir / "divisions.csv")[: args.divisions]
+    fixed_matches = [] if args.no_pins else load_fixed_matches(data_dir / "fixReq.csv")
+    venue_requirements = [] if args.no_pins else load_venue_requirements(data_dir / "venReq.csv")
+
+    print(f"{len(divisions)} divisions, {len(fixed_matches)} fixed matches, "
+          f"{len(venue_requirements)} venue requirements, {args.time_limit:.0f}s limit")
+    print(f"{'symmetry':<9} {'seed':>4} {'status':<9} {'objective':>10} {'first (s)':>10} {'best (s)':>9}")
+
+    for symmetry_breaking in (False, True):
+        for seed in args.seeds:
+            generator = FixtureGenerator(divisions, fixed_matches, venue_requirements)
+            result = run(generator, seed, symmetry_breaking, args.time_limit)
+            label = "on" if symmetry_breaking else "off"
+            print(f"{label:<9} {seed:>4} {result['status']:<9} {fmt(result['objective']):>10} "
+                  f"{fmt(result['first']):>10} {fmt(result['best']):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,36 +5,141 @@ Uses constraint programming (OR-Tools CP-SAT) to generate fixtures
 for a cricket league with multiple divisions and complex constraints.
 """
 
-from .config import SOLVER_TIME_LIMIT, WEIGHTS
-from .data_loading import load_divisions, load_fixed_matches, load_venue_conflicts, load_venue_requirements
+from .config import (
+    COORDINATION_TIME_LIMIT,
+    DIVISION_TIME_LIMIT,
+    INCREMENTAL_TIME_LIMIT,
+    LEAN_BUILD,
+    MIRRORED_SEASON,
+    MODEL_CACHE,
+    MODEL_ENGINE,
+    OBJECTIVE_LEVELS,
+    OBJECTIVE_MODE,
+    OUTPUT_FORMATS,
+    PRINT_GRIDS,
+    SEQUENCE_MODE,
+    SOFT_ENCODING,
+    SOLUTION_STORE,
+    SOLVER_TIME_LIMIT,
+    STOP_GAP,
+    STOP_STALL_SECONDS,
+    STOP_TARGET_OBJECTIVE,
+    SYMMETRY_BREAKING,
+    WARM_START,
+    WEIGHTS,
+)
+from .batch import BatchRunner, Scenario, ScenarioResult, load_manifest, load_scenario, write_summary
+from .construction import QuickGenerator
+from .data_loading import (
+    load_divisions,
+    load_fixed_matches,
+    load_fixtures,
+    load_venue_conflicts,
+    load_venue_requirements,
+)
+from .decomposition import DecomposedGenerator
 from .generator import FixtureGenerator
+from .incremental import affected_divisions
+from .instrumentation import ProgressRecorder, SolutionPoint, SolveTrace
+from .lns import LNSImprover
+from .model_cache import ModelCache, model_fingerprint
 from .models import Division, FixedMatch, Fixture, Team, VenueRequirement
-from .output import print_fixture_grids, print_summary, write_fixtures_csv, write_fixtures_html
-from .validation import CrossDivisionCoordinator, validate_fixtures
+from .output import (
+    FixtureIndex,
+    print_fixture_grids,
+    print_summary,
+    render_grids,
+    render_outputs,
+    stream_fixtures_csv,
+    write_fixtures_csv,
+    write_fixtures_html,
+    write_outputs,
+)
+from .portfolio import PortfolioResult, PortfolioRunner, parse_seeds
+from .schedule import Schedule
+from .season import Season
+from .solution_store import SolutionStore, StoredSolution, input_fingerprint, league_fingerprint
+from .stopping import StoppingPolicy
+from .synthetic import SyntheticLeague, synthetic_league
+from .validation import CrossDivisionCoordinator, FixtureValidator, validate_fixtures
 
 __all__ = [
     # Config
     "WEIGHTS",
     "SOLVER_TIME_LIMIT",
+    "MODEL_ENGINE",
+    "LEAN_BUILD",
+    "MODEL_CACHE",
+    "SOLUTION_STORE",
+    "SEQUENCE_MODE",
+    "SOFT_ENCODING",
+    "OBJECTIVE_MODE",
+    "OBJECTIVE_LEVELS",
+    "MIRRORED_SEASON",
+    "SYMMETRY_BREAKING",
+    "WARM_START",
+    "INCREMENTAL_TIME_LIMIT",
+    "COORDINATION_TIME_LIMIT",
+    "DIVISION_TIME_LIMIT",
+    "STOP_GAP",
+    "STOP_STALL_SECONDS",
+    "STOP_TARGET_OBJECTIVE",
+    "OUTPUT_FORMATS",
+    "PRINT_GRIDS",
     # Models
     "Team",
     "Division",
     "FixedMatch",
     "VenueRequirement",
     "Fixture",
+    "Schedule",
+    "Season",
     # Data loading
     "load_divisions",
     "load_fixed_matches",
+    "load_fixtures",
     "load_venue_conflicts",
     "load_venue_requirements",
+    "load_manifest",
+    "load_scenario",
+    "Scenario",
+    "synthetic_league",
+    "SyntheticLeague",
     # Generator
     "FixtureGenerator",
+    "DecomposedGenerator",
+    "QuickGenerator",
+    "affected_divisions",
+    "LNSImprover",
+    "PortfolioRunner",
+    "PortfolioResult",
+    "parse_seeds",
+    "BatchRunner",
+    "ScenarioResult",
+    "ModelCache",
+    "model_fingerprint",
+    "SolutionStore",
+    "StoredSolution",
+    "input_fingerprint",
+    "league_fingerprint",
+    # Instrumentation
+    "SolveTrace",
+    "SolutionPoint",
+    "ProgressRecorder",
+    "StoppingPolicy",
     # Validation
     "validate_fixtures",
+    "FixtureValidator",
     "CrossDivisionCoordinator",
     # Output
     "write_fixtures_csv",
+    "stream_fixtures_csv",
     "write_fixtures_html",
+    "render_outputs",
+    "render_grids",
+    "write_outputs",
+    "FixtureIndex",
     "print_summary",
     "print_fixture_grids",
+    "write_summary",
 ]
@@ -0,0 +1,270 @@
+"""
+Batch season generation: solve many leagues or what-if scenarios in one run.
+
+A manifest lists scenario directories, each laid out like data/
+(divisions.csv, and optionally fixReq.csv, venReq.csv and venConflicts.csv).
+The scenarios are solved in one process pool kept for the whole batch, so
+interpreter and OR-Tools start-up is paid once per worker process rather
+than once per scenario. A CPU budget is split evenly between the processes:
+each solve gets cpus // processes CP-SAT search workers. Every scenario's
+fixtures go to its own output directory (see fix_gen.output.write_outputs)
+and one summary row per scenario to summary.csv.
+"""
+
+import contextlib
+import csv
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+from .config import (
+    LEAN_BUILD,
+    MIRRORED_SEASON,
+    MODEL_ENGINE,
+    OBJECTIVE_MODE,
+    OUTPUT_FORMATS,
+    SEQUENCE_MODE,
+    SOFT_ENCODING,
+    SOLVER_TIME_LIMIT,
+    SYMMETRY_BREAKING,
+    WARM_START,
+)
+from .data_loading import load_divisions, load_fixed_matches, load_venue_conflicts, load_venue_requirements
+from .generator import FixtureGenerator
+from .model_cache import ModelCache
+from .models import Division, FixedMatch, VenueRequirement
+from .output import write_outputs
+from .solution_store import SolutionStore
+from .stopping import StoppingPolicy
+from .validation import CrossDivisionCoordinator, validate_fixtures
+
+
+@dataclass
+class Scenario:
+    name: str
+    directory: Path
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    status: str | None
+    objective: float | None
+    teams: int = 0
+    fixtures: int = 0
+    violations: int = 0
+    cross_violations: int = 0
+    stop_reason: str | None = None
+    solve_time: float | None = None
+    wall_time: float = 0.0  # Seconds for the whole scenario, loading to writing
+    error: str | None = None  # Exception that ended the scenario, if any
+
+
+def load_manifest(filepath: Path) -> list[Scenario]:
+    """Read a manifest: one scenario directory per line.
+
+    Relative directories are resolved against the manifest's directory.
+    Blank lines and lines starting with "#" are skipped. A scenario is
+    named after its directory, so directory names must be unique.
+    """
+    filepath = Path(filepath)
+    scenarios = []
+    names = set()
+    for line in filepath.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        directory = (filepath.parent / line).resolve()
+        if directory.name in names:
+            raise ValueError(f"Duplicate scenario name in {filepath}: {directory.name}")
+        names.add(directory.name)
+        scenarios.append(Scenario(directory.name, directory))
+    return scenarios
+
+
+def load_scenario(
+    directory: Path,
+) -> tuple[list[Division], list[FixedMatch], list[VenueRequirement], list[set[str]]]:
+    """Divisions, fixed matches, venue requirements and venue conflicts of a scenario directory."""
+    directory = Path(directory)
+    fixed_path, venue_path = directory / "fixReq.csv", directory / "venReq.csv"
+    return (
+        load_divisions(directory / "divisions.csv"),
+        load_fixed_matches(fixed_path) if fixed_path.exists() else [],
+        load_venue_requirements(venue_path) if venue_path.exists() else [],
+        load_venue_conflicts(directory / "venConflicts.csv"),
+    )
+
+
+def _solve_scenario(
+    scenario: Scenario,
+    output_dir: Path,
+    seed: int | None,
+    engine: str,
+    sequence_mode: str,
+    symmetry_breaking: bool,
+    warm_start: bool,
+    time_limit: float,
+    stopping: StoppingPolicy | None,
+    model_cache: ModelCache | None,
+    solution_store: SolutionStore | None,
+    mirrored: bool,
+    lean: bool,
+    soft_encoding: str,
+    objective_mode: str,
+    formats: list[str],
+    num_workers: int,
+) -> ScenarioResult:
+    """Solve one scenario and write its outputs (runs in a worker process)."""
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            divisions, fixed_matches, venue_requirements, venue_conflicts = load_scenario(scenario.directory)
+            generator = FixtureGenerator(divisions, fixed_matches, venue_requirements, venue_conflicts)
+            fixtures = generator.generate(
+                seed=seed,
+                engine=engine,
+                sequence_mode=sequence_mode,
+                symmetry_breaking=symmetry_breaking,
+                warm_start=warm_start,
+                time_limit=time_limit,
+                stopping=stopping,
+                model_cache=model_cache,
+                solution_store=solution_store,
+                mirrored=mirrored,
+                lean=lean,
+                soft_encoding=soft_encoding,
+                objective_mode=objective_mode,
+                num_workers=num_workers,
+                lazy=True,
+            )
+            violations = validate_fixtures(fixtures, divisions)
+            cross_violations = CrossDivisionCoordinator(divisions, venue_conflicts).check_violations(fixtures)
+            if len(fixtures):
+                scenario_dir = output_dir / scenario.name
+                scenario_dir.mkdir(parents=True, exist_ok=True)
+                write_outputs(fixtures, divisions, scenario_dir, seed=seed, formats=formats)
+    except Exception as e:
+        # One broken scenario (bad CSV, duplicate team, ...) must not end the batch
+        return ScenarioResult(
+            name=scenario.name,
+            status=None,
+            objective=None,
+            wall_time=time.perf_counter() - start,
+            error=f"{type(e).__name__}: {e}",
+        )
+    return ScenarioResult(
+        name=scenario.name,
+        status=generator.status,
+        objective=generator.objective,
+        teams=len(generator.all_teams),
+        fixtures=len(fixtures),
+        violations=len(violations),
+        cross_violations=len(cross_violations),
+        stop_reason=generator.trace.stop_reason,
+        solve_time=generator.trace.solve_time,
+        wall_time=time.perf_counter() - start,
+    )
+
+
+class BatchRunner:
+    """Runs the unified model for every scenario of a manifest in a process pool."""
+
+    def __init__(self, scenarios: list[Scenario], output_dir: Path):
+        self.scenarios = scenarios
+        self.output_dir = Path(output_dir)
+
+    def run(
+        self,
+        seed: int | None = None,
+        engine: str = MODEL_ENGINE,
+        sequence_mode: str = SEQUENCE_MODE,
+        symmetry_breaking: bool = SYMMETRY_BREAKING,
+        warm_start: bool = WARM_START,
+        time_limit: float = SOLVER_TIME_LIMIT,
+        stopping: StoppingPolicy | None = None,
+        model_cache: ModelCache | None = None,
+        solution_store: SolutionStore | None = None,
+        mirrored: bool = MIRRORED_SEASON,
+        lean: bool = LEAN_BUILD,
+        soft_encoding: str = SOFT_ENCODING,
+        objective_mode: str = OBJECTIVE_MODE,
+        formats: list[str] = OUTPUT_FORMATS,
+        cpus: int | None = None,
+        processes: int | None = None,
+    ) -> list[ScenarioResult]:
+        """Solve every scenario, write its outputs and return the results in manifest order.
+
+        Args:
+            seed: Seed for every scenario. engine, sequence_mode,
+                symmetry_breaking, warm_start, mirrored, lean, soft_encoding and
+                objective_mode are passed to FixtureGenerator.generate.
+            time_limit: Solver time limit for each scenario.
+            stopping: Early stopping rules for each scenario; its time_limit
+                replaces `time_limit` when given.
+            model_cache: Model cache shared by all scenarios (see fix_gen.model_cache).
+            solution_store: Store every scenario's solution is recorded in (see
+                fix_gen.solution_store).
+            formats: Output files written to output_dir/<scenario name>.
+            cpus: CPU budget for the whole batch (default: every core).
+            processes: Worker processes (default: one per CPU, at most one per
+                scenario). The budget is split evenly, so each solve gets
+                cpus // processes search workers.
+        """
+        if not self.scenarios:
+            return []
+        cpus = max(1, cpus or os.cpu_count() or 1)
+        processes = max(1, min(processes or cpus, len(self.scenarios), cpus))
+        workers_per_solve = max(1, cpus // processes)
+        print(
+            f"Running {len(self.scenarios)} scenarios in {processes} processes "
+            f"({workers_per_solve} search workers each)..."
+        )
+
+        results: dict[str, ScenarioResult] = {}
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [
+                pool.submit(
+                    _solve_scenario,
+                    scenario,
+                    self.output_dir,
+                    seed,
+                    engine,
+                    sequence_mode,
+                    symmetry_breaking,
+                    warm_start,
+                    time_limit,
+                    stopping,
+                    model_cache,
+                    solution_store,
+                    mirrored,
+                    lean,
+                    soft_encoding,
+                    objective_mode,
+                    list(formats),
+                    workers_per_solve,
+                )
+                for scenario in self.scenarios
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.name] = result
+                progress = f"  [{len(results)}/{len(self.scenarios)}] {result.name}:"
+                if result.error is not None:
+                    print(f"{progress} failed ({result.error})")
+                else:
+                    objective = "-" if result.objective is None else f"{result.objective:.0f}"
+                    print(f"{progress} {result.status}, penalty {objective} ({result.wall_time:.1f}s)")
+
+        return [results[scenario.name] for scenario in self.scenarios]
+
+
+def write_summary(results: list[ScenarioResult], filepath: Path) -> None:
+    """Write one CSV row per scenario result."""
+    with open(filepath, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(ScenarioResult)])
+        writer.writeheader()
+        writer.writerows(asdict(result) for result in results)
@@ -14,7 +14,95 @@ WEIGHTS = {
     "consecutive_3": 50,
     # Venue conflicts (different clubs sharing pitches) - lower than ground sharing
     "venue_conflicts": 5,
+    # Moving a published fixture when re-solving from a previous schedule
+    "churn": 100,
 }
 
-# Maximum solver time in seconds
+# How the penalties are optimised:
+#   "weighted"      - one solve minimising the WEIGHTS-weighted sum
+#   "lexicographic" - one solve per OBJECTIVE_LEVELS entry, in order, each
+#                     keeping the levels before it at their best value
+OBJECTIVE_MODE = "weighted"
+
+# Priority order of the penalty kinds (WEIGHTS keys) in lexicographic mode
+OBJECTIVE_LEVELS = [
+    "ground_sharing_1st_xi",
+    "ground_sharing_2nd_xi",
+    "ground_sharing_3rd_xi",
+    "ground_sharing_4th_xi",
+    "consecutive_3",
+    "venue_conflicts",
+    "churn",
+]
+
+# Maximum solver time in seconds (hard cap for the stopping policies below)
 SOLVER_TIME_LIMIT = 300
+
+# Early stopping (None disables each rule): relative gap between the penalty and
+# the solver's bound, seconds without an improving solution, and a target penalty
+STOP_GAP = None
+STOP_STALL_SECONDS = None
+STOP_TARGET_OBJECTIVE = None
+
+# CP-SAT parallel search workers per solve
+NUM_SEARCH_WORKERS = 8
+
+# Mirrored season: week W of the second half repeats week W of the first half
+# with venues swapped. False schedules the second half freely.
+MIRRORED_SEASON = True
+
+# Matchup formulation used to build the CP-SAT model:
+#   "boolean"  - one Boolean per (matchup, week, orientation) with AddExactlyOne
+#   "week_var" - original IntVar week per matchup with reified channelling
+MODEL_ENGINE = "boolean"
+
+# Lean model build: leave CP-SAT variables unnamed to cut model memory on large
+# leagues. Turn off to get readable names in exported models when debugging
+LEAN_BUILD = True
+
+# How the consecutive home/away rules are modelled:
+#   "linear" - hand-built window constraints and reified 3-in-a-row penalties
+#   "table"  - each team's pattern must be one of the precomputed legal patterns
+SEQUENCE_MODE = "linear"
+
+# How the soft-constraint penalty literals are encoded:
+#   "half" - half-reified: each literal is only forced on by its violation (the
+#            objective keeps it off otherwise), and in a mirrored season one
+#            "same venue" literal per pair and first-half week covers both the
+#            both-home week and its mirrored week
+#   "full" - original encoding, each literal fully reified (AND/OR equivalence)
+SOFT_ENCODING = "half"
+
+# Add ordering constraints that remove equivalent schedules (interchangeable
+# teams, season rotation/reversal of divisions without pinned requirements)
+SYMMETRY_BREAKING = False
+
+# Hint the solver with the constructive circle-method schedule
+WARM_START = True
+
+# Cache built models on disk (main.py uses .cache/models), keyed by a hash of
+# the inputs, weights and build options, so repeated runs skip model building
+MODEL_CACHE = True
+
+# Record every solution in an SQLite store (main.py uses .cache/solutions.sqlite)
+# and hint new solves from the best stored schedule for the same inputs
+SOLUTION_STORE = True
+
+# Solver time limit when re-solving from a previous schedule (--incremental)
+INCREMENTAL_TIME_LIMIT = 30
+
+# Decomposed solve (--decompose): a coordination model picks every team's
+# home/away pattern, then each division is scheduled on its own
+COORDINATION_TIME_LIMIT = 60  # seconds per coordination solve
+DIVISION_TIME_LIMIT = 20  # seconds per division model
+DECOMPOSITION_MAX_ROUNDS = 20  # coordinate/schedule rounds before giving up
+
+# Large neighbourhood search (--lns): each sub-solve frees one club, one
+# division or a window of weeks and re-solves it with a short time limit
+LNS_NEIGHBOURHOOD_TIME_LIMIT = 5  # seconds per sub-solve
+LNS_WINDOW_WEEKS = 4  # weeks freed by a window neighbourhood
+
+# Output files main.py writes ("csv", "html", "txt"), and whether the text
+# grids are also printed to stdout
+OUTPUT_FORMATS = ["csv", "html", "txt"]
+PRINT_GRIDS = True
@@ -0,0 +1,333 @@
+"""
+Constructive fixture heuristic: circle-method round robins plus a greedy
+home/away assignment.
+
+Takes about half a second on the full 18-division league and is used both as
+a standalone draft generator and as a warm start (solution hints) for the
+CP-SAT model. The result respects the fixed match weeks and venue
+requirements wherever the greedy choices allow, but is not guaranteed to
+satisfy every hard constraint, and on the full league it still leaves 14-23
+cross-division ground sharing and venue conflict clashes, so it is only a
+partly feasible hint.
+"""
+
+import random
+from collections import defaultdict
+from functools import cache
+
+from .config import WEIGHTS
+from .ground_sharing import build_shared_venue_pairs
+from .models import Division, FixedMatch, Fixture, VenueRequirement
+from .season import Season
+
+# Cost of a choice that breaks a hard constraint in the greedy assignment
+HARD_VIOLATION_COST = 1_000_000
+
+
+def circle_round_robin(teams: list[str]) -> list[list[tuple[str, str]]]:
+    """Single round robin by the circle (Berger) method.
+
+    The first team stays fixed while the others rotate one place per round.
+    Returns one list of (home, away) pairs per round, with Berger's
+    alternating orientation. With an odd number of teams one team has a bye
+    each round.
+    """
+    slots: list[str | None] = list(teams)
+    if len(slots) % 2:
+        slots.append(None)
+    n = len(slots)
+
+    rounds = []
+    for r in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            t1, t2 = slots[i], slots[n - 1 - i]
+            if t1 is None or t2 is None:
+                continue
+            # Alternate the fixed team's venue, and the others by board
+            if (i == 0 and r % 2) or (i > 0 and i % 2):
+                t1, t2 = t2, t1
+            pairs.append((t1, t2))
+        rounds.append(pairs)
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+    return rounds
+
+
+def _transform_season(
+    rounds: list[list[tuple[str, str]]],
+    rotation: int,
+    reverse: bool,
+) -> list[list[tuple[str, str]]]:
+    """Rotate and/or reverse a mirrored season, returning the new first half.
+
+    Week W + half is week W with venues swapped, so the whole season can be
+    rotated or reversed without breaking any sequence rule.
+    """
+    half = len(rounds)
+    season = rounds + [[(away, home) for home, away in pairs] for pairs in rounds]
+    if reverse:
+        season = season[::-1]
+    season = season[rotation % len(season):] + season[:rotation % len(season)]
+    return season[:half]
+
+
+@cache
+def _sequence_cost(pattern: tuple[int | None, ...], half_weeks: int) -> int:
+    """Cost of the fully known 3- and 4-week windows of a first-half pattern.
+
+    Pattern entries are 1 (home), 0 (away) or None (bye); windows containing
+    a bye are never a run. Once all weeks are known the mirrored second half
+    (week W + half_weeks is the opposite of week W) is appended, so windows
+    across the half-way point and the end of the season are counted too.
+    """
+    season = list(pattern)
+    if len(pattern) == half_weeks:
+        season += [None if h is None else 1 - h for h in pattern] + list(pattern[:3])
+
+    cost = 0
+    for start in range(min(len(season), half_weeks * 2)):
+        window = season[start:start + 4]
+        if len(window) == 4 and None not in window and len(set(window)) == 1:
+            cost += HARD_VIOLATION_COST
+        window = season[start:start + 3]
+        if len(window) == 3 and None not in window and len(set(window)) == 1:
+            cost += WEIGHTS["consecutive_3"]
+    return cost
+
+
+class QuickGenerator:
+    """
+    Builds a draft fixture list without a solver (about 0.5s on the full league).
+
+    Each division gets a circle-method round robin, padded with empty rounds
+    to the season's half length (see fix_gen.season), with shared-ground
+    partners in slots with opposite home/away patterns and teams relabelled
+    so fixed matches land in their week. Venue requirements set their
+    matches' venues, then a greedy local search (venue flips, week and team
+    swaps) removes no-4-in-a-row violations, 3-in-a-row runs and shared
+    ground clashes.
+    """
+
+    def __init__(
+        self,
+        divisions: list[Division],
+        fixed_matches: list[FixedMatch],
+        venue_requirements: list[VenueRequirement],
+        venue_conflicts: list[set[str]] | None = None,
+    ):
+        self.divisions = divisions
+        self.fixed_matches = fixed_matches
+        self.venue_requirements = venue_requirements
+        self.venue_conflicts = venue_conflicts or []
+        self.half_weeks = Season.for_divisions(divisions).half_weeks
+
+        all_teams = {t.code for div in divisions for t in div.teams}
+
+        # Required first-half venue (True = home) by team and week
+        self.required_home: dict[tuple[str, int], bool] = {}
+        for req in venue_requirements:
+            if req.team not in all_teams:
+                continue
+            home = req.venue == "h"
+            week = req.week
+            if week > self.half_weeks:
+                week, home = week - self.half_weeks, not home
+            self.required_home[(req.team, week)] = home
+
+        # Teams sharing a venue, with the penalty for both being home (or away) together
+        self.partners: dict[str, list[tuple[str, int]]] = {t: [] for t in all_teams}
+        for (t1, t2), weights in build_shared_venue_pairs(divisions, self.venue_conflicts).items():
+            weight = sum(WEIGHTS[key] for key in weights)
+            self.partners[t1].append((t2, weight))
+            self.partners[t2].append((t1, weight))
+
+    def first_half(self, seed: int | None = None) -> list[Fixture]:
+        """Build the first-half fixtures (the second half mirrors them)."""
+        rng = random.Random(seed)
+
+        # Every division plays its circle-method rounds in the same order, so
+        # circle slots 2k and 2k+1 have opposite home/away patterns in every
+        # division. Shared-ground partners are placed in opposite slots where
+        # possible. Seeds vary the team order and rotate/reverse the season,
+        # which keeps the alternating patterns intact.
+        rotation = rng.randrange(self.half_weeks * 2) if seed is not None else 0
+        reverse = seed is not None and rng.random() < 0.5
+
+        slot_of: dict[str, int] = {}
+        schedule: dict[str, list[list[list[str]]]] = {}
+        for div in self.divisions:
+            teams = [t.code for t in div.teams]
+            if seed is not None:
+                rng.shuffle(teams)
+            slots: list[str | None] = [None] * len(teams)
+            unplaced = []
+            for team in teams:
+                wanted = [slot_of[p] ^ 1 for p, _ in self.partners[team] if p in slot_of]
+                free = [s for s in wanted if s < len(slots) and slots[s] is None]
+                if free:
+                    slots[free[0]] = team
+                    slot_of[team] = free[0]
+                else:
+                    unplaced.append(team)
+            for team in unplaced:
+                slot = slots.index(None)
+                slots[slot] = team
+                slot_of[team] = slot
+
+            rounds = circle_round_robin(slots)
+            rounds += [[] for _ in range(self.half_weeks - len(rounds))]
+            rounds = _transform_season(rounds, rotation, reverse)
+            rounds = [[list(pair) for pair in pairs] for pairs in rounds]
+            self._place_fixed_matches(rounds, set(teams))
+            schedule[div.name] = rounds
+
+        # Greedy venues for matches with a venue requirement
+        for (team, week), home in self.required_home.items():
+            for rounds in schedule.values():
+                for pair in rounds[week - 1] if week <= len(rounds) else []:
+                    if team in pair and (pair[0] == team) != home:
+                        pair.reverse()
+
+        self._improve(schedule)
+
+        return [
+            Fixture(week=week, home_team=home, away_team=away, division=div_name)
+            for div_name, rounds in schedule.items()
+            for week, pairs in enumerate(rounds, start=1)
+            for home, away in pairs
+        ]
+
+    def generate(self, seed: int | None = None) -> list[Fixture]:
+        """Generate a complete draft fixture list (both halves)."""
+        print("Building constructive draft schedule...")
+        fixtures = []
+        for f in self.first_half(seed):
+            fixtures.append(f)
+            fixtures.append(Fixture(
+                week=f.week + self.half_weeks,
+                home_team=f.away_team,
+                away_team=f.home_team,
+                division=f.division,
+            ))
+        return fixtures
+
+    def _place_fixed_matches(self, rounds: list[list[list[str]]], teams: set[str]) -> None:
+        """Relabel teams, in place, so each fixed match of the division is played in its week.
+
+        The two teams meeting in the target week swap identities with the
+        fixed match's teams, which keeps the round robin intact.
+        """
+        placed: set[str] = set()
+        for fm in self.fixed_matches:
+            if fm.team1 not in teams or fm.team2 not in teams:
+                continue
+            target = (fm.week - 1) % self.half_weeks
+            if target >= len(rounds):
+                continue
+            if any(set(pair) == {fm.team1, fm.team2} for pair in rounds[target]):
+                placed.update((fm.team1, fm.team2))
+                continue
+            fixed = {fm.team1, fm.team2}
+            candidates = [pair for pair in rounds[target] if not (placed | fixed) & set(pair)]
+            if not candidates or placed & fixed:
+                continue
+            swap = {fm.team1: candidates[0][0], fm.team2: candidates[0][1]}
+            swap.update({v: k for k, v in swap.items()})
+            for pairs in rounds:
+                for pair in pairs:
+                    pair[:] = [swap.get(t, t) for t in pair]
+            placed.update((fm.team1, fm.team2))
+
+    def _improve(self, schedule: dict[str, list[list[list[str]]]], max_passes: int = 10) -> None:
+        """Local search over the draft, in place, while any move lowers the cost.
+
+        Moves are: swap the venue of one match, swap every venue of a division
+        without pinned teams, swap two weeks of a division (weeks holding a
+        fixed match stay put) and swap two teams of a division (teams with a
+        fixed match or venue requirement stay put). Each move is kept only if
+        it lowers the cost of the teams it touches.
+        """
+        pinned = {req.team for req in self.venue_requirements}
+        fixed_weeks: dict[str, set[int]] = defaultdict(set)
+        for fm in self.fixed_matches:
+            pinned.update((fm.team1, fm.team2))
+            for div_name, rounds in schedule.items():
+                for w, pairs in enumerate(rounds):
+                    if any(set(pair) == {fm.team1, fm.team2} for pair in pairs):
+                        fixed_weeks[div_name].add(w)
+
+        patterns: dict[str, list[int | None]] = {}
+
+        def refresh(rounds: list[list[list[str]]], teams: set[str]) -> None:
+            for team in teams:
+                patterns[team] = [None] * len(rounds)
+            for week, pairs in enumerate(rounds):
+                for home, away in pairs:
+                    if home in teams:
+                        patterns[home][week] = 1
+                    if away in teams:
+                        patterns[away][week] = 0
+
+        def cost(teams: set[str]) -> int:
+            total = 0
+            for team in teams:
+                pattern = patterns[team]
+                total += _sequence_cost(tuple(pattern), self.half_weeks)
+                for week, home in enumerate(pattern, start=1):
+                    required = self.required_home.get((team, week))
+                    if required is not None and (home is None or required != bool(home)):
+                        total += HARD_VIOLATION_COST
+                for partner, weight in self.partners[team]:
+                    if partner in teams and partner < team:
+                        continue
+                    total += weight * sum(a is not None and a == b for a, b in zip(pattern, patterns[partner]))
+            return total
+
+        for rounds in schedule.values():
+            teams = {t for pairs in rounds for pair in pairs for t in pair}
+            refresh(rounds, teams)
+
+        def attempt(rounds, teams: set[str], apply) -> bool:
+            """Apply a move, keeping it only if it lowers the cost."""
+            before = cost(teams)
+            apply()
+            refresh(rounds, teams)
+            if cost(teams) < before:
+                return True
+            apply()
+            refresh(rounds, teams)
+            return False
+
+        for _ in range(max_passes):
+            improved = False
+            for div_name, rounds in schedule.items():
+                div_teams = sorted({t for pairs in rounds for pair in pairs for t in pair})
+
+                for pairs in rounds:
+                    for pair in pairs:
+                        improved |= attempt(rounds, set(pair), pair.reverse)
+
+                if not any(t in pinned for t in div_teams):
+                    def flip_division():
+                        for pairs in rounds:
+                            for pair in pairs:
+                                pair.reverse()
+                    improved |= attempt(rounds, set(div_teams), flip_division)
+
+                movable_weeks = [w for w in range(len(rounds)) if w not in fixed_weeks[div_name]]
+                for i, w1 in enumerate(movable_weeks):
+                    for w2 in movable_weeks[i + 1:]:
+                        def swap_weeks(w1=w1, w2=w2):
+                            rounds[w1], rounds[w2] = rounds[w2], rounds[w1]
+                        improved |= attempt(rounds, set(div_teams), swap_weeks)
+
+                movable_teams = [t for t in div_teams if t not in pinned]
+                for i, t1 in enumerate(movable_teams):
+                    for t2 in movable_teams[i + 1:]:
+                        def swap_teams(t1=t1, t2=t2):
+                            for pairs in rounds:
+                                for pair in pairs:
+                                    pair[:] = [t2 if t == t1 else t1 if t == t2 else t for t in pair]
+                        improved |= attempt(rounds, {t1, t2}, swap_teams)
+            if not improved:
+                break
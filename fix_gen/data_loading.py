@@ -6,7 +6,7 @@ import csv
 from collections import Counter
 from pathlib import Path
 
-from .models import Division, FixedMatch, VenueRequirement
+from .models import Division, FixedMatch, Fixture, VenueRequirement
 
 
 def load_divisions(filepath: Path) -> list[Division]:
@@ -85,3 +85,22 @@ def load_venue_conflicts(filepath: Path) -> list[set[str]]:
             if len(teams) >= 2:
                 conflicts.append(teams)
     return conflicts
+
+
+def load_fixtures(filepath: Path) -> list[Fixture]:
+    """Load a fixture list previously written by write_fixtures_csv.
+
+    Skips the header row and the optional seed comment line.
+    """
+    fixtures = []
+    with open(filepath, "r") as f:
+        reader = csv.reader(line for line in f if not line.startswith("#"))
+        for row in reader:
+            if row and len(row) >= 4 and row[0] != "game_week":
+                fixtures.append(Fixture(
+                    week=int(row[0]),
+                    home_team=row[1],
+                    away_team=row[2],
+                    division=row[3],
+                ))
+    return fixtures
@@ -0,0 +1,310 @@
+"""
+Decomposed solver: a small cross-division coordination model over home/away
+patterns, plus independent per-division matchup models.
+
+Ground sharing and venue conflict pairs only depend on which weeks each team
+is at home, so they can be optimised without deciding who plays whom. The
+coordination model picks a legal home/away pattern for every team (no 4 in a
+row, mirrored second half, half of each division at home every week) to
+minimise all penalties. Each division is then scheduled on its own, in
+parallel processes, with its teams' venues pinned to the chosen patterns.
+
+A division whose pattern set is proven not to form a round robin gets a
+no-good cut and the coordination model is re-solved, hinted from the previous
+patterns, until every division is schedulable. A division solve that runs out
+of time proves nothing, so it is retried with twice the time instead.
+"""
+
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from ortools.sat.python import cp_model
+
+from .config import (
+    COORDINATION_TIME_LIMIT,
+    DECOMPOSITION_MAX_ROUNDS,
+    DIVISION_TIME_LIMIT,
+    MODEL_ENGINE,
+    NUM_SEARCH_WORKERS,
+    WEIGHTS,
+)
+from .generator import FixtureGenerator
+from .models import Division, FixedMatch, Fixture, VenueRequirement
+from .patterns import Pattern, legal_patterns
+from .season import Season, VenueLiterals
+
+
+def _solve_division(
+    division: Division,
+    fixed_matches: list[FixedMatch],
+    patterns: dict[str, Pattern],
+    engine: str,
+    time_limit: float,
+    num_workers: int,
+) -> tuple[str, str | None, list[Fixture]]:
+    """Schedule one division's matchups against fixed home/away patterns (runs in a worker process).
+
+    Returns the division name, the solver status name and the fixtures.
+    """
+    venue_requirements = [
+        VenueRequirement(team=team, venue="h" if home else "a", week=week)
+        for team, pattern in patterns.items()
+        for week, home in enumerate(pattern, start=1)
+    ]
+    generator = FixtureGenerator([division], fixed_matches, venue_requirements)
+    with contextlib.redirect_stdout(io.StringIO()):
+        fixtures = generator.generate(engine=engine, time_limit=time_limit, num_workers=num_workers)
+    return division.name, generator.status, fixtures
+
+
+class DecomposedGenerator:
+    """
+    Generates fixtures by coordinating home/away patterns across all divisions
+    in one small model, then scheduling each division independently.
+
+    The coordination model grows linearly with the number of teams and the
+    division models are solved in parallel, so solve time scales roughly
+    linearly with the number of divisions. Needs a mirrored season without
+    byes, since every team is given a full first-half pattern.
+    """
+
+    def __init__(
+        self,
+        divisions: list[Division],
+        fixed_matches: list[FixedMatch],
+        venue_requirements: list[VenueRequirement],
+        venue_conflicts: list[set[str]] | None = None,
+    ):
+        self.divisions = divisions
+        self.fixed_matches = fixed_matches
+        self.venue_requirements = venue_requirements
+        self.venue_conflicts = venue_conflicts or []
+
+        self.season = Season.for_divisions(divisions, mirrored=True)
+        if any(self.season.has_byes(div) for div in divisions):
+            raise ValueError("The decomposed solver needs divisions without byes (an even number of teams)")
+
+        # The full generator provides team lookups and the shared venue penalty builder
+        self.generator = FixtureGenerator(divisions, fixed_matches, venue_requirements, venue_conflicts)
+
+        # Fixed matches that fall inside each division
+        self.div_fixed_matches: dict[str, list[FixedMatch]] = {div.name: [] for div in divisions}
+        for fm in fixed_matches:
+            div1 = self.generator.team_to_division.get(fm.team1)
+            div2 = self.generator.team_to_division.get(fm.team2)
+            if div1 is not None and div1 is div2:
+                self.div_fixed_matches[div1.name].append(fm)
+
+        # Result of the last solve
+        self.status: str | None = None
+        self.objective: float | None = None
+
+    def generate(
+        self,
+        seed: int | None = None,
+        engine: str = MODEL_ENGINE,
+        coordination_time_limit: float = COORDINATION_TIME_LIMIT,
+        division_time_limit: float = DIVISION_TIME_LIMIT,
+        max_rounds: int = DECOMPOSITION_MAX_ROUNDS,
+        processes: int | None = None,
+    ) -> list[Fixture]:
+        """Generate the complete fixture list via pattern coordination plus per-division solves.
+
+        Args:
+            seed: Optional random seed for the coordination solver.
+            engine: Matchup formulation for the per-division models.
+            coordination_time_limit: Solver time limit for each coordination solve.
+            division_time_limit: Solver time limit for each division model; doubled
+                for a division each time its solve runs out of time.
+            max_rounds: Maximum coordinate/schedule rounds before giving up.
+            processes: Worker processes for the division solves (default: CPU count).
+        """
+        if seed is not None:
+            print(f"Using seed: {seed}")
+
+        print("Building pattern coordination model...")
+        model, pattern_index, is_home = self._build_coordination_model()
+        pattern_table = [p for p, _ in legal_patterns(self.season.half_weeks)]
+
+        cpu_count = os.cpu_count() or 1
+        processes = max(1, min(processes or cpu_count, len(self.divisions)))
+        workers_per_solve = max(1, cpu_count // processes)
+
+        fixtures_by_div: dict[str, list[Fixture]] = {}
+        solved_patterns: dict[str, dict[str, Pattern]] = {}
+        time_limits = {div.name: division_time_limit for div in self.divisions}
+        new_cuts = True
+
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            for round_num in range(1, max_rounds + 1):
+                if new_cuts:
+                    print(f"  Round {round_num}: solving coordination model...")
+                    solver = cp_model.CpSolver()
+                    solver.parameters.max_time_in_seconds = coordination_time_limit
+                    solver.parameters.num_search_workers = NUM_SEARCH_WORKERS
+                    if seed is not None:
+                        solver.parameters.random_seed = seed
+
+                    status = solver.Solve(model)
+                    self.status = solver.StatusName(status)
+                    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                        print("  WARNING: No solution found!")
+                        self.objective = None
+                        return []
+                    self.objective = solver.ObjectiveValue()
+                    print(f"  Patterns found! Status: {self.status}, penalty: {self.objective}")
+
+                    patterns = {
+                        div.name: {t.code: pattern_table[solver.Value(pattern_index[t.code])] for t in div.teams}
+                        for div in self.divisions
+                    }
+                else:
+                    # Only timed-out divisions to retry: the patterns still stand
+                    print(f"  Round {round_num}: retrying timed-out divisions with the same patterns...")
+
+                # Only (re)schedule divisions whose patterns changed or that timed out
+                pending = [div for div in self.divisions if solved_patterns.get(div.name) != patterns[div.name]]
+                print(f"  Scheduling {len(pending)} divisions in {processes} processes...")
+                futures = [
+                    pool.submit(
+                        _solve_division,
+                        div,
+                        self.div_fixed_matches[div.name],
+                        patterns[div.name],
+                        engine,
+                        time_limits[div.name],
+                        workers_per_solve,
+                    )
+                    for div in pending
+                ]
+
+                infeasible = []
+                timed_out = []
+                for div, future in zip(pending, futures):
+                    div_name, status, fixtures = future.result()
+                    if fixtures:
+                        fixtures_by_div[div_name] = fixtures
+                        solved_patterns[div_name] = patterns[div_name]
+                        continue
+                    fixtures_by_div.pop(div_name, None)
+                    solved_patterns.pop(div_name, None)
+                    if status == "INFEASIBLE":
+                        infeasible.append(div)
+                    else:
+                        timed_out.append(div)
+
+                if not infeasible and not timed_out:
+                    return [f for div in self.divisions for f in fixtures_by_div[div.name]]
+
+                if timed_out:
+                    # No proof either way: keep the patterns and give the division more time
+                    print(f"  {len(timed_out)} divisions ran out of time, retrying with twice the time")
+                    for div in timed_out:
+                        time_limits[div.name] *= 2
+
+                new_cuts = bool(infeasible)
+                if not new_cuts:
+                    continue
+
+                print(f"  {len(infeasible)} divisions cannot be scheduled with these patterns, adding cuts")
+                for div in infeasible:
+                    self._add_pattern_cut(model, div, patterns[div.name], pattern_index, is_home)
+
+                # Warm start the next round from the current patterns
+                model.ClearHints()
+                for div in self.divisions:
+                    for team, pattern in patterns[div.name].items():
+                        for week, home in enumerate(pattern, start=1):
+                            model.AddHint(is_home[(team, week)], home)
+
+        print(f"  WARNING: Gave up after {max_rounds} rounds!")
+        self.status = "UNKNOWN"
+        self.objective = None
+        return []
+
+    def _build_coordination_model(self) -> tuple[
+        cp_model.CpModel,
+        dict[str, cp_model.IntVar],
+        dict[tuple[str, int], cp_model.IntVar],
+    ]:
+        """Build the pattern coordination model.
+
+        Returns the model, pattern_index[team] (index into legal_patterns())
+        and is_home[(team, week)] for the first half.
+        """
+        model = cp_model.CpModel()
+        half_weeks = self.season.half_weeks
+        weeks_first_half = self.season.scheduled_weeks()[0]
+        table = [list(pattern) + [runs, i] for i, (pattern, runs) in enumerate(legal_patterns(half_weeks))]
+
+        is_home: dict[tuple[str, int], cp_model.IntVar] = {}
+        pattern_index: dict[str, cp_model.IntVar] = {}
+        penalties = []
+
+        for div in self.divisions:
+            for team in div.teams:
+                for week in weeks_first_half:
+                    is_home[(team.code, week)] = model.NewBoolVar(f"home_{team.code}_{week}")
+                runs = model.NewIntVar(0, half_weeks, f"runs_{team.code}")
+                pattern_index[team.code] = model.NewIntVar(0, len(table) - 1, f"pattern_{team.code}")
+                model.AddAllowedAssignments(
+                    [is_home[(team.code, w)] for w in weeks_first_half] + [runs, pattern_index[team.code]],
+                    table,
+                )
+                penalties.append(runs * WEIGHTS["consecutive_3"])
+
+            # Half the division at home every week; two teams with the same
+            # pattern could never meet
+            for week in weeks_first_half:
+                model.Add(sum(is_home[(t.code, week)] for t in div.teams) == len(div.teams) // 2)
+            model.AddAllDifferent(pattern_index[t.code] for t in div.teams)
+
+        # Venue requirements (the second half is the reverse of the first)
+        for (team, week), venue in self.generator.venue_req_lookup.items():
+            if team in pattern_index:
+                home = venue == "h"
+                if week > half_weeks:
+                    week, home = week - half_weeks, not home
+                model.Add(is_home[(team, week)] == int(home))
+
+        # Fixed matches: the two teams must be at opposite venues that week
+        for div_fixed in self.div_fixed_matches.values():
+            for fm in div_fixed:
+                week, _ = self.season.scheduled_week(fm.week)
+                model.Add(is_home[(fm.team1, week)] + is_home[(fm.team2, week)] == 1)
+
+        penalties.extend(self.generator.add_shared_venue_penalties(model, VenueLiterals(self.season, is_home, {})))
+        model.Minimize(sum(penalties))
+        return model, pattern_index, is_home
+
+    def _add_pattern_cut(
+        self,
+        model: cp_model.CpModel,
+        div: Division,
+        patterns: dict[str, Pattern],
+        pattern_index: dict[str, cp_model.IntVar],
+        is_home: dict[tuple[str, int], cp_model.IntVar],
+    ) -> None:
+        """Forbid a pattern set that could not be scheduled for a division."""
+        if self.div_fixed_matches[div.name]:
+            # Fixed matches tie feasibility to who holds which pattern: forbid this exact assignment
+            model.AddBoolOr([
+                is_home[(team, week)].Not() if home else is_home[(team, week)]
+                for team, pattern in patterns.items()
+                for week, home in enumerate(pattern, start=1)
+            ])
+            return
+
+        # Otherwise feasibility only depends on the set of patterns, whichever
+        # team holds them: at least one team must use a pattern outside the set
+        table = [p for p, _ in legal_patterns(self.season.half_weeks)]
+        used = cp_model.Domain.from_values(sorted(table.index(p) for p in patterns.values()))
+        in_set = []
+        for team in patterns:
+            lit = model.NewBoolVar(f"cut_{div.name}_{team}")
+            model.AddLinearExpressionInDomain(pattern_index[team], used).OnlyEnforceIf(lit)
+            model.AddLinearExpressionInDomain(pattern_index[team], used.complement()).OnlyEnforceIf(lit.Not())
+            in_set.append(lit)
+        model.Add(sum(in_set) <= len(in_set) - 1)
@@ -0,0 +1,343 @@
+"""
+Model-building engines for the matchup scheduling part of the CP-SAT model.
+
+Each engine decides how "which week does this matchup happen, and who is at
+home" is encoded, and links that to the per-team is_home variables that the
+rest of the model is built on.
+"""
+
+from collections import defaultdict
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from .instrumentation import SolveTrace
+
+# Matchup key: (division name, team1, team2)
+MatchKey = tuple[str, str, str]
+
+
+def var_name(named: bool, *parts) -> str:
+    """Variable name joined from its parts, or "" in lean builds (named=False)."""
+    return "_".join(map(str, parts)) if named else ""
+
+
+class WeekVarEngine:
+    """
+    Original formulation: one IntVar week per matchup plus a home Boolean.
+
+    Every matchup x week pair is channelled through reified `week == w`
+    literals, which makes the model large but is kept for A/B comparison.
+    """
+
+    name = "week_var"
+
+    def __init__(
+        self,
+        model: cp_model.CpModel,
+        weeks: list[int],
+        trace: SolveTrace | None = None,
+        var_names: bool = True,
+    ):
+        self.model = model
+        self.weeks = weeks
+        # Phase timings ("linkage", "one_per_week") are recorded here
+        self.trace = trace if trace is not None else SolveTrace()
+        # Name the variables (for debugging exported models); off in lean builds
+        self.var_names = var_names
+        # week_var[(div_name, t1, t2)] = which of the engine's weeks this matchup occurs
+        self.week_var: dict[MatchKey, cp_model.IntVar] = {}
+        # home_var[(div_name, t1, t2)] = 1 if t1 is home, 0 if t2 is home
+        self.home_var: dict[MatchKey, cp_model.IntVar] = {}
+
+    def add_matchups(
+        self,
+        div_matchups: dict[str, list[tuple[str, str]]],
+        is_home: dict[tuple[str, int], cp_model.IntVar],
+        is_away: dict[tuple[str, int], cp_model.IntVar] | None = None,
+    ) -> None:
+        """Create matchup variables and link them to is_home and one-game-per-week.
+
+        Teams with an is_away variable may rest in a week (is_home and
+        is_away both false); all other teams play every week.
+        """
+        model = self.model
+        is_away = is_away or {}
+        first, last = self.weeks[0], self.weeks[-1]
+        names = self.var_names
+
+        for div_name, matchups in div_matchups.items():
+            for t1, t2 in matchups:
+                week_name = var_name(names, "week", div_name, t1, t2)
+                self.week_var[(div_name, t1, t2)] = model.NewIntVar(first, last, week_name)
+                self.home_var[(div_name, t1, t2)] = model.NewBoolVar(var_name(names, "home", div_name, t1, t2))
+
+        self.trace.begin("linkage")
+        print("  Adding variable linkage constraints...")
+        team_home_indicators: dict[tuple[str, int], list] = defaultdict(list)
+
+        for div_name, matchups in div_matchups.items():
+            for t1, t2 in matchups:
+                key = (div_name, t1, t2)
+                for week in self.weeks:
+                    is_week = model.NewBoolVar(var_name(names, "is_week", div_name, t1, t2, week))
+                    model.Add(self.week_var[key] == week).OnlyEnforceIf(is_week)
+                    model.Add(self.week_var[key] != week).OnlyEnforceIf(is_week.Not())
+
+                    t1_home_this = model.NewBoolVar(var_name(names, "t1h", div_name, t1, t2, week))
+                    model.AddBoolAnd([is_week, self.home_var[key]]).OnlyEnforceIf(t1_home_this)
+                    model.AddBoolOr([is_week.Not(), self.home_var[key].Not()]).OnlyEnforceIf(t1_home_this.Not())
+                    team_home_indicators[(t1, week)].append(t1_home_this)
+
+                    t2_home_this = model.NewBoolVar(var_name(names, "t2h", div_name, t1, t2, week))
+                    model.AddBoolAnd([is_week, self.home_var[key].Not()]).OnlyEnforceIf(t2_home_this)
+                    model.AddBoolOr([is_week.Not(), self.home_var[key]]).OnlyEnforceIf(t2_home_this.Not())
+                    team_home_indicators[(t2, week)].append(t2_home_this)
+
+        print("  Linking is_home variables...")
+        for (team, week), indicators in team_home_indicators.items():
+            model.Add(is_home[(team, week)] == sum(indicators))
+
+        self.trace.begin("one_per_week")
+        print("  Adding one-game-per-week constraints...")
+        for div_name, matchups in div_matchups.items():
+            # Each team's matchups, in matchup order
+            team_matchups: dict[str, list[tuple[str, str]]] = defaultdict(list)
+            for t1, t2 in matchups:
+                team_matchups[t1].append((t1, t2))
+                team_matchups[t2].append((t1, t2))
+            for team in sorted(team_matchups):
+                for week in self.weeks:
+                    matchups_this_week = []
+                    for t1, t2 in team_matchups[team]:
+                        is_w = model.NewBoolVar(var_name(names, "cnt", div_name, team, t1, t2, week))
+                        model.Add(self.week_var[(div_name, t1, t2)] == week).OnlyEnforceIf(is_w)
+                        model.Add(self.week_var[(div_name, t1, t2)] != week).OnlyEnforceIf(is_w.Not())
+                        matchups_this_week.append(is_w)
+                    if (team, week) in is_away:
+                        model.AddAtMostOne(matchups_this_week)
+                        model.Add(sum(matchups_this_week) == is_home[(team, week)] + is_away[(team, week)])
+                    else:
+                        model.Add(sum(matchups_this_week) == 1)
+
+    def fix_week(self, key: MatchKey, week: int) -> None:
+        """Force a matchup into the given week."""
+        self.model.Add(self.week_var[key] == week)
+
+    def t1_home_expr(self, key: MatchKey) -> cp_model.LinearExprT:
+        """1 if t1 hosts the matchup, else 0."""
+        return self.home_var[key]
+
+    def in_week(self, key: MatchKey, week: int) -> cp_model.LinearExprT:
+        """1 if the matchup is played in the given week, else 0."""
+        is_week = self.model.NewBoolVar(var_name(self.var_names, "in_week", *key, week))
+        self.model.Add(self.week_var[key] == week).OnlyEnforceIf(is_week)
+        self.model.Add(self.week_var[key] != week).OnlyEnforceIf(is_week.Not())
+        return is_week
+
+    def add_hint(self, key: MatchKey, week: int, t1_is_home: bool) -> None:
+        """Hint the solver that a matchup is played in the given week and orientation."""
+        self.model.AddHint(self.week_var[key], week)
+        self.model.AddHint(self.home_var[key], t1_is_home)
+
+    def slot_literal(self, key: MatchKey, week: int, t1_is_home: bool) -> cp_model.IntVar:
+        """Literal that is true when a matchup is played in the given week and orientation."""
+        home = self.home_var[key] if t1_is_home else self.home_var[key].Not()
+        in_slot = self.model.NewBoolVar(var_name(self.var_names, "slot", *key, week, int(t1_is_home)))
+        is_week = self.model.NewBoolVar(var_name(self.var_names, "slot_week", *key, week))
+        self.model.Add(self.week_var[key] == week).OnlyEnforceIf(is_week)
+        self.model.Add(self.week_var[key] != week).OnlyEnforceIf(is_week.Not())
+        self.model.AddBoolAnd([is_week, home]).OnlyEnforceIf(in_slot)
+        self.model.AddBoolOr([is_week.Not(), home.Not()]).OnlyEnforceIf(in_slot.Not())
+        return in_slot
+
+    def variable_indices(self, key: MatchKey) -> list[int]:
+        """Proto indices of the variables that decide a matchup's week and orientation."""
+        return [self.week_var[key].Index(), self.home_var[key].Index()]
+
+    def slot_values(self, key: MatchKey, week: int, t1_is_home: bool) -> list[int]:
+        """Values of variable_indices(key) for the matchup in the given week and orientation."""
+        return [week, int(t1_is_home)]
+
+    def solution(self, values: np.ndarray, keys: list[MatchKey]) -> tuple[np.ndarray, np.ndarray]:
+        """Weeks and t1_is_home flags of matchups, from the solver's value array."""
+        week_index = np.fromiter((self.week_var[key].Index() for key in keys), dtype=np.int64, count=len(keys))
+        home_index = np.fromiter((self.home_var[key].Index() for key in keys), dtype=np.int64, count=len(keys))
+        return values[week_index], values[home_index] == 1
+
+    def index_maps(self) -> dict[str, list]:
+        """Proto indices of the matchup variables (see fix_gen.model_cache)."""
+        return {
+            "week_var": [[*key, var.Index()] for key, var in self.week_var.items()],
+            "home_var": [[*key, var.Index()] for key, var in self.home_var.items()],
+        }
+
+    def restore_index_maps(self, maps: dict[str, list]) -> None:
+        """Rebind the matchup variables of a model loaded from the cache."""
+        for div_name, t1, t2, index in maps["week_var"]:
+            self.week_var[(div_name, t1, t2)] = self.model.GetIntVarFromProtoIndex(index)
+        for div_name, t1, t2, index in maps["home_var"]:
+            self.home_var[(div_name, t1, t2)] = self.model.GetBoolVarFromProtoIndex(index)
+
+
+class BooleanEngine:
+    """
+    Round-indexed Boolean formulation.
+
+    Each matchup has one Boolean per (week, orientation): "t1 hosts t2 in
+    week w" and "t2 hosts t1 in week w". Their sum is plays[key, w], so
+    one-match-per-pair and one-game-per-team-week are plain exactly-one
+    constraints and is_home is a linear sum, with no reified equalities or
+    AND-gates.
+
+    The slot Booleans are written straight into the model proto as one
+    contiguous block per matchup and addressed by integer proto index
+    (first_slot[key] + 2 * week offset, +1 when t2 hosts), so no Python
+    variable objects or per-slot dict entries are kept; the linkage
+    constraints are written into the proto the same way, and the solution is
+    read back as one array slice per matchup.
+    """
+
+    name = "boolean"
+
+    def __init__(
+        self,
+        model: cp_model.CpModel,
+        weeks: list[int],
+        trace: SolveTrace | None = None,
+        var_names: bool = True,
+    ):
+        self.model = model
+        self.weeks = weeks
+        # Phase timings ("linkage", "one_per_week") are recorded here
+        self.trace = trace if trace is not None else SolveTrace()
+        # Name the variables (for debugging exported models); off in lean builds
+        self.var_names = var_names
+        self.week_offset = {week: i for i, week in enumerate(weeks)}
+        # Proto index of the "t1 hosts in the first week" Boolean of each matchup
+        self.first_slot: dict[MatchKey, int] = {}
+
+    def slot_index(self, key: MatchKey, week: int, t1_is_home: bool) -> int:
+        """Proto index of the Boolean for a matchup in a week and orientation."""
+        return self.first_slot[key] + 2 * self.week_offset[week] + (0 if t1_is_home else 1)
+
+    def add_matchups(
+        self,
+        div_matchups: dict[str, list[tuple[str, str]]],
+        is_home: dict[tuple[str, int], cp_model.IntVar],
+        is_away: dict[tuple[str, int], cp_model.IntVar] | None = None,
+    ) -> None:
+        """Create matchup variables and link them to is_home and one-game-per-week.
+
+        Teams with an is_away variable may rest in a week (is_home and
+        is_away both false); all other teams play every week.
+        """
+        proto = self.model.Proto()
+        is_away = is_away or {}
+        # Proto indices of the slots where a team hosts, and where it is away, by week
+        team_week_hosting: dict[tuple[str, int], list[int]] = defaultdict(list)
+        team_week_visiting: dict[tuple[str, int], list[int]] = defaultdict(list)
+
+        print("  Adding round-indexed matchup variables...")
+        self.trace.begin("linkage")
+        for div_name, matchups in div_matchups.items():
+            for t1, t2 in matchups:
+                first = len(proto.variables)
+                self.first_slot[(div_name, t1, t2)] = first
+                for week in self.weeks:
+                    for home, away in ((t1, t2), (t2, t1)):
+                        var = proto.variables.add()
+                        var.domain.extend((0, 1))
+                        if self.var_names:
+                            var.name = f"p_{div_name}_{home}_{away}_{week}"
+                    index = first + 2 * self.week_offset[week]
+                    team_week_hosting[(t1, week)].append(index)
+                    team_week_visiting[(t2, week)].append(index)
+                    team_week_hosting[(t2, week)].append(index + 1)
+                    team_week_visiting[(t1, week)].append(index + 1)
+
+                # Each pair meets exactly once in the modelled weeks
+                proto.constraints.add().exactly_one.literals.extend(range(first, len(proto.variables)))
+
+        self.trace.begin("one_per_week")
+        print("  Adding one-game-per-week constraints...")
+        for (team, week), hosting in team_week_hosting.items():
+            visiting = team_week_visiting[(team, week)]
+            if (team, week) in is_away:
+                proto.constraints.add().at_most_one.literals.extend(hosting + visiting)
+                _add_sum_equals(proto, is_away[(team, week)].Index(), visiting)
+            else:
+                proto.constraints.add().exactly_one.literals.extend(hosting + visiting)
+            _add_sum_equals(proto, is_home[(team, week)].Index(), hosting)
+
+    def _literal(self, index: int) -> cp_model.IntVar:
+        return self.model.GetBoolVarFromProtoIndex(index)
+
+    def fix_week(self, key: MatchKey, week: int) -> None:
+        """Force a matchup into the given week."""
+        index = self.slot_index(key, week, True)
+        self.model.Proto().constraints.add().exactly_one.literals.extend((index, index + 1))
+
+    def t1_home_expr(self, key: MatchKey) -> cp_model.LinearExprT:
+        """1 if t1 hosts the matchup, else 0."""
+        return sum(self._literal(self.slot_index(key, week, True)) for week in self.weeks)
+
+    def in_week(self, key: MatchKey, week: int) -> cp_model.LinearExprT:
+        """1 if the matchup is played in the given week, else 0."""
+        index = self.slot_index(key, week, True)
+        return self._literal(index) + self._literal(index + 1)
+
+    def add_hint(self, key: MatchKey, week: int, t1_is_home: bool) -> None:
+        """Hint the solver that a matchup is played in the given week and orientation."""
+        hint = self.model.Proto().solution_hint
+        first = self.first_slot[key]
+        chosen = self.slot_index(key, week, t1_is_home)
+        hint.vars.extend(range(first, first + 2 * len(self.weeks)))
+        hint.values.extend(int(index == chosen) for index in range(first, first + 2 * len(self.weeks)))
+
+    def slot_literal(self, key: MatchKey, week: int, t1_is_home: bool) -> cp_model.IntVar:
+        """Literal that is true when a matchup is played in the given week and orientation."""
+        return self._literal(self.slot_index(key, week, t1_is_home))
+
+    def variable_indices(self, key: MatchKey) -> list[int]:
+        """Proto indices of the variables that decide a matchup's week and orientation."""
+        first = self.first_slot[key]
+        return list(range(first, first + 2 * len(self.weeks)))
+
+    def slot_values(self, key: MatchKey, week: int, t1_is_home: bool) -> list[int]:
+        """Values of variable_indices(key) for the matchup in the given week and orientation."""
+        chosen = self.slot_index(key, week, t1_is_home) - self.first_slot[key]
+        return [int(i == chosen) for i in range(2 * len(self.weeks))]
+
+    def solution(self, values: np.ndarray, keys: list[MatchKey]) -> tuple[np.ndarray, np.ndarray]:
+        """Weeks and t1_is_home flags of matchups, from the solver's value array."""
+        first = np.fromiter((self.first_slot[key] for key in keys), dtype=np.int64, count=len(keys))
+        # Row k holds matchup k's slots: (t1 hosts, t2 hosts) for each week in turn
+        slots = values[first[:, None] + np.arange(2 * len(self.weeks))]
+        if not slots.any(axis=1).all():
+            raise RuntimeError("A matchup has no week assigned in the solution")
+        chosen = slots.argmax(axis=1)
+        return np.asarray(self.weeks, dtype=np.int64)[chosen // 2], chosen % 2 == 0
+
+    def index_maps(self) -> dict[str, list]:
+        """Proto indices of the slot variables (see fix_gen.model_cache)."""
+        return {"first_slot": [[*key, index] for key, index in self.first_slot.items()]}
+
+    def restore_index_maps(self, maps: dict[str, list]) -> None:
+        """Rebind the slot variables of a model loaded from the cache."""
+        for div_name, t1, t2, index in maps["first_slot"]:
+            self.first_slot[(div_name, t1, t2)] = index
+
+
+def _add_sum_equals(proto, target: int, indices: list[int]) -> None:
+    """Add target == sum(indices) to a model proto."""
+    linear = proto.constraints.add().linear
+    linear.vars.extend([target, *indices])
+    linear.coeffs.extend([1] + [-1] * len(indices))
+    linear.domain.extend((0, 0))
+
+
+ENGINES = {
+    WeekVarEngine.name: WeekVarEngine,
+    BooleanEngine.name: BooleanEngine,
+}
@@ -6,11 +6,40 @@ import random
 from collections import defaultdict
 from itertools import combinations
 
+import numpy as np
 from ortools.sat.python import cp_model
 
-from .config import WEIGHTS, SOLVER_TIME_LIMIT
-from .ground_sharing import build_ground_sharing_pairs
+from .config import (
+    LEAN_BUILD,
+    MIRRORED_SEASON,
+    MODEL_ENGINE,
+    NUM_SEARCH_WORKERS,
+    OBJECTIVE_LEVELS,
+    OBJECTIVE_MODE,
+    SEQUENCE_MODE,
+    SOFT_ENCODING,
+    SOLVER_TIME_LIMIT,
+    SYMMETRY_BREAKING,
+    WARM_START,
+    WEIGHTS,
+)
+from .construction import QuickGenerator
+from .engines import ENGINES, var_name
+from .ground_sharing import build_shared_venue_pairs
+from .instrumentation import ProgressRecorder, SolveTrace
+from .model_cache import BuiltModel, ModelCache, model_fingerprint
 from .models import Division, FixedMatch, Fixture, VenueRequirement
+from .patterns import legal_patterns
+from .schedule import Schedule
+from .season import Season, VenueLiterals
+from .solution_store import SolutionStore, input_fingerprint, league_fingerprint
+from .stopping import STOP_INFEASIBLE, STOP_OPTIMAL, STOP_TARGET_REACHED, STOP_TIME_LIMIT, StoppingPolicy
+from .symmetry import interchangeable_teams, pinned_teams, unpinned_components
+from .validation import CrossDivisionCoordinator, validate_fixtures
+
+# Status of a lexicographic solve with every level proven optimal. It is not
+# "OPTIMAL", since the weighted penalty may still be improvable.
+LEXICOGRAPHIC_OPTIMAL = "LEXICOGRAPHIC_OPTIMAL"
 
 
 class FixtureGenerator:
@@ -19,7 +48,8 @@ class FixtureGenerator:
 
     Uses constraint programming to satisfy hard constraints (round-robin,
     fixed matches, venue requirements, no 4+ consecutive) and minimize
-    soft constraint violations (ground sharing, 3 consecutive).
+    soft constraint violations (ground sharing, 3 consecutive). The season
+    length and bye weeks follow from the division sizes (see fix_gen.season).
     """
 
     def __init__(
@@ -40,7 +70,8 @@ class FixtureGenerator:
             for team in div.teams:
                 self.team_to_division[team.code] = div
 
-        self.ground_sharing_pairs = build_ground_sharing_pairs(divisions)
+        # Ground sharing and venue conflict pairs, with the WEIGHTS keys of their penalties
+        self.shared_venue_pairs = build_shared_venue_pairs(divisions, self.venue_conflicts)
 
         # Venue requirements by team and week
         self.venue_req_lookup: dict[tuple[str, int], str] = {}
@@ -52,41 +83,497 @@ class FixtureGenerator:
         for fm in fixed_matches:
             self.fixed_match_lookup[fm.week].append(fm)
 
-        # All teams
+        # All teams, and each team's position in that list
         self.all_teams = [t.code for div in divisions for t in div.teams]
+        self.team_index = {team: i for i, team in enumerate(self.all_teams)}
+
+        # Result of the last solve
+        self.status: str | None = None
+        self.objective: float | None = None
+        self.trace: SolveTrace | None = None
 
-    def generate(self, seed: int | None = None) -> list[Fixture]:
+    def generate(
+        self,
+        seed: int | None = None,
+        engine: str = MODEL_ENGINE,
+        sequence_mode: str = SEQUENCE_MODE,
+        symmetry_breaking: bool = SYMMETRY_BREAKING,
+        warm_start: bool = WARM_START,
+        previous: list[Fixture] | None = None,
+        frozen_divisions: set[str] | None = None,
+        time_limit: float = SOLVER_TIME_LIMIT,
+        num_workers: int = NUM_SEARCH_WORKERS,
+        solution_callback: cp_model.CpSolverSolutionCallback | None = None,
+        trace: SolveTrace | None = None,
+        stopping: StoppingPolicy | None = None,
+        model_cache: ModelCache | None = None,
+        solution_store: SolutionStore | None = None,
+        mirrored: bool = MIRRORED_SEASON,
+        lean: bool = LEAN_BUILD,
+        soft_encoding: str = SOFT_ENCODING,
+        objective_mode: str = OBJECTIVE_MODE,
+        store_hints: bool = True,
+        lazy: bool = False,
+    ) -> list[Fixture] | Schedule:
         """Generate complete fixture list for all divisions in one unified model.
 
         Args:
             seed: Optional random seed for reproducible but varied fixture generation.
                   Different seeds produce different valid fixture sets.
+            engine: Matchup formulation to build ("boolean" or "week_var"),
+                    see fix_gen.engines.
+            sequence_mode: How the consecutive home/away rules are modelled: "table"
+                    restricts each team to the precomputed legal patterns
+                    (fix_gen.patterns), "linear" adds the window constraints and
+                    reified 3-in-a-row penalties directly.
+            symmetry_breaking: Add ordering constraints that remove equivalent
+                    schedules (see fix_gen.symmetry).
+            warm_start: Hint the solver with the constructive draft schedule
+                    (see fix_gen.construction).
+            previous: A previously published fixture list to re-solve from. It is
+                    used as the starting solution, and every fixture moved from
+                    its previous week or venue costs WEIGHTS["churn"].
+            frozen_divisions: Names of divisions whose previous fixtures are kept
+                    unchanged (see fix_gen.incremental.affected_divisions).
+            time_limit: Maximum solver time in seconds.
+            num_workers: Number of CP-SAT search workers.
+            solution_callback: Optional callback invoked on every improving solution
+                    (replaces the default ProgressRecorder, so improving solutions
+                    are then not recorded in the trace).
+            stopping: Early stopping rules and hard time cap (see fix_gen.stopping);
+                    replaces time_limit. Default: the config STOP_* rules with
+                    time_limit as the cap.
+            trace: SolveTrace to fill with phase timings, model statistics and
+                    improving solutions (default: a new one).
+            model_cache: Load the built model from this cache, or store it there
+                    (see fix_gen.model_cache). Not used with `previous`. Each
+                    seed has its own entry, since the seed shuffles the build.
+            solution_store: Record the solution in this store and, for unseeded
+                    runs, hint from its best solution for the same inputs, or for
+                    the same divisions, instead of the warm start draft (see
+                    fix_gen.solution_store). Not used with `previous`.
+            mirrored: Mirror the first half into the second with venues swapped;
+                    otherwise the second half is scheduled freely (see
+                    fix_gen.season). The table sequence mode needs a mirrored
+                    season without byes.
+            lean: Build the model without variable names, which cuts its memory
+                    on large leagues; pass False to debug an exported model.
+            soft_encoding: "half" (half-reified penalty literals, one "same
+                    venue" literal per pair and week in mirrored seasons) or
+                    "full" (fully reified, the original encoding); see
+                    config.SOFT_ENCODING.
+            objective_mode: "weighted" (minimise the WEIGHTS-weighted penalty) or
+                    "lexicographic" (minimise each OBJECTIVE_LEVELS penalty in
+                    turn, keeping the levels before it at their best value; the
+                    time limit is split between the levels). `objective` is the
+                    weighted penalty either way, and the lexicographic level
+                    values are kept in trace.levels. A lexicographic solve with
+                    every level optimal has status LEXICOGRAPHIC_OPTIMAL, so the
+                    solution store does not take it as weighted-optimal.
+            store_hints: Hint from the solution store's best solution when no
+                    seed is given. Pass False to only record the solution.
+            lazy: Return the compact Schedule (integer columns over an interned
+                    team table) instead of a list; it yields the fixtures in
+                    (week, division, home team) order without storing them
+                    (see fix_gen.schedule).
+
+        After solving, `status` and `objective` hold the solver status name and
+        the final penalty (None if no solution was found), and `trace` holds the
+        SolveTrace (see fix_gen.instrumentation).
         """
+        season = self._season(engine, sequence_mode, mirrored, soft_encoding)
+        if objective_mode not in ("weighted", "lexicographic"):
+            raise ValueError(f"Unknown objective mode: {objective_mode!r} (expected 'weighted' or 'lexicographic')")
+
         if seed is not None:
             print(f"Using seed: {seed}")
             random.seed(seed)
 
-        print("Building unified CP-SAT model for all divisions...")
+        trace = trace if trace is not None else SolveTrace()
+        self.trace = trace
+
+        # The cache is only used for models that do not depend on a previous schedule
+        fingerprint = None
+        built = None
+        if model_cache is not None and previous is None:
+            fingerprint = model_fingerprint(
+                self.divisions, self.fixed_matches, self.venue_requirements, self.venue_conflicts,
+                engine, sequence_mode, symmetry_breaking, mirrored, lean, soft_encoding, seed,
+            )
+            trace.begin("load_model")
+            built = model_cache.load(fingerprint, engine, season, trace)
+            if built is not None:
+                print(f"Loaded CP-SAT model from cache ({engine} engine, {fingerprint[:12]})")
+
+        if built is None:
+            built = self._build_model(
+                seed,
+                engine,
+                sequence_mode,
+                symmetry_breaking,
+                previous,
+                frozen_divisions,
+                season,
+                lean,
+                soft_encoding,
+                trace,
+            )
+            if fingerprint is not None:
+                trace.begin("store_model")
+                model_cache.store(fingerprint, built)
+
+        model = built.model
+
+        # =================================================================
+        # Warm start from the constructive draft schedule (optional)
+        # =================================================================
+
+        trace.begin("hints")
+        input_key = league_key = None
+        stored = None
+        if solution_store is not None and previous is None:
+            input_key = input_fingerprint(
+                self.divisions, self.fixed_matches, self.venue_requirements, self.venue_conflicts, mirrored
+            )
+            league_key = league_fingerprint(self.divisions, mirrored)
+            # A seed must reproduce its own schedule, whatever the store holds
+            if store_hints and seed is None:
+                stored = solution_store.best(input_key) or solution_store.best_similar(league_key)
+
+        if stored is not None:
+            source = "stored solution" if stored.same_inputs else "stored solution for other requirements"
+            print(f"  Adding hints from {source} (seed {stored.seed}, penalty {stored.objective:.0f})...")
+            self._add_schedule_hints(built, stored.fixtures)
+        elif warm_start and previous is None:
+            # The draft is always mirrored, which is also a valid free second half
+            print("  Adding warm start hints from constructive schedule...")
+            draft = QuickGenerator(self.divisions, self.fixed_matches, self.venue_requirements, self.venue_conflicts)
+            self._add_schedule_hints(built, draft.generate(seed))
+
+        # =================================================================
+        # Solve
+        # =================================================================
+
+        trace.end()
+        trace.record_model(model)
+        trace.record_memory("build")
+        peak = f", peak {trace.memory['build']:.0f} MiB" if "build" in trace.memory else ""
+        print(
+            f"  Model: {trace.model_stats['variables']} variables, {trace.model_stats['constraints']} constraints "
+            f"(built in {sum(trace.phases.values()):.1f}s{peak})"
+        )
+
+        print("  Solving...")
+        trace.begin("solve")
+        policy = stopping if stopping is not None else StoppingPolicy(time_limit=time_limit)
+        # Presolve symmetry reductions fix pattern literals without regard to the
+        # hint, and the solver rarely repairs a table-mode schedule hint in time
+        keep_hint = bool(built.pattern_choice) and len(model.Proto().solution_hint.vars) > 0
+        if objective_mode == "lexicographic" and built.has_objective:
+            status, values, solve_time = self._solve_lexicographic(
+                built, policy, num_workers, seed, trace, solution_callback, keep_hint
+            )
+            objective = self._weighted_objective(built, values) if values is not None else None
+        else:
+            solver = cp_model.CpSolver()
+            solver.parameters.max_time_in_seconds = policy.time_limit
+            solver.parameters.num_search_workers = num_workers
+            if seed is not None:
+                solver.parameters.random_seed = seed
+            if keep_hint:
+                solver.parameters.symmetry_level = 0
+
+            recorder = ProgressRecorder(trace, policy)
+            try:
+                status = solver.Solve(model, solution_callback or recorder)
+            finally:
+                recorder.close()
+            solve_time = solver.WallTime()
+            values = objective = None
+            if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                values = np.array(solver.ResponseProto().solution, dtype=np.int64)
+                objective = solver.ObjectiveValue() if built.has_objective else 0.0
+                if built.has_objective:
+                    trace.bound = solver.BestObjectiveBound()
+        trace.end()
+        trace.record_memory("solve")
+        if trace.stop_reason is None:
+            trace.stop_reason = {
+                cp_model.OPTIMAL: STOP_OPTIMAL,
+                cp_model.INFEASIBLE: STOP_INFEASIBLE,
+            }.get(status, STOP_TIME_LIMIT)
+        print(f"  Stopped by: {trace.stop_reason} ({solve_time:.1f}s)")
+        self.status = status.name
+        if objective_mode == "lexicographic" and built.has_objective and status == cp_model.OPTIMAL:
+            # Optimal level by level, not for the weighted penalty: keep it out of --reuse
+            self.status = LEXICOGRAPHIC_OPTIMAL
+        trace.status = self.status
+        trace.solve_time = solve_time
+
+        if values is None:
+            print("  WARNING: No solution found!")
+            self.objective = None
+            return []
+
+        print(f"  Solution found! Status: {self.status}")
+        self.objective = objective
+        if built.has_objective:
+            print(f"  Objective (penalty): {self.objective}")
+        trace.objective = self.objective
+
+        trace.begin("extract")
+
+        # =================================================================
+        # Extract solution
+        # =================================================================
+
+        fixtures = self._extract_schedule(built, values)
+
+        # Re-solves are not recorded: their penalty includes churn and frozen divisions
+        if solution_store is not None and previous is None:
+            trace.begin("record")
+            solution_store.record(
+                input_key,
+                league_key,
+                seed,
+                engine,
+                self.status,
+                self.objective,
+                validate_fixtures(fixtures, self.divisions),
+                CrossDivisionCoordinator(self.divisions, self.venue_conflicts).check_violations(fixtures),
+                fixtures,
+            )
+
+        trace.end()
+        return fixtures if lazy else list(fixtures)
+
+    def _solve_lexicographic(
+        self,
+        built: BuiltModel,
+        policy: StoppingPolicy,
+        num_workers: int,
+        seed: int | None,
+        trace: SolveTrace,
+        solution_callback: cp_model.CpSolverSolutionCallback | None = None,
+        keep_hint: bool = False,
+    ) -> tuple[cp_model.CpSolverStatus, np.ndarray | None, float]:
+        """Minimise the objective levels one at a time, in OBJECTIVE_LEVELS order.
+
+        Each stage solves a copy of the model for one level's penalty, hinted
+        with the previous stage's solution, and then caps that level at the
+        value it reached. The remaining time is split evenly over the remaining
+        stages; the gap and stall rules apply to each stage, and the target
+        objective to the weighted penalty after each stage. The trace's stop
+        reason is that of the last stage run. Each stage's
+        improving solutions are appended to the trace, tagged with their level
+        and timed from the start of the first stage (solution_callback, if
+        given, replaces the recorder in every stage). keep_hint turns off
+        symmetry reductions in every stage, as for the weighted solve. Returns
+        the status (OPTIMAL only if every stage was), the last solution's values
+        and the total solve time.
+        """
+        model = built.model.clone()
+        proto = model.Proto()
+        levels = list(built.objective_levels.items())
+        values = None
+        elapsed = 0.0
+        optimal = True
+        for i, (name, (variables, coeffs, offset)) in enumerate(levels):
+            proto.objective.vars.clear()
+            proto.objective.vars.extend(variables)
+            proto.objective.coeffs.clear()
+            proto.objective.coeffs.extend(coeffs)
+            proto.objective.offset = offset
+            if values is not None:
+                proto.solution_hint.vars.clear()
+                proto.solution_hint.vars.extend(range(len(values)))
+                proto.solution_hint.values.clear()
+                proto.solution_hint.values.extend(values.tolist())
+
+            solver = cp_model.CpSolver()
+            solver.parameters.max_time_in_seconds = max(0.0, policy.time_limit - elapsed) / (len(levels) - i)
+            solver.parameters.num_search_workers = num_workers
+            if seed is not None:
+                solver.parameters.random_seed = seed
+            if keep_hint:
+                solver.parameters.symmetry_level = 0
+            stage_policy = StoppingPolicy(gap=policy.gap, stall_seconds=policy.stall_seconds, target_objective=None)
+            stage_trace = SolveTrace()
+            recorder = ProgressRecorder(stage_trace, stage_policy)
+            try:
+                status = solver.Solve(model, solution_callback or recorder)
+            finally:
+                recorder.close()
+            for point in stage_trace.solutions:
+                point.wall_time += elapsed
+                point.level = name
+            trace.solutions.extend(stage_trace.solutions)
+            # The last stage run decides the reported reason
+            trace.stop_reason = stage_trace.stop_reason or {
+                cp_model.OPTIMAL: STOP_OPTIMAL,
+                cp_model.INFEASIBLE: STOP_INFEASIBLE,
+            }.get(status, STOP_TIME_LIMIT)
+            elapsed += solver.WallTime()
+
+            if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                values = np.array(solver.ResponseProto().solution, dtype=np.int64)
+            elif values is None:
+                return status, None, elapsed
+            # A stage without a solution keeps the previous one, which still bounds its level
+            optimal = optimal and status == cp_model.OPTIMAL
+            best = int(np.dot(coeffs, values[variables]))
+            trace.levels[name] = best + offset
+            print(f"    {name}: {best + offset:g} ({status.name}, {solver.WallTime():.1f}s)")
+            if policy.target_objective is not None and i < len(levels) - 1:
+                if self._weighted_objective(built, values) <= policy.target_objective:
+                    trace.stop_reason = STOP_TARGET_REACHED
+                    return cp_model.FEASIBLE, values, elapsed
+            cap = proto.constraints.add().linear
+            cap.vars.extend(variables)
+            cap.coeffs.extend(coeffs)
+            cap.domain.extend((sum(min(coeff, 0) for coeff in coeffs), best))
+
+        return cp_model.OPTIMAL if optimal else cp_model.FEASIBLE, values, elapsed
+
+    def _weighted_objective(self, built: BuiltModel, values: np.ndarray) -> float:
+        """The WEIGHTS-weighted penalty of a solution."""
+        return float(sum(
+            WEIGHTS[name] * (np.dot(coeffs, values[variables]) + offset)
+            for name, (variables, coeffs, offset) in built.objective_levels.items()
+        ))
+
+    def _season(self, engine: str, sequence_mode: str, mirrored: bool, soft_encoding: str = SOFT_ENCODING) -> Season:
+        """The season to model, after checking the build options."""
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown model engine: {engine} (expected one of {sorted(ENGINES)})")
+        if sequence_mode not in ("linear", "table"):
+            raise ValueError(f"Unknown sequence mode: {sequence_mode} (expected 'linear' or 'table')")
+        if soft_encoding not in ("half", "full"):
+            raise ValueError(f"Unknown soft encoding: {soft_encoding} (expected 'half' or 'full')")
+
+        season = Season.for_divisions(self.divisions, mirrored)
+        if sequence_mode == "table" and (not mirrored or any(season.has_byes(div) for div in self.divisions)):
+            raise ValueError("The table sequence mode needs a mirrored season without byes")
+        return season
+
+    def _extract_schedule(self, built: BuiltModel, values: np.ndarray) -> Schedule:
+        """The schedule in a solver value array (see CpSolverResponse.solution)."""
+        # Integer columns (one row per modelled match) behind a lazy fixture view
+        team_index = self.team_index
+        weeks, homes, aways, div_indices = [], [], [], []
+        for d, div in enumerate(self.divisions):
+            matchups = built.div_matchups[div.name]
+            keys = [(div.name, t1, t2) for t1, t2 in matchups]
+            t1 = np.array([team_index[t1] for t1, _ in matchups], dtype=np.int64)
+            t2 = np.array([team_index[t2] for _, t2 in matchups], dtype=np.int64)
+            for leg in built.legs:
+                week, t1_is_home = leg.solution(values, keys)
+                weeks.append(week)
+                homes.append(np.where(t1_is_home, t1, t2))
+                aways.append(np.where(t1_is_home, t2, t1))
+                div_indices.append(np.full(len(matchups), d, dtype=np.int64))
+
+        # The second half of a mirrored season is the view's venue-swapped copy
+        columns = [
+            np.concatenate(column) if column else np.empty(0, dtype=np.int64)
+            for column in (weeks, homes, aways, div_indices)
+        ]
+        season = built.season
+        return Schedule(
+            self.all_teams,
+            [div.name for div in self.divisions],
+            *columns,
+            mirror_weeks=season.half_weeks if season.mirrored else 0,
+        )
+
+    @staticmethod
+    def _schedule_slots(
+        fixtures: list[Fixture],
+        season: Season,
+    ) -> dict[tuple[int, str, frozenset[str]], tuple[int, str]]:
+        """(week, home team) of each fixture that a modelled leg decides, by (leg, division, pair)."""
+        slots = {}
+        for f in fixtures:
+            week, swapped = season.scheduled_week(f.week)
+            if not swapped:
+                slots[(season.leg(f.week), f.division, frozenset((f.home_team, f.away_team)))] = (week, f.home_team)
+        return slots
+
+    def _add_schedule_hints(self, built: BuiltModel, fixtures: list[Fixture]) -> None:
+        """Hint the solver with a complete schedule (the fixtures of the modelled weeks).
+
+        In table sequence mode each team's pattern literals are hinted too, from
+        its hinted first-half home flags.
+        """
+        slots = self._schedule_slots(fixtures, built.season)
+        home_hints: dict[tuple[str, int], int] = {}
+        for leg_index, leg in enumerate(built.legs):
+            for div in self.divisions:
+                for t1, t2 in built.div_matchups[div.name]:
+                    slot = slots.get((leg_index, div.name, frozenset((t1, t2))))
+                    if slot is None or slot[0] not in leg.weeks:
+                        continue
+                    week, home = slot
+                    leg.add_hint((div.name, t1, t2), week, home == t1)
+                    for team in (t1, t2):
+                        home_hints[(team, week)] = int(home == team)
+                        built.model.AddHint(built.is_home[(team, week)], home == team)
+                        if (team, week) in built.is_away:
+                            built.model.AddHint(built.is_away[(team, week)], home != team)
+
+        if built.pattern_choice:
+            table = {pattern: i for i, (pattern, _) in enumerate(legal_patterns(built.season.half_weeks))}
+            first_half = built.season.scheduled_weeks()[0]
+            for team, choice in built.pattern_choice.items():
+                chosen = table.get(tuple(home_hints.get((team, week)) for week in first_half))
+                if chosen is not None:
+                    for i, lit in enumerate(choice):
+                        built.model.AddHint(lit, i == chosen)
+
+    def _build_model(
+        self,
+        seed: int | None,
+        engine: str,
+        sequence_mode: str,
+        symmetry_breaking: bool,
+        previous: list[Fixture] | None,
+        frozen_divisions: set[str] | None,
+        season: Season,
+        lean: bool,
+        soft_encoding: str,
+        trace: SolveTrace,
+    ) -> BuiltModel:
+        """Build the unified model (without hints); see generate for the arguments.
+
+        Teams and matchups are shuffled with the global random state when seed is given.
+        """
+        print(f"Building unified CP-SAT model for all divisions ({engine} engine)...")
+        trace.begin("variables")
         model = cp_model.CpModel()
-        weeks_first_half = list(range(1, 10))  # Weeks 1-9
+        scheduled_weeks = season.scheduled_weeks()
+        names = not lean
 
         # =================================================================
         # Variables - for all divisions
         # =================================================================
 
-        # week_var[(div_name, t1, t2)] = which week (1-9) this matchup occurs
-        week_var: dict[tuple[str, str, str], cp_model.IntVar] = {}
-        # home_var[(div_name, t1, t2)] = 1 if t1 is home, 0 if t2 is home
-        home_var: dict[tuple[str, str, str], cp_model.IntVar] = {}
-        # is_home[(team, week)] = 1 if team plays at home in this week (first half)
+        # is_home[(team, week)] = 1 if team plays at home in this week (modelled weeks)
         is_home: dict[tuple[str, int], cp_model.IntVar] = {}
+        # is_away[(team, week)] = 1 if team plays away, only for teams with bye weeks
+        is_away: dict[tuple[str, int], cp_model.IntVar] = {}
 
         # Create variables for each team's home status per week
-        for team in self.all_teams:
-            for week in weeks_first_half:
-                is_home[(team, week)] = model.NewBoolVar(f"home_{team}_{week}")
-
-        # Create variables for each division's matchups
+        for div in self.divisions:
+            byes = season.has_byes(div)
+            for team in div.teams:
+                for weeks in scheduled_weeks:
+                    for week in weeks:
+                        is_home[(team.code, week)] = model.NewBoolVar(var_name(names, "home", team.code, week))
+                        if byes:
+                            is_away[(team.code, week)] = model.NewBoolVar(var_name(names, "away", team.code, week))
+        venue = VenueLiterals(season, is_home, is_away)
+
+        # Matchups for each division
         div_matchups: dict[str, list[tuple[str, str]]] = {}
         for div in self.divisions:
             teams = [t.code for t in div.teams]
@@ -97,319 +584,327 @@ class FixtureGenerator:
                 random.shuffle(matchups)
             div_matchups[div.name] = matchups
 
-            for t1, t2 in matchups:
-                week_var[(div.name, t1, t2)] = model.NewIntVar(1, 9, f"week_{div.name}_{t1}_{t2}")
-                home_var[(div.name, t1, t2)] = model.NewBoolVar(f"home_{div.name}_{t1}_{t2}")
-
         # =================================================================
-        # Link variables - connect matchup assignments to is_home
+        # Matchup scheduling - engine-specific variables, linkage to
+        # is_home and one-game-per-week, once per modelled leg
         # =================================================================
 
-        print("  Adding variable linkage constraints...")
-        team_home_indicators: dict[tuple[str, int], list] = defaultdict(list)
-
-        for div in self.divisions:
-            matchups = div_matchups[div.name]
-
-            for t1, t2 in matchups:
-                for week in weeks_first_half:
-                    is_week = model.NewBoolVar(f"is_week_{div.name}_{t1}_{t2}_{week}")
-                    model.Add(week_var[(div.name, t1, t2)] == week).OnlyEnforceIf(is_week)
-                    model.Add(week_var[(div.name, t1, t2)] != week).OnlyEnforceIf(is_week.Not())
-
-                    t1_home_this = model.NewBoolVar(f"t1h_{div.name}_{t1}_{t2}_{week}")
-                    model.AddBoolAnd([is_week, home_var[(div.name, t1, t2)]]).OnlyEnforceIf(t1_home_this)
-                    model.AddBoolOr([is_week.Not(), home_var[(div.name, t1, t2)].Not()]).OnlyEnforceIf(t1_home_this.Not())
-                    team_home_indicators[(t1, week)].append(t1_home_this)
-
-                    t2_home_this = model.NewBoolVar(f"t2h_{div.name}_{t1}_{t2}_{week}")
-                    model.AddBoolAnd([is_week, home_var[(div.name, t1, t2)].Not()]).OnlyEnforceIf(t2_home_this)
-                    model.AddBoolOr([is_week.Not(), home_var[(div.name, t1, t2)]]).OnlyEnforceIf(t2_home_this.Not())
-                    team_home_indicators[(t2, week)].append(t2_home_this)
-
-        print("  Linking is_home variables...")
-        for team in self.all_teams:
-            for week in weeks_first_half:
-                indicators = team_home_indicators[(team, week)]
-                if indicators:
-                    model.Add(is_home[(team, week)] == sum(indicators))
+        legs = [ENGINES[engine](model, weeks, trace, var_names=names) for weeks in scheduled_weeks]
+        for leg in legs:
+            leg.add_matchups(div_matchups, is_home, is_away)
 
         # =================================================================
-        # Hard Constraint: Each team plays exactly once per week
+        # Free second half: every pair meets again with venues swapped, not
+        # in the week straight after the first meeting
         # =================================================================
 
-        print("  Adding one-game-per-week constraints...")
-        for div in self.divisions:
-            teams = [t.code for t in div.teams]
-            matchups = div_matchups[div.name]
-
-            for team in teams:
-                for week in weeks_first_half:
-                    matchups_this_week = []
-                    for t1, t2 in matchups:
-                        if team in (t1, t2):
-                            is_w = model.NewBoolVar(f"cnt_{div.name}_{team}_{t1}_{t2}_{week}")
-                            model.Add(week_var[(div.name, t1, t2)] == week).OnlyEnforceIf(is_w)
-                            model.Add(week_var[(div.name, t1, t2)] != week).OnlyEnforceIf(is_w.Not())
-                            matchups_this_week.append(is_w)
-                    model.Add(sum(matchups_this_week) == 1)
+        if not season.mirrored:
+            trace.begin("second_half")
+            print("  Linking the second half to the first...")
+            first, second = legs
+            last_week = season.half_weeks
+            for div_name, matchups in div_matchups.items():
+                for t1, t2 in matchups:
+                    key = (div_name, t1, t2)
+                    model.Add(first.t1_home_expr(key) + second.t1_home_expr(key) == 1)
+                    model.Add(first.in_week(key, last_week) + second.in_week(key, last_week + 1) <= 1)
+
+        # Pattern literals and 3-in-a-row counts per team when using the pattern table
+        pattern_choice: dict[str, list[cp_model.IntVar]] = {}
+        consecutive_runs: list = []
 
         # =================================================================
         # Hard Constraint: Fixed matches (fixReq)
         # =================================================================
 
+        trace.begin("fixed_matches")
         print("  Adding fixed match constraints...")
+        matchup_keys = self._matchup_keys(div_matchups)
         for fm in self.fixed_matches:
-            for div in self.divisions:
-                teams = [t.code for t in div.teams]
-                if fm.team1 in teams and fm.team2 in teams:
-                    matchups = div_matchups[div.name]
-                    key = (div.name, fm.team1, fm.team2) if (fm.team1, fm.team2) in [(m[0], m[1]) for m in matchups] else (div.name, fm.team2, fm.team1)
-                    if fm.week <= 9:
-                        model.Add(week_var[key] == fm.week)
-                    else:
-                        model.Add(week_var[key] == fm.week - 9)
-                    break
+            # Only teams of the same division have a matchup
+            key = matchup_keys.get((fm.team1, fm.team2))
+            if key is not None:
+                week, _ = season.scheduled_week(fm.week)
+                legs[season.leg(fm.week)].fix_week(key, week)
 
         # =================================================================
         # Hard Constraint: Venue requirements (venReq)
         # =================================================================
 
+        trace.begin("venue_requirements")
         print("  Adding venue requirement constraints...")
-        for (team, week), venue in self.venue_req_lookup.items():
-            if team in self.all_teams:
-                if week <= 9:
-                    if venue == "h":
-                        model.Add(is_home[(team, week)] == 1)
-                    else:
-                        model.Add(is_home[(team, week)] == 0)
-                else:
-                    mirror_week = week - 9
-                    if venue == "h":
-                        model.Add(is_home[(team, mirror_week)] == 0)
-                    else:
-                        model.Add(is_home[(team, mirror_week)] == 1)
+        for (team, week), required in self.venue_req_lookup.items():
+            if team in self.team_index:
+                model.Add(venue.venue(team, week, required == "h") == 1)
 
         # =================================================================
-        # Hard Constraint: No 4 consecutive home or away games
+        # Symmetry breaking (optional)
         # =================================================================
 
-        print("  Adding no-4-consecutive constraints...")
-        for team in self.all_teams:
-            for start in range(1, 7):
-                weeks_seq = [start, start + 1, start + 2, start + 3]
-                home_vars = [is_home[(team, w)] for w in weeks_seq]
-                model.Add(sum(home_vars) <= 3)
-                model.Add(sum(home_vars) >= 1)
+        trace.begin("symmetry_breaking")
+        if symmetry_breaking and previous is not None:
+            print("  Skipping symmetry breaking when re-solving from a previous schedule")
+        elif symmetry_breaking and not season.mirrored:
+            print("  Skipping symmetry breaking for a season without a mirrored second half")
+        elif symmetry_breaking:
+            self._add_symmetry_breaking(model, venue, legs[0], matchup_keys, scheduled_weeks[0])
 
-            # Cross-boundary sequences
-            model.Add(
-                is_home[(team, 7)] + is_home[(team, 8)] + is_home[(team, 9)]
-                + (1 - is_home[(team, 1)]) <= 3
-            )
-            model.Add(is_home[(team, 1)] <= is_home[(team, 7)] + is_home[(team, 8)] + is_home[(team, 9)])
-
-            model.Add(
-                is_home[(team, 8)] + is_home[(team, 9)]
-                + (1 - is_home[(team, 1)]) + (1 - is_home[(team, 2)]) <= 3
-            )
-            model.Add(
-                is_home[(team, 1)] + is_home[(team, 2)]
-                <= is_home[(team, 8)] + is_home[(team, 9)] + 1
-            )
-
-            model.Add(
-                is_home[(team, 9)]
-                + (1 - is_home[(team, 1)]) + (1 - is_home[(team, 2)]) + (1 - is_home[(team, 3)]) <= 3
-            )
-            model.Add(
-                is_home[(team, 1)] + is_home[(team, 2)] + is_home[(team, 3)]
-                <= is_home[(team, 9)] + 2
-            )
+        # =================================================================
+        # Hard Constraint: No 4 consecutive home or away games
+        # =================================================================
 
-            model.Add(
-                is_home[(team, 1)] + is_home[(team, 2)] + is_home[(team, 3)] + is_home[(team, 4)] >= 1
-            )
-            model.Add(
-                is_home[(team, 1)] + is_home[(team, 2)] + is_home[(team, 3)] + is_home[(team, 4)] <= 3
-            )
+        trace.begin("sequence_constraints")
+        if sequence_mode == "table":
+            # Each team's first half must match one of the precomputed legal
+            # patterns, chosen by one literal per pattern. Spelled out rather
+            # than AddAllowedAssignments, whose presolve expansion adds
+            # literals that a stored schedule cannot hint
+            print("  Adding home/away pattern table constraints...")
+            table = legal_patterns(season.half_weeks)
+            for team in self.all_teams:
+                choice = [model.NewBoolVar(var_name(names, "pattern", team, i)) for i in range(len(table))]
+                model.AddExactlyOne(choice)
+                for k, w in enumerate(scheduled_weeks[0]):
+                    model.Add(is_home[(team, w)] == sum(lit for lit, (pattern, _) in zip(choice, table) if pattern[k]))
+                pattern_choice[team] = choice
+                consecutive_runs.append(sum(runs * lit for lit, (_, runs) in zip(choice, table) if runs))
+        else:
+            # Windows starting in the second half of a mirrored season repeat
+            # the first-half ones with venues swapped (see Season.window_starts)
+            print("  Adding no-4-consecutive constraints...")
+            for team in self.all_teams:
+                for start in season.window_starts(4):
+                    weeks_seq = range(start, start + 4)
+                    model.Add(sum(venue.home(team, w) for w in weeks_seq) <= 3)
+                    model.Add(sum(venue.away(team, w) for w in weeks_seq) <= 3)
 
         # =================================================================
         # Soft Constraints - Ground sharing and consecutive limits
         # =================================================================
 
+        trace.begin("soft_constraints")
         print("  Adding soft constraints (ground sharing, consecutive)...")
-        penalties = []
-
-        for t1, t2, max_tier in self.ground_sharing_pairs:
-            weight = {
-                1: WEIGHTS["ground_sharing_1st_xi"],
-                2: WEIGHTS["ground_sharing_2nd_xi"],
-                3: WEIGHTS["ground_sharing_3rd_xi"],
-                4: WEIGHTS["ground_sharing_4th_xi"],
-            }.get(max_tier, WEIGHTS["ground_sharing_4th_xi"])
-
-            for week in weeks_first_half:
-                both_home = model.NewBoolVar(f"both_home_{t1}_{t2}_{week}")
-                model.AddBoolAnd([is_home[(t1, week)], is_home[(t2, week)]]).OnlyEnforceIf(both_home)
-                model.AddBoolOr([is_home[(t1, week)].Not(), is_home[(t2, week)].Not()]).OnlyEnforceIf(both_home.Not())
-                penalties.append(both_home * weight)
-
-                both_away = model.NewBoolVar(f"both_away_{t1}_{t2}_{week}")
-                model.AddBoolAnd([is_home[(t1, week)].Not(), is_home[(t2, week)].Not()]).OnlyEnforceIf(both_away)
-                model.AddBoolOr([is_home[(t1, week)], is_home[(t2, week)]]).OnlyEnforceIf(both_away.Not())
-                penalties.append(both_away * weight)
-
-        # Venue conflicts - teams from different clubs sharing pitches
-        for conflict_group in self.venue_conflicts:
-            # Filter to teams that actually exist in our divisions
-            valid_teams = [t for t in conflict_group if t in self.all_teams]
-            if len(valid_teams) < 2:
-                continue
-
-            # For each pair of teams in the conflict group
-            for i, t1 in enumerate(valid_teams):
-                for t2 in valid_teams[i + 1:]:
-                    for week in weeks_first_half:
-                        # Penalize both home in first half (means both home in week W)
-                        both_home_vc = model.NewBoolVar(f"vc_both_home_{t1}_{t2}_{week}")
-                        model.AddBoolAnd([is_home[(t1, week)], is_home[(t2, week)]]).OnlyEnforceIf(both_home_vc)
-                        model.AddBoolOr([is_home[(t1, week)].Not(), is_home[(t2, week)].Not()]).OnlyEnforceIf(both_home_vc.Not())
-                        penalties.append(both_home_vc * WEIGHTS["venue_conflicts"])
-
-                        # Penalize both away in first half (means both home in mirrored week W+9)
-                        both_away_vc = model.NewBoolVar(f"vc_both_away_{t1}_{t2}_{week}")
-                        model.AddBoolAnd([is_home[(t1, week)].Not(), is_home[(t2, week)].Not()]).OnlyEnforceIf(both_away_vc)
-                        model.AddBoolOr([is_home[(t1, week)], is_home[(t2, week)]]).OnlyEnforceIf(both_away_vc.Not())
-                        penalties.append(both_away_vc * WEIGHTS["venue_conflicts"])
-
-        for team in self.all_teams:
-            # Within first half (weeks 1-9)
-            for start in range(1, 8):
-                weeks_seq = [start, start + 1, start + 2]
-                home_list = [is_home[(team, w)] for w in weeks_seq]
-
-                all_home = model.NewBoolVar(f"cons_h_{team}_{start}")
-                model.AddBoolAnd(home_list).OnlyEnforceIf(all_home)
-                model.AddBoolOr([h.Not() for h in home_list]).OnlyEnforceIf(all_home.Not())
-                penalties.append(all_home * WEIGHTS["consecutive_3"])
-
-                all_away = model.NewBoolVar(f"cons_a_{team}_{start}")
-                model.Add(sum(home_list) == 0).OnlyEnforceIf(all_away)
-                model.Add(sum(home_list) >= 1).OnlyEnforceIf(all_away.Not())
-                penalties.append(all_away * WEIGHTS["consecutive_3"])
-
-            # Cross-boundary: weeks 8-9-10 (week 10 = opposite of week 1)
-            # 3 consecutive home: H in 8, H in 9, A in 1 (meaning H in 10)
-            cross_8_9_10_home = model.NewBoolVar(f"cons_h_{team}_8_9_10")
-            model.AddBoolAnd([
-                is_home[(team, 8)],
-                is_home[(team, 9)],
-                is_home[(team, 1)].Not()
-            ]).OnlyEnforceIf(cross_8_9_10_home)
-            model.AddBoolOr([
-                is_home[(team, 8)].Not(),
-                is_home[(team, 9)].Not(),
-                is_home[(team, 1)]
-            ]).OnlyEnforceIf(cross_8_9_10_home.Not())
-            penalties.append(cross_8_9_10_home * WEIGHTS["consecutive_3"])
-
-            # 3 consecutive away: A in 8, A in 9, H in 1 (meaning A in 10)
-            cross_8_9_10_away = model.NewBoolVar(f"cons_a_{team}_8_9_10")
-            model.AddBoolAnd([
-                is_home[(team, 8)].Not(),
-                is_home[(team, 9)].Not(),
-                is_home[(team, 1)]
-            ]).OnlyEnforceIf(cross_8_9_10_away)
-            model.AddBoolOr([
-                is_home[(team, 8)],
-                is_home[(team, 9)],
-                is_home[(team, 1)].Not()
-            ]).OnlyEnforceIf(cross_8_9_10_away.Not())
-            penalties.append(cross_8_9_10_away * WEIGHTS["consecutive_3"])
-
-            # Cross-boundary: weeks 9-10-11 (week 10 = opposite of 1, week 11 = opposite of 2)
-            # 3 consecutive home: H in 9, A in 1, A in 2
-            cross_9_10_11_home = model.NewBoolVar(f"cons_h_{team}_9_10_11")
-            model.AddBoolAnd([
-                is_home[(team, 9)],
-                is_home[(team, 1)].Not(),
-                is_home[(team, 2)].Not()
-            ]).OnlyEnforceIf(cross_9_10_11_home)
-            model.AddBoolOr([
-                is_home[(team, 9)].Not(),
-                is_home[(team, 1)],
-                is_home[(team, 2)]
-            ]).OnlyEnforceIf(cross_9_10_11_home.Not())
-            penalties.append(cross_9_10_11_home * WEIGHTS["consecutive_3"])
-
-            # 3 consecutive away: A in 9, H in 1, H in 2
-            cross_9_10_11_away = model.NewBoolVar(f"cons_a_{team}_9_10_11")
-            model.AddBoolAnd([
-                is_home[(team, 9)].Not(),
-                is_home[(team, 1)],
-                is_home[(team, 2)]
-            ]).OnlyEnforceIf(cross_9_10_11_away)
-            model.AddBoolOr([
-                is_home[(team, 9)],
-                is_home[(team, 1)].Not(),
-                is_home[(team, 2)].Not()
-            ]).OnlyEnforceIf(cross_9_10_11_away.Not())
-            penalties.append(cross_9_10_11_away * WEIGHTS["consecutive_3"])
-
-        if penalties:
-            model.Minimize(sum(penalties))
+        # Unweighted penalty terms by WEIGHTS key
+        penalties: dict[str, list] = defaultdict(list)
+        for name, terms in self.shared_venue_penalty_terms(
+            model, venue, var_names=names, encoding=soft_encoding
+        ).items():
+            penalties[name].extend(terms)
+
+        if sequence_mode == "table":
+            penalties["consecutive_3"].extend(consecutive_runs)
+        else:
+            for team in self.all_teams:
+                for start in season.window_starts(3):
+                    weeks_seq = range(start, start + 3)
+                    for kind, literal in (("h", venue.home), ("a", venue.away)):
+                        literals = [literal(team, w) for w in weeks_seq]
+                        run = model.NewBoolVar(var_name(names, "cons", kind, team, start))
+                        if soft_encoding == "full":
+                            model.AddBoolAnd(literals).OnlyEnforceIf(run)
+                            model.AddBoolOr([lit.Not() for lit in literals]).OnlyEnforceIf(run.Not())
+                        else:
+                            # Three in a row forces run on; minimising keeps it off otherwise
+                            model.AddBoolOr([lit.Not() for lit in literals] + [run])
+                        penalties["consecutive_3"].append(run)
 
         # =================================================================
-        # Solve
+        # Previous schedule: freeze unaffected divisions, penalise churn
         # =================================================================
 
-        print("  Solving...")
-        solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = SOLVER_TIME_LIMIT
-        solver.parameters.num_search_workers = 8
-        if seed is not None:
-            solver.parameters.random_seed = seed
+        trace.begin("previous_schedule")
+        if previous is not None:
+            frozen_divisions = frozen_divisions or set()
+            print(f"  Re-solving from previous schedule ({len(frozen_divisions)} divisions frozen)...")
+            previous_slot = self._schedule_slots(previous, season)
+            for leg_index, leg in enumerate(legs):
+                for div in self.divisions:
+                    for t1, t2 in div_matchups[div.name]:
+                        key = (div.name, t1, t2)
+                        slot = previous_slot.get((leg_index, div.name, frozenset((t1, t2))))
+                        if slot is None or slot[0] not in leg.weeks:
+                            continue
+                        week, home = slot
+                        leg.add_hint(key, week, home == t1)
+                        model.AddHint(is_home[(t1, week)], home == t1)
+                        model.AddHint(is_home[(t2, week)], home == t2)
+                        in_slot = leg.slot_literal(key, week, home == t1)
+                        if div.name in frozen_divisions:
+                            model.Add(in_slot == 1)
+                        else:
+                            penalties["churn"].append(1 - in_slot)
 
-        status = solver.Solve(model)
+        # =================================================================
+        # Objective: the weighted sum, plus each priority level on its own
+        # for the lexicographic solve (kept as proto vars/coeffs/offset)
+        # =================================================================
 
-        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-            print("  WARNING: No solution found!")
-            return []
+        trace.begin("objective")
+        order = [name for name in OBJECTIVE_LEVELS if penalties.get(name)]
+        order += sorted(name for name, terms in penalties.items() if terms and name not in order)
+        objective_levels = {}
+        for name in order:
+            model.Minimize(sum(penalties[name]))
+            objective = model.Proto().objective
+            objective_levels[name] = (list(objective.vars), list(objective.coeffs), objective.offset)
+        if order:
+            model.Minimize(sum(WEIGHTS[name] * sum(penalties[name]) for name in order))
+
+        return BuiltModel(
+            model,
+            season,
+            is_home,
+            is_away,
+            legs,
+            div_matchups,
+            has_objective=bool(order),
+            objective_levels=objective_levels,
+            pattern_choice=pattern_choice,
+        )
+
+    def add_shared_venue_penalties(
+        self,
+        model: cp_model.CpModel,
+        venue: VenueLiterals,
+        cross_division_only: bool = False,
+        var_names: bool = True,
+        encoding: str = SOFT_ENCODING,
+    ) -> list:
+        """Add ground sharing and venue conflict penalties; returns the weighted terms.
+
+        See shared_venue_penalty_terms for the arguments.
+        """
+        terms = self.shared_venue_penalty_terms(model, venue, cross_division_only, var_names, encoding)
+        return [literal * WEIGHTS[name] for name, literals in terms.items() for literal in literals]
 
-        print(f"  Solution found! Status: {solver.StatusName(status)}")
-        if penalties:
-            print(f"  Objective (penalty): {solver.ObjectiveValue()}")
+    def shared_venue_penalty_terms(
+        self,
+        model: cp_model.CpModel,
+        venue: VenueLiterals,
+        cross_division_only: bool = False,
+        var_names: bool = True,
+        encoding: str = SOFT_ENCODING,
+    ) -> dict[str, list]:
+        """Add ground sharing and venue conflict penalties for every week of the season.
+
+        A pair clashes in a week when both teams are at home. In a mirrored
+        season both away in week W is the clash in week W + half_weeks.
+        Returns the clash literals by the WEIGHTS key that weights them.
 
-        # =================================================================
-        # Extract solution
-        # =================================================================
+        Args:
+            cross_division_only: Only penalise pairs whose teams are in different
+                divisions (used when within-division pairs are already scored).
+            var_names: Name the clash variables (off in lean builds).
+            encoding: "half" forces each clash literal on by its violation only
+                (the objective keeps it off otherwise), with one "same venue"
+                literal per first-half week for pairs of teams without byes in a
+                mirrored season; "full" reifies one literal per week (see
+                config.SOFT_ENCODING).
+        """
+        penalties: dict[str, list] = defaultdict(list)
+        season = venue.season
+
+        def is_cross_division(t1: str, t2: str) -> bool:
+            return self.team_to_division[t1] is not self.team_to_division[t2]
+
+        def both_home(name: str, t1: str, t2: str, week: int) -> cp_model.IntVar:
+            home1, home2 = venue.home(t1, week), venue.home(t2, week)
+            clash = model.NewBoolVar(var_name(var_names, name, t1, t2, week))
+            if encoding == "full":
+                model.AddBoolAnd([home1, home2]).OnlyEnforceIf(clash)
+                model.AddBoolOr([home1.Not(), home2.Not()]).OnlyEnforceIf(clash.Not())
+            else:
+                model.AddBoolOr([home1.Not(), home2.Not(), clash])
+            return clash
+
+        def same_venue(name: str, t1: str, t2: str, week: int) -> cp_model.IntVar:
+            # Both home in week W or both away (both home in W + half_weeks)
+            home1, home2 = venue.home(t1, week), venue.home(t2, week)
+            same = model.NewBoolVar(var_name(var_names, name, "same", t1, t2, week))
+            model.AddBoolOr([home1.Not(), home2.Not(), same])
+            model.AddBoolOr([home1, home2, same])
+            return same
+
+        def clashes(name: str, t1: str, t2: str) -> list[cp_model.IntVar]:
+            """Clash literals of a pair over the season."""
+            if encoding == "full" or not (
+                season.mirrored and venue.plays_every_week(t1) and venue.plays_every_week(t2)
+            ):
+                return [both_home(name, t1, t2, week) for week in range(1, season.weeks + 1)]
+            return [same_venue(name, t1, t2, week) for week in range(1, season.half_weeks + 1)]
+
+        # One set of clash literals per pair, counted in each of its penalties
+        for (t1, t2), weights in self.shared_venue_pairs.items():
+            if cross_division_only and not is_cross_division(t1, t2):
+                continue
+            pair_clashes = clashes("both_home", t1, t2)
+            for weight in weights:
+                penalties[weight].extend(pair_clashes)
 
-        fixtures = []
-        for div in self.divisions:
-            matchups = div_matchups[div.name]
+        return penalties
+
+    @staticmethod
+    def _matchup_keys(div_matchups: dict[str, list[tuple[str, str]]]) -> dict[tuple[str, str], tuple[str, str, str]]:
+        """Key of every matchup, in the orientation used by the model, by its two teams in either order."""
+        keys = {}
+        for div_name, matchups in div_matchups.items():
             for t1, t2 in matchups:
-                week = solver.Value(week_var[(div.name, t1, t2)])
-                t1_is_home = solver.Value(home_var[(div.name, t1, t2)])
-
-                if t1_is_home:
-                    home, away = t1, t2
-                else:
-                    home, away = t2, t1
-
-                fixtures.append(Fixture(
-                    week=week,
-                    home_team=home,
-                    away_team=away,
-                    division=div.name,
-                ))
-
-                # Mirror for second half
-                fixtures.append(Fixture(
-                    week=week + 9,
-                    home_team=away,
-                    away_team=home,
-                    division=div.name,
-                ))
-
-        return fixtures
+                keys[(t1, t2)] = keys[(t2, t1)] = (div_name, t1, t2)
+        return keys
+
+    def _add_symmetry_breaking(
+        self,
+        model: cp_model.CpModel,
+        venue: VenueLiterals,
+        match_engine,
+        matchup_keys: dict[tuple[str, str], tuple[str, str, str]],
+        weeks: list[int],
+    ) -> None:
+        """Remove equivalent schedules from the search space (mirrored seasons only).
+
+        For each unpinned component (see fix_gen.symmetry) the season rotation
+        is fixed by putting the first two teams of its first division in week 1
+        with the first at home, and the season reversal by ordering that team's
+        other first-half weeks against their reversed, flipped image. Interchangeable teams
+        (other than those anchor teams) get lexicographically ordered home
+        patterns.
+        """
+        pinned = pinned_teams(self.fixed_matches, self.venue_requirements)
+        components = unpinned_components(self.divisions, self.shared_venue_pairs, pinned)
+        groups = interchangeable_teams(self.divisions, self.shared_venue_pairs, pinned)
+        print(
+            f"  Adding symmetry breaking ({len(components)} unpinned components, "
+            f"{sum(len(g) for g in groups.values())} interchangeable teams)..."
+        )
+
+        def pattern_value(literals: list) -> cp_model.LinearExpr:
+            """Home pattern as a binary number, first week most significant."""
+            return sum(2 ** (len(literals) - 1 - i) * lit for i, lit in enumerate(literals))
+
+        anchors: set[str] = set()
+        for component in components:
+            div = component[0]
+            if len(div.teams) < 2:
+                continue
+            anchor, opponent = div.teams[0].code, div.teams[1].code
+            anchors.update((anchor, opponent))
+
+            # Rotation: every schedule can be rotated so this match is in week 1, anchor at home
+            match_engine.fix_week(matchup_keys[(anchor, opponent)], weeks[0])
+            model.Add(venue.home(anchor, weeks[0]) == 1)
+
+            # Reversal: rotating the reversed season back to week 1 maps week w
+            # (2 to H) to the flip of week H+2-w, so keep the larger of the two
+            later = weeks[1:]
+            model.Add(
+                pattern_value([venue.home(anchor, w) for w in later])
+                >= pattern_value([venue.away(anchor, weeks[-1] + weeks[1] - w) for w in later])
+            )
+
+        for teams in groups.values():
+            teams = [t for t in teams if t not in anchors]
+            for t1, t2 in zip(teams, teams[1:]):
+                model.Add(
+                    pattern_value([venue.home(t1, w) for w in weeks])
+                    >= pattern_value([venue.home(t2, w) for w in weeks])
+                )
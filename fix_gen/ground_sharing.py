@@ -7,6 +7,14 @@ from itertools import combinations
 
 from .models import Division, Team
 
+# WEIGHTS key of a ground sharing pair, by the higher tier of its two teams
+GROUND_SHARING_WEIGHTS = {
+    1: "ground_sharing_1st_xi",
+    2: "ground_sharing_2nd_xi",
+    3: "ground_sharing_3rd_xi",
+    4: "ground_sharing_4th_xi",
+}
+
 
 def get_division_tier(division_name: str) -> int:
     """Get tier number from division name."""
@@ -49,3 +57,35 @@ def build_ground_sharing_pairs(divisions: list[Division]) -> list[tuple[str, str
                     pairs.append((t1.code, t2.code, max_tier))
 
     return pairs
+
+
+def build_shared_venue_pairs(
+    divisions: list[Division],
+    venue_conflicts: list[set[str]] | None = None,
+) -> dict[tuple[str, str], list[str]]:
+    """
+    Build the table of team pairs that should not be at home in the same week,
+    merging ground sharing pairs and venue conflict groups.
+    Returns: {(team1_code, team2_code): WEIGHTS keys of the pair's penalties},
+    with team1 before team2 in the divisions' team order. A pair that shares a
+    ground and a conflicting venue (or is in several conflict groups) appears
+    once, so its clash is modelled once and penalised with the combined weight.
+    Conflict teams that are not in the divisions are ignored.
+    """
+    position = {team.code: i for i, team in enumerate(t for div in divisions for t in div.teams)}
+
+    def ordered(t1: str, t2: str) -> tuple[str, str]:
+        return (t1, t2) if position[t1] < position[t2] else (t2, t1)
+
+    pairs: dict[tuple[str, str], list[str]] = {}
+    for t1, t2, max_tier in build_ground_sharing_pairs(divisions):
+        pairs.setdefault(ordered(t1, t2), []).append(GROUND_SHARING_WEIGHTS.get(max_tier, "ground_sharing_4th_xi"))
+
+    for group in venue_conflicts or []:
+        teams = sorted((t for t in group if t in position), key=position.__getitem__)
+        for t1, t2 in combinations(teams, 2):
+            keys = pairs.setdefault((t1, t2), [])
+            if "venue_conflicts" not in keys:
+                keys.append("venue_conflicts")
+
+    return pairs
@@ -0,0 +1,109 @@
+"""
+Incremental re-solve support: find the divisions of a previously published
+schedule that no longer satisfy the current requirements.
+
+Only those divisions need to be re-solved; the rest can be frozen to their
+published fixtures (see FixtureGenerator.generate's `previous` and
+`frozen_divisions` arguments), so a single new requirement costs a small
+solve and changes as few published fixtures as possible.
+"""
+
+from collections import defaultdict
+
+from .config import MIRRORED_SEASON
+from .ground_sharing import build_shared_venue_pairs
+from .models import Division, FixedMatch, Fixture, VenueRequirement
+from .season import Season
+
+
+def affected_divisions(
+    previous: list[Fixture],
+    divisions: list[Division],
+    fixed_matches: list[FixedMatch],
+    venue_requirements: list[VenueRequirement],
+    include_neighbours: bool = False,
+    mirrored: bool = MIRRORED_SEASON,
+    venue_conflicts: list[set[str]] | None = None,
+) -> set[str]:
+    """Names of divisions whose previous fixtures must change.
+
+    A division is affected when its previous fixtures are not a complete
+    double round robin of its current teams in the current season shape, or
+    break a current fixed match or venue requirement.
+
+    Args:
+        include_neighbours: Also include divisions with a team sharing a
+            ground or a venue conflict group with a team of an affected division.
+        mirrored: Whether the season's second half must mirror the first
+            (see fix_gen.season).
+        venue_conflicts: Venue conflict groups linking neighbouring divisions.
+    """
+    season = Season.for_divisions(divisions, mirrored)
+    by_division: dict[str, list[Fixture]] = defaultdict(list)
+    for f in previous:
+        by_division[f.division].append(f)
+
+    team_to_division = {t.code: div.name for div in divisions for t in div.teams}
+    venue: dict[tuple[str, int], str] = {}
+    meetings: set[tuple[int, frozenset[str]]] = set()
+    for f in previous:
+        venue[(f.home_team, f.week)] = "h"
+        venue[(f.away_team, f.week)] = "a"
+        meetings.add((f.week, frozenset((f.home_team, f.away_team))))
+
+    affected = {div.name for div in divisions if not _is_double_round_robin(div, by_division[div.name], season)}
+
+    for fm in fixed_matches:
+        if (fm.week, frozenset((fm.team1, fm.team2))) not in meetings and fm.team1 in team_to_division:
+            affected.add(team_to_division[fm.team1])
+
+    for req in venue_requirements:
+        if req.team in team_to_division and venue.get((req.team, req.week)) != req.venue:
+            affected.add(team_to_division[req.team])
+
+    if include_neighbours:
+        neighbours = set()
+        for t1, t2 in build_shared_venue_pairs(divisions, venue_conflicts):
+            div1, div2 = team_to_division[t1], team_to_division[t2]
+            if div1 in affected:
+                neighbours.add(div2)
+            if div2 in affected:
+                neighbours.add(div1)
+        affected |= neighbours
+
+    return affected
+
+
+def _is_double_round_robin(div: Division, fixtures: list[Fixture], season: Season) -> bool:
+    """Whether fixtures are a round robin of the division in each half of the season.
+
+    The second meeting of each pair must swap the venues; in a mirrored
+    season it is also exactly half_weeks after the first, otherwise it must
+    not be in the week straight after.
+    """
+    teams = {t.code for t in div.teams}
+    halves: list[dict[frozenset[str], tuple[int, str]]] = [{}, {}]
+    for f in fixtures:
+        if f.home_team not in teams or f.away_team not in teams or not 1 <= f.week <= season.weeks:
+            return False
+        half = 0 if f.week <= season.half_weeks else 1
+        halves[half][frozenset((f.home_team, f.away_team))] = (f.week, f.home_team)
+
+    n = len(teams)
+    first_half, second_half = halves
+    if len(first_half) != n * (n - 1) // 2 or first_half.keys() != second_half.keys():
+        return False
+    if len(fixtures) != 2 * len(first_half):
+        return False
+
+    for pair, (week, home) in second_half.items():
+        first_week, first_home = first_half[pair]
+        if home == first_home:
+            return False
+        if season.mirrored and week != first_week + season.half_weeks:
+            return False
+        if week == first_week + 1:
+            return False
+
+    team_weeks = {(t, f.week) for f in fixtures for t in (f.home_team, f.away_team)}
+    return len(team_weeks) == 2 * len(fixtures)
@@ -0,0 +1,204 @@
+"""
+Solve-time instrumentation: model-building phase timings, model statistics,
+peak memory and every improving solution found by the solver.
+
+FixtureGenerator.generate fills a SolveTrace on every run (available as
+`generator.trace` afterwards), which can be written out as JSON or CSV to
+tune and regression-test performance.
+"""
+
+import csv
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from ortools.sat.python import cp_model
+
+from .stopping import STOP_STALLED, StoppingPolicy
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_memory_mb() -> float | None:
+    """Peak resident memory of this process in MiB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+@dataclass
+class SolutionPoint:
+    wall_time: float  # Seconds since the solver started
+    objective: float
+    bound: float
+    gap: float  # Relative gap (objective - bound) / max(1, |objective|)
+    level: str | None = None  # Lexicographic mode: the objective level being minimised
+
+
+@dataclass
+class SolveTrace:
+    phases: dict[str, float] = field(default_factory=dict)  # Seconds spent per phase
+    model_stats: dict[str, int] = field(default_factory=dict)
+    memory: dict[str, float] = field(default_factory=dict)  # Peak resident MiB after a stage ("build", "solve")
+    solutions: list[SolutionPoint] = field(default_factory=list)
+    status: str | None = None
+    objective: float | None = None
+    bound: float | None = None
+    solve_time: float | None = None
+    stop_reason: str | None = None  # Which stopping rule ended the solve (see fix_gen.stopping)
+    levels: dict[str, float] = field(default_factory=dict)  # Lexicographic mode: penalty reached per level
+
+    def __post_init__(self):
+        self._phase: str | None = None
+        self._phase_start = 0.0
+
+    def begin(self, phase: str) -> None:
+        """Start timing a phase, ending the current one. Repeated phases accumulate."""
+        self.end()
+        self._phase = phase
+        self._phase_start = time.perf_counter()
+
+    def end(self) -> None:
+        """End the current phase, if any."""
+        if self._phase is not None:
+            elapsed = time.perf_counter() - self._phase_start
+            self.phases[self._phase] = self.phases.get(self._phase, 0.0) + elapsed
+            self._phase = None
+
+    def record_model(self, model: cp_model.CpModel) -> None:
+        """Record variable and constraint counts, by constraint type."""
+        proto = model.Proto()
+        self.model_stats = {
+            "variables": len(proto.variables),
+            "constraints": len(proto.constraints),
+        }
+        by_type = Counter(_constraint_kind(c) for c in proto.constraints)
+        for kind, count in sorted(by_type.items()):
+            self.model_stats[f"constraints_{kind}"] = count
+
+    def record_memory(self, stage: str) -> None:
+        """Record the process's peak resident memory so far."""
+        peak = peak_memory_mb()
+        if peak is not None:
+            self.memory[stage] = peak
+
+    def first_solution_time(self) -> float | None:
+        return self.solutions[0].wall_time if self.solutions else None
+
+    def best_solution_time(self) -> float | None:
+        return self.solutions[-1].wall_time if self.solutions else None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def write_json(self, filepath: Path) -> None:
+        """Write the whole trace as JSON."""
+        with open(filepath, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def write_csv(self, filepath: Path) -> None:
+        """Write the improving solutions as CSV (one row per solution)."""
+        with open(filepath, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["wall_time", "objective", "bound", "gap", "level"])
+            for point in self.solutions:
+                writer.writerow(
+                    [f"{point.wall_time:.3f}", point.objective, point.bound, f"{point.gap:.6f}", point.level or ""]
+                )
+
+    def write(self, filepath: Path) -> None:
+        """Write as CSV if the path ends in .csv, JSON otherwise."""
+        if Path(filepath).suffix.lower() == ".csv":
+            self.write_csv(filepath)
+        else:
+            self.write_json(filepath)
+
+
+# Constraint kinds used by the fixture models, most common first
+_CONSTRAINT_KINDS = ["linear", "bool_or", "bool_and", "exactly_one", "at_most_one", "table", "all_diff"]
+
+
+def _constraint_kind(constraint) -> str:
+    """Name of a ConstraintProto's constraint field (e.g. "linear", "bool_or")."""
+    if hasattr(constraint, "WhichOneof"):
+        return constraint.WhichOneof("constraint") or "empty"
+    # OR-Tools >= 9.13 exposes the proto through bindings without WhichOneof
+    for kind in _CONSTRAINT_KINDS:
+        if getattr(constraint, f"has_{kind}")():
+            return kind
+    return "other"
+
+
+def relative_gap(objective: float, bound: float) -> float:
+    """Relative optimality gap, 0 when proven optimal."""
+    return abs(objective - bound) / max(1.0, abs(objective))
+
+
+class ProgressRecorder(cp_model.CpSolverSolutionCallback):
+    """Records every improving solution into a SolveTrace and applies a stopping policy.
+
+    Gap and target rules are checked on each improving solution. Stalls are
+    detected by a timer restarted on each improving solution, since the
+    callback is not invoked while the search is not improving. Call close()
+    once the solve returns.
+    """
+
+    def __init__(self, trace: SolveTrace, policy: StoppingPolicy | None = None):
+        super().__init__()
+        self.trace = trace
+        self.policy = policy
+        self._stall_timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def on_solution_callback(self):
+        objective = self.ObjectiveValue()
+        bound = self.BestObjectiveBound()
+        gap = relative_gap(objective, bound)
+        self.trace.solutions.append(SolutionPoint(
+            wall_time=self.WallTime(),
+            objective=objective,
+            bound=bound,
+            gap=gap,
+        ))
+
+        if self.policy is None:
+            return
+        reason = self.policy.check(objective, gap)
+        if reason is not None:
+            self._stop(reason)
+        elif self.policy.stall_seconds is not None:
+            self._restart_stall_timer()
+
+    def close(self) -> None:
+        """Cancel the stall timer; no further stops are requested after this."""
+        with self._lock:
+            self._closed = True
+            if self._stall_timer is not None:
+                self._stall_timer.cancel()
+
+    def _restart_stall_timer(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            if self._stall_timer is not None:
+                self._stall_timer.cancel()
+            self._stall_timer = threading.Timer(self.policy.stall_seconds, self._stop, args=(STOP_STALLED,))
+            self._stall_timer.daemon = True
+            self._stall_timer.start()
+
+    def _stop(self, reason: str) -> None:
+        with self._lock:
+            if self._closed or self.trace.stop_reason is not None:
+                return
+            self.trace.stop_reason = reason
+            self.StopSearch()
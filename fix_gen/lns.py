@@ -0,0 +1,366 @@
+"""
+Large neighbourhood search (LNS) over an existing schedule.
+
+Improving an already-good schedule with a full solve spends most of the
+search on parts of the league that are already fine. LNSImprover builds the
+unified model once, then repeatedly frees one neighbourhood:
+
+- club: every match of one club's teams, across all divisions
+- window: every match played in a few consecutive weeks of a leg
+- division: every match of one division
+
+All other matchup variables are fixed to the incumbent schedule through
+their domains, and the small sub-model is re-solved with a short time limit,
+hinted with the incumbent. Sub-solves run concurrently in a process pool
+(each worker parses the model once), and any sub-solve that beats the
+incumbent replaces it. The search stops at the time limit, when no
+neighbourhood can improve the incumbent, or on the StoppingPolicy's target
+and stall rules.
+"""
+
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from .config import (
+    LEAN_BUILD,
+    LNS_NEIGHBOURHOOD_TIME_LIMIT,
+    LNS_WINDOW_WEEKS,
+    MIRRORED_SEASON,
+    MODEL_ENGINE,
+    SEQUENCE_MODE,
+    SOFT_ENCODING,
+)
+from .generator import FixtureGenerator
+from .instrumentation import SolutionPoint, SolveTrace
+from .model_cache import BuiltModel, parse_model
+from .models import Division, FixedMatch, Fixture, VenueRequirement
+from .schedule import Schedule
+from .stopping import (
+    STOP_LOCAL_OPTIMUM,
+    STOP_OPTIMAL,
+    STOP_STALLED,
+    STOP_TARGET_REACHED,
+    STOP_TIME_LIMIT,
+    StoppingPolicy,
+)
+
+
+@dataclass
+class Neighbourhood:
+    """Part of the schedule freed in one sub-solve."""
+
+    kind: str  # "club", "window" or "division"
+    label: str
+    rows: np.ndarray | None = None  # Club and division: the matchup rows freed
+    leg: int = 0  # Window: the leg and the (first, last) week freed
+    weeks: tuple[int, int] = (0, 0)
+
+
+# Smallest penalty decrease accepted; ObjectiveValue() carries floating-point noise
+IMPROVEMENT_TOLERANCE = 1e-6
+
+# Set in each worker process by _init_worker
+_worker_model: cp_model.CpModel | None = None
+_worker_decision: np.ndarray | None = None
+
+
+def _init_worker(model_text: str, decision: np.ndarray) -> None:
+    """Parse the model once per worker process."""
+    global _worker_model, _worker_decision
+    _worker_model = parse_model(model_text)
+    _worker_decision = decision
+
+
+def _fix_variables(model: cp_model.CpModel, indices: np.ndarray, values: np.ndarray) -> None:
+    """Fix variables to values by narrowing their domains."""
+    variables = model.Proto().variables
+    for index, value in zip(indices.tolist(), values[indices].tolist()):
+        domain = variables[index].domain
+        domain.clear()
+        domain.extend((value, value))
+
+
+def _solve_neighbourhood(
+    values: np.ndarray,
+    free: np.ndarray,
+    objective: float,
+    time_limit: float,
+    num_workers: int,
+    seed: int,
+) -> tuple[str, float | None, np.ndarray | None]:
+    """Re-solve with only the `free` variables unfixed (runs in a worker process).
+
+    Returns the status name, the sub-solve's penalty, and its value array if
+    it beats `objective` (else None).
+    """
+    model = _worker_model.clone()
+    _fix_variables(model, _worker_decision[~np.isin(_worker_decision, free)], values)
+    hint = model.Proto().solution_hint
+    hint.vars.extend(range(len(values)))
+    hint.values.extend(values.tolist())
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_search_workers = num_workers
+    solver.parameters.random_seed = seed
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return solver.StatusName(status), None, None
+    if solver.ObjectiveValue() >= objective - IMPROVEMENT_TOLERANCE:
+        return solver.StatusName(status), solver.ObjectiveValue(), None
+    return solver.StatusName(status), solver.ObjectiveValue(), np.array(solver.ResponseProto().solution, dtype=np.int64)
+
+
+class LNSImprover:
+    """Improves a schedule by re-solving one neighbourhood at a time in a process pool."""
+
+    def __init__(
+        self,
+        divisions: list[Division],
+        fixed_matches: list[FixedMatch],
+        venue_requirements: list[VenueRequirement],
+        venue_conflicts: list[set[str]] | None = None,
+    ):
+        self.generator = FixtureGenerator(divisions, fixed_matches, venue_requirements, venue_conflicts)
+        self.divisions = divisions
+        self.status: str | None = None
+        self.objective: float | None = None
+        self.trace: SolveTrace | None = None
+
+    def improve(
+        self,
+        fixtures: list[Fixture] | Schedule,
+        seed: int | None = None,
+        engine: str = MODEL_ENGINE,
+        sequence_mode: str = SEQUENCE_MODE,
+        stopping: StoppingPolicy | None = None,
+        mirrored: bool = MIRRORED_SEASON,
+        lean: bool = LEAN_BUILD,
+        soft_encoding: str = SOFT_ENCODING,
+        neighbourhood_time_limit: float = LNS_NEIGHBOURHOOD_TIME_LIMIT,
+        window_weeks: int = LNS_WINDOW_WEEKS,
+        processes: int | None = None,
+        lazy: bool = False,
+    ) -> list[Fixture] | Schedule:
+        """Improve a complete schedule and return the best one found.
+
+        Args:
+            fixtures: The schedule to start from; it must satisfy every hard
+                constraint of the model.
+            seed: Seeds the neighbourhood order and the sub-solves.
+            engine, sequence_mode, mirrored, lean, soft_encoding: Model build options (see
+                FixtureGenerator.generate).
+            stopping: Time limit for the whole search, plus the target and
+                stall rules (the gap rule does not apply: LNS has no bound).
+            neighbourhood_time_limit: Solver time limit for each sub-solve.
+            window_weeks: Number of consecutive weeks a window neighbourhood frees.
+            processes: Sub-solves run at once (default: one per core). The
+                cores are split evenly, so each sub-solve gets
+                cpu_count // processes search workers.
+            lazy: Return the compact Schedule instead of a list.
+
+        After the search, `status` is "OPTIMAL" for a zero penalty and
+        "FEASIBLE" otherwise, `objective` holds the final penalty and `trace`
+        the build phases, the starting penalty and each accepted improvement.
+        """
+        generator = self.generator
+        policy = stopping if stopping is not None else StoppingPolicy()
+        rng = random.Random(seed)
+        cpu_count = os.cpu_count() or 1
+        processes = max(1, min(processes or cpu_count, cpu_count))
+        workers_per_solve = max(1, cpu_count // processes)
+
+        season = generator._season(engine, sequence_mode, mirrored, soft_encoding)
+        trace = SolveTrace()
+        self.trace = trace
+        built = generator._build_model(None, engine, sequence_mode, False, None, None, season, lean, soft_encoding, trace)
+        trace.end()
+        trace.record_model(built.model)
+
+        # One row per modelled matchup and leg, in the order of leg.solution
+        leg_keys = [
+            [(div.name, t1, t2) for div in self.divisions for t1, t2 in built.div_matchups[div.name]]
+            for _ in built.legs
+        ]
+        row_indices = [np.asarray(leg.variable_indices(key)) for leg, keys in zip(built.legs, leg_keys) for key in keys]
+        decision = np.concatenate(row_indices)
+        neighbourhoods = self._neighbourhoods(built, leg_keys, window_weeks)
+
+        trace.begin("initial")
+        values, objective = self._initial_values(built, fixtures, leg_keys, decision, workers_per_solve)
+        print(f"  Starting schedule penalty: {objective:.0f}")
+        print(
+            f"  Large neighbourhood search: {len(neighbourhoods)} neighbourhoods, {processes} processes "
+            f"({workers_per_solve} search workers each, {neighbourhood_time_limit:g}s per sub-solve)..."
+        )
+
+        trace.begin("lns")
+        start = time.perf_counter()
+        last_improvement = start
+        trace.solutions.append(SolutionPoint(0.0, objective, 0.0, objective / max(1.0, objective)))
+        row_weeks = self._row_weeks(built, leg_keys, values)
+        exhausted: set[int] = set()  # Neighbourhoods proven not to improve the incumbent
+        queue: list[int] = []
+        in_flight: dict[Future, tuple[int, float]] = {}
+        stop_reason = None
+        submitted = 0
+
+        def next_neighbourhood() -> int | None:
+            busy = {n for n, _ in in_flight.values()}
+            for _ in range(len(neighbourhoods)):
+                if not queue:
+                    queue.extend(rng.sample(range(len(neighbourhoods)), len(neighbourhoods)))
+                n = queue.pop()
+                if n not in exhausted and n not in busy:
+                    return n
+            return None
+
+        model_text = str(built.model.Proto())
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(model_text, decision)) as pool:
+            while True:
+                elapsed = time.perf_counter() - start
+                if stop_reason is None:
+                    if objective <= IMPROVEMENT_TOLERANCE:
+                        # No penalty left: zero is the lower bound
+                        stop_reason = STOP_OPTIMAL
+                    elif (
+                        policy.target_objective is not None
+                        and objective <= policy.target_objective + IMPROVEMENT_TOLERANCE
+                    ):
+                        stop_reason = STOP_TARGET_REACHED
+                    elif policy.stall_seconds is not None and time.perf_counter() - last_improvement >= policy.stall_seconds:
+                        stop_reason = STOP_STALLED
+                    elif elapsed >= policy.time_limit:
+                        stop_reason = STOP_TIME_LIMIT
+                    elif len(exhausted) == len(neighbourhoods):
+                        stop_reason = STOP_LOCAL_OPTIMUM
+
+                while stop_reason is None and len(in_flight) < processes:
+                    n = next_neighbourhood()
+                    if n is None:
+                        break
+                    free = self._free_indices(neighbourhoods[n], row_indices, row_weeks)
+                    future = pool.submit(
+                        _solve_neighbourhood,
+                        values,
+                        free,
+                        objective,
+                        min(neighbourhood_time_limit, policy.time_limit - elapsed),
+                        workers_per_solve,
+                        (seed or 0) + submitted,
+                    )
+                    in_flight[future] = (n, objective)
+                    submitted += 1
+
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    n, base = in_flight.pop(future)
+                    status, sub_objective, sub_values = future.result()
+                    if sub_values is not None and sub_objective < objective - IMPROVEMENT_TOLERANCE:
+                        # A schedule improved from an older incumbent is still complete and valid
+                        values, objective = sub_values, sub_objective
+                        row_weeks = self._row_weeks(built, leg_keys, values)
+                        exhausted.clear()
+                        last_improvement = time.perf_counter()
+                        wall_time = last_improvement - start
+                        trace.solutions.append(SolutionPoint(wall_time, objective, 0.0, objective / max(1.0, objective)))
+                        print(f"  [{wall_time:6.1f}s] {neighbourhoods[n].label}: penalty {objective:.0f}")
+                    elif status == "OPTIMAL" and base == objective:
+                        exhausted.add(n)
+
+        trace.end()
+        trace.stop_reason = stop_reason
+        trace.solve_time = time.perf_counter() - start
+        print(f"  Stopped by: {stop_reason} ({trace.solve_time:.1f}s, {submitted} sub-solves)")
+        self.objective = objective
+        self.status = "OPTIMAL" if objective < IMPROVEMENT_TOLERANCE else "FEASIBLE"
+        trace.status = self.status
+        trace.objective = objective
+        trace.bound = 0.0
+
+        schedule = generator._extract_schedule(built, values)
+        return schedule if lazy else list(schedule)
+
+    def _neighbourhoods(
+        self,
+        built: BuiltModel,
+        leg_keys: list[list[tuple[str, str, str]]],
+        window_weeks: int,
+    ) -> list[Neighbourhood]:
+        """Every club, window and division neighbourhood of the model."""
+        keys = [key for keys in leg_keys for key in keys]
+        club_of = {t.code: t.club for div in self.divisions for t in div.teams}
+        row_division = np.array([key[0] for key in keys], dtype=object)
+        row_clubs = [(club_of[t1], club_of[t2]) for _, t1, t2 in keys]
+
+        neighbourhoods = []
+        for club in sorted(set(club_of.values())):
+            rows = np.array([r for r, clubs in enumerate(row_clubs) if club in clubs], dtype=np.int64)
+            neighbourhoods.append(Neighbourhood("club", f"club {club}", rows=rows))
+        for leg_index, leg in enumerate(built.legs):
+            size = min(window_weeks, len(leg.weeks))
+            for i in range(len(leg.weeks) - size + 1):
+                first, last = leg.weeks[i], leg.weeks[i + size - 1]
+                neighbourhoods.append(Neighbourhood("window", f"weeks {first}-{last}", leg=leg_index, weeks=(first, last)))
+        for div in self.divisions:
+            neighbourhoods.append(Neighbourhood("division", div.name, rows=np.flatnonzero(row_division == div.name)))
+        return neighbourhoods
+
+    @staticmethod
+    def _row_weeks(built: BuiltModel, leg_keys: list[list[tuple[str, str, str]]], values: np.ndarray) -> list[np.ndarray]:
+        """Week of each matchup row in the incumbent, per leg."""
+        return [leg.solution(values, keys)[0] for leg, keys in zip(built.legs, leg_keys)]
+
+    @staticmethod
+    def _free_indices(
+        neighbourhood: Neighbourhood,
+        row_indices: list[np.ndarray],
+        row_weeks: list[np.ndarray],
+    ) -> np.ndarray:
+        """Proto indices of the decision variables a neighbourhood frees."""
+        rows = neighbourhood.rows
+        if rows is None:
+            offset = sum(len(weeks) for weeks in row_weeks[: neighbourhood.leg])
+            weeks = row_weeks[neighbourhood.leg]
+            first, last = neighbourhood.weeks
+            rows = offset + np.flatnonzero((weeks >= first) & (weeks <= last))
+        if not len(rows):
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([row_indices[r] for r in rows.tolist()])
+
+    def _initial_values(
+        self,
+        built: BuiltModel,
+        fixtures: list[Fixture] | Schedule,
+        leg_keys: list[list[tuple[str, str, str]]],
+        decision: np.ndarray,
+        num_workers: int,
+    ) -> tuple[np.ndarray, float]:
+        """Complete variable assignment and penalty of a schedule, by solving with it fixed."""
+        slots = self.generator._schedule_slots(fixtures, built.season)
+        values = np.zeros(len(built.model.Proto().variables), dtype=np.int64)
+        for leg_index, (leg, keys) in enumerate(zip(built.legs, leg_keys)):
+            for key in keys:
+                slot = slots.get((leg_index, key[0], frozenset(key[1:])))
+                if slot is None or slot[0] not in leg.weeks:
+                    raise ValueError(f"The schedule has no fixture for {key[1]} v {key[2]} ({key[0]})")
+                week, home = slot
+                values[leg.variable_indices(key)] = leg.slot_values(key, week, home == key[1])
+
+        model = built.model.clone()
+        _fix_variables(model, decision, values)
+        solver = cp_model.CpSolver()
+        solver.parameters.num_search_workers = num_workers
+        status = solver.Solve(model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            raise ValueError("The schedule breaks a hard constraint (fixed matches, venue requirements or sequences)")
+        objective = solver.ObjectiveValue() if built.has_objective else 0.0
+        return np.array(solver.ResponseProto().solution, dtype=np.int64), objective
@@ -0,0 +1,183 @@
+"""
+On-disk cache of built CP-SAT models, keyed by a fingerprint of the inputs.
+
+Building the unified model runs Python loops over tens of thousands of
+variables and constraints. When the divisions, requirements, weights and
+build options are unchanged, a later run can load the serialized model and
+the variable index maps instead, and go straight to adding hints and solving.
+
+The seed is part of the fingerprint, since it shuffles the teams and
+matchups before the build: each seed gets its own entry, and unseeded runs
+share one.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import ortools
+from ortools.sat.python import cp_model
+
+from .config import WEIGHTS
+from .engines import ENGINES
+from .instrumentation import SolveTrace
+from .models import Division, FixedMatch, VenueRequirement
+from .season import Season
+
+# Bump when the model built for the same inputs changes
+CACHE_FORMAT = 5
+
+
+@dataclass
+class BuiltModel:
+    """A built model (before hints) and the handles needed to hint and read it."""
+
+    model: cp_model.CpModel
+    season: Season
+    is_home: dict[tuple[str, int], cp_model.IntVar]
+    is_away: dict[tuple[str, int], cp_model.IntVar]  # Only for teams with byes
+    legs: list  # One engine from fix_gen.engines per Season.scheduled_weeks() leg
+    div_matchups: dict[str, list[tuple[str, str]]]
+    has_objective: bool
+    # Penalty of each priority level as objective (vars, coeffs, offset), by WEIGHTS key
+    objective_levels: dict[str, tuple[list[int], list[int], float]] = field(default_factory=dict)
+    # One literal per legal_patterns() entry for each team in table sequence mode
+    pattern_choice: dict[str, list[cp_model.IntVar]] = field(default_factory=dict)
+
+
+def canonical_inputs(
+    divisions: list[Division],
+    fixed_matches: list[FixedMatch],
+    venue_requirements: list[VenueRequirement],
+    venue_conflicts: list[set[str]],
+) -> dict:
+    """The loaded input data as plain JSON-serialisable lists."""
+    return {
+        "divisions": [[div.name] + [t.code for t in div.teams] for div in divisions],
+        "fixed_matches": [[fm.week, fm.team1, fm.team2] for fm in fixed_matches],
+        "venue_requirements": [[req.team, req.venue, req.week] for req in venue_requirements],
+        "venue_conflicts": [sorted(group) for group in venue_conflicts],
+    }
+
+
+def fingerprint(data: dict) -> str:
+    """SHA-256 of a JSON-serialisable value."""
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def model_fingerprint(
+    divisions: list[Division],
+    fixed_matches: list[FixedMatch],
+    venue_requirements: list[VenueRequirement],
+    venue_conflicts: list[set[str]],
+    engine: str,
+    sequence_mode: str,
+    symmetry_breaking: bool,
+    mirrored: bool,
+    lean: bool,
+    soft_encoding: str,
+    seed: int | None = None,
+) -> str:
+    """Hash of everything the built model depends on, including the shuffle seed."""
+    return fingerprint({
+        "format": CACHE_FORMAT,
+        "ortools": ortools.__version__,
+        **canonical_inputs(divisions, fixed_matches, venue_requirements, venue_conflicts),
+        "weights": WEIGHTS,
+        "engine": engine,
+        "sequence_mode": sequence_mode,
+        "symmetry_breaking": symmetry_breaking,
+        "mirrored": mirrored,
+        "lean": lean,
+        "soft_encoding": soft_encoding,
+        "seed": seed,
+    })
+
+
+def parse_model(text: str) -> cp_model.CpModel:
+    """A model from a CpModelProto in text format (as written by ExportToFile or str(proto))."""
+    model = cp_model.CpModel()
+    proto = model.Proto()
+    if hasattr(proto, "parse_text_format"):
+        proto.parse_text_format(text)
+    else:
+        # OR-Tools < 9.13 exposes the protobuf message itself
+        from google.protobuf import text_format
+
+        text_format.Parse(text, proto)
+    return model
+
+
+class ModelCache:
+    """
+    Directory of cached models: <fingerprint>.txt holds the CpModelProto in
+    text format and <fingerprint>.json the is_home, is_away, per-leg engine
+    and pattern choice variable indices.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _paths(self, fingerprint: str) -> tuple[Path, Path]:
+        return self.directory / f"{fingerprint}.txt", self.directory / f"{fingerprint}.json"
+
+    def load(
+        self,
+        fingerprint: str,
+        engine: str,
+        season: Season,
+        trace: SolveTrace | None = None,
+    ) -> BuiltModel | None:
+        """Load a cached model, or None if there is none for the fingerprint."""
+        proto_path, index_path = self._paths(fingerprint)
+        if not proto_path.exists() or not index_path.exists():
+            return None
+
+        indices = json.loads(index_path.read_text())
+        model = parse_model(proto_path.read_text())
+
+        is_home, is_away = (
+            {(team, week): model.GetBoolVarFromProtoIndex(index) for team, week, index in indices[name]}
+            for name in ("is_home", "is_away")
+        )
+        legs = []
+        for weeks, maps in zip(season.scheduled_weeks(), indices["legs"]):
+            leg = ENGINES[engine](model, weeks, trace)
+            leg.restore_index_maps(maps)
+            legs.append(leg)
+        div_matchups = {
+            name: [tuple(matchup) for matchup in matchups]
+            for name, matchups in indices["div_matchups"].items()
+        }
+        objective_levels = {name: tuple(level) for name, level in indices["objective_levels"].items()}
+        pattern_choice = {
+            team: [model.GetBoolVarFromProtoIndex(index) for index in choice]
+            for team, choice in indices["pattern_choice"].items()
+        }
+        return BuiltModel(
+            model, season, is_home, is_away, legs, div_matchups, indices["has_objective"], objective_levels, pattern_choice
+        )
+
+    def store(self, fingerprint: str, built: BuiltModel) -> None:
+        """Write a built model to the cache."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        proto_path, index_path = self._paths(fingerprint)
+        indices = {
+            "is_home": [[team, week, var.Index()] for (team, week), var in built.is_home.items()],
+            "is_away": [[team, week, var.Index()] for (team, week), var in built.is_away.items()],
+            "legs": [leg.index_maps() for leg in built.legs],
+            "div_matchups": built.div_matchups,
+            "has_objective": built.has_objective,
+            "objective_levels": built.objective_levels,
+            "pattern_choice": {team: [lit.Index() for lit in choice] for team, choice in built.pattern_choice.items()},
+        }
+
+        # Write to temporary files and rename, so concurrent runs never see partial files
+        tmp_proto = proto_path.with_name(f"{proto_path.stem}.{os.getpid()}.tmp.txt")
+        tmp_index = index_path.with_name(f"{index_path.stem}.{os.getpid()}.tmp.json")
+        built.model.ExportToFile(str(tmp_proto))
+        tmp_index.write_text(json.dumps(indices))
+        os.replace(tmp_proto, proto_path)
+        os.replace(tmp_index, index_path)
@@ -6,7 +6,7 @@ import re
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Team:
     code: str  # e.g., "WAN1"
     club: str  # e.g., "WAN"
@@ -30,7 +30,7 @@ class Team:
         return (self.number - 1) // 2
 
 
-@dataclass
+@dataclass(slots=True)
 class Division:
     name: str
     teams: list[Team]
@@ -52,21 +52,21 @@ class Division:
         return cls(name=name, teams=teams, tier=tier)
 
 
-@dataclass
+@dataclass(slots=True)
 class FixedMatch:
     week: int
     team1: str
     team2: str
 
 
-@dataclass
+@dataclass(slots=True)
 class VenueRequirement:
     team: str
     venue: str  # "h" or "a"
     week: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Fixture:
     week: int
     home_team: str
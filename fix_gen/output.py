@@ -1,47 +1,160 @@
 """
 Output formatting functions for generated fixtures.
+
+The grid writers (text and HTML) render from a FixtureIndex: the fixtures
+grouped by (division, week) and sorted by home team, built in one pass over
+the schedule. Build the index once to render several formats of the same
+schedule (see render_outputs), e.g. when writing many candidate schedules.
+
+Files are written atomically: to a temporary file in the same directory,
+then renamed over the target, so readers never see a half-written file.
+write_outputs renders and writes several formats concurrently.
 """
 
 import csv
-from collections import defaultdict
+import io
+import os
+import tempfile
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from typing import TextIO
+
+import numpy as np
 
 from .models import Division, Fixture
+from .schedule import Schedule
+from .season import Season
+
+# Output formats and the file name each is written to
+OUTPUT_FILES = {"csv": "fixtures.csv", "html": "fixtures.html", "txt": "fixtures.txt"}
+
+
+class FixtureIndex:
+    """
+    Fixtures grouped by (division, week), each group sorted by home team.
+
+    Built once per schedule; groups hold (home, away) team codes, so
+    rendering a grid cell is a lookup.
+    """
+
+    def __init__(self, fixtures: Iterable[Fixture] | Schedule, divisions: list[Division]):
+        self.schedule = Schedule.from_fixtures(fixtures, divisions)
+        self.divisions = divisions
+        self.half_weeks = Season.for_divisions(divisions).half_weeks
+        self.groups: dict[tuple[str, int], list[tuple[str, str]]] = {}
+
+        week, home, away, _ = self.schedule.columns()
+        teams = self.schedule.teams
+        for name in self.schedule.division_names:
+            # Division rows come sorted by (week, home team); split them at week changes
+            rows = self.schedule.division_rows(name)
+            for group in np.split(rows, np.flatnonzero(np.diff(week[rows])) + 1):
+                if len(group):
+                    self.groups[(name, int(week[group[0]]))] = [
+                        (teams[h], teams[a]) for h, a in zip(home[group].tolist(), away[group].tolist())
+                    ]
+
+    @classmethod
+    def of(cls, fixtures: "Iterable[Fixture] | Schedule | FixtureIndex", divisions: list[Division]) -> "FixtureIndex":
+        """The index of a fixture list, or the index itself."""
+        return fixtures if isinstance(fixtures, FixtureIndex) else cls(fixtures, divisions)
+
+    def matches(self, division: str, week: int) -> list[tuple[str, str]]:
+        """(home, away) of a division's fixtures in a week, by home team."""
+        return self.groups.get((division, week), [])
 
 
 def write_fixtures_csv(
-    fixtures: list[Fixture],
+    fixtures: Iterable[Fixture] | Schedule | FixtureIndex,
+    filepath: Path,
+    seed: int | None = None,
+) -> None:
+    """Write fixtures to CSV file, sorted by week, division and home team."""
+    stream_fixtures_csv(_csv_order(fixtures), filepath, seed=seed)
+
+
+def stream_fixtures_csv(
+    fixtures: Iterable[Fixture],
     filepath: Path,
     seed: int | None = None,
 ) -> None:
-    """Write fixtures to CSV file."""
-    fixtures_sorted = sorted(fixtures, key=lambda f: (f.week, f.division, f.home_team))
-    with open(filepath, "w", newline="") as f:
-        writer = csv.writer(f)
-        # Write seed as comment if provided
-        if seed is not None:
-            f.write(f"# Generated with seed: {seed}\n")
-        writer.writerow(["game_week", "home_team", "away_team", "division"])
-        for fix in fixtures_sorted:
-            writer.writerow([fix.week, fix.home_team, fix.away_team, fix.division])
+    """Write fixtures to CSV file in the order given, one row at a time."""
+    with _atomic_open(filepath, newline="") as f:
+        _write_csv(f, fixtures, seed)
+
+
+def render_csv(fixtures: Iterable[Fixture] | Schedule | FixtureIndex, seed: int | None = None) -> str:
+    """The CSV file contents, sorted by week, division and home team."""
+    buffer = io.StringIO(newline="")
+    _write_csv(buffer, _csv_order(fixtures), seed)
+    return buffer.getvalue()
+
+
+@contextmanager
+def _atomic_open(path: Path, newline: str | None = None):
+    """Open a temporary file next to path for writing; it replaces path on success."""
+    path = Path(path)
+    f = tempfile.NamedTemporaryFile(
+        "w", newline=newline, dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    )
+    try:
+        with f:
+            yield f
+        # The temporary file is private to the user: keep the target's mode, or use 0o644
+        os.chmod(f.name, path.stat().st_mode & 0o777 if path.exists() else 0o644)
+        os.replace(f.name, path)
+    except BaseException:
+        os.unlink(f.name)
+        raise
+
+
+def write_atomic(path: Path, text: str, newline: str | None = None) -> None:
+    """Write text to a file atomically (see _atomic_open)."""
+    with _atomic_open(path, newline=newline) as f:
+        f.write(text)
+
+
+def _csv_order(fixtures: Iterable[Fixture] | Schedule | FixtureIndex) -> Iterable[Fixture]:
+    # A Schedule already yields fixtures in CSV order
+    if isinstance(fixtures, FixtureIndex):
+        return fixtures.schedule
+    if isinstance(fixtures, Schedule):
+        return fixtures
+    return sorted(fixtures, key=lambda f: (f.week, f.division, f.home_team))
+
+
+def _write_csv(f: TextIO, fixtures: Iterable[Fixture], seed: int | None) -> None:
+    writer = csv.writer(f)
+    # Write seed as comment if provided
+    if seed is not None:
+        f.write(f"# Generated with seed: {seed}\n")
+    writer.writerow(["game_week", "home_team", "away_team", "division"])
+    writer.writerows([fix.week, fix.home_team, fix.away_team, fix.division] for fix in fixtures)
 
 
 def print_summary(
-    fixtures: list[Fixture],
+    fixtures: Iterable[Fixture] | Schedule,
     violations: list[str],
     cross_violations: list[str],
+    stop_reason: str | None = None,
 ) -> None:
-    """Print a summary of the generated fixtures."""
+    """Print a summary of the generated fixtures.
+
+    stop_reason is the stopping rule that ended the solve, if any (see
+    fix_gen.stopping).
+    """
     print("\n" + "=" * 60)
     print("FIXTURE GENERATION SUMMARY")
     print("=" * 60)
 
-    print(f"\nTotal fixtures generated: {len(fixtures)}")
+    schedule = Schedule.from_fixtures(fixtures)
+    print(f"\nTotal fixtures generated: {len(schedule)}")
+    if stop_reason is not None:
+        print(f"Solver stopped by: {stop_reason}")
 
-    by_div = defaultdict(int)
-    for f in fixtures:
-        by_div[f.division] += 1
-    print(f"Divisions: {len(by_div)}")
+    print(f"Divisions: {len(np.unique(schedule.division))}")
 
     if violations:
         print(f"\n⚠️  Validation issues: {len(violations)}")
@@ -53,100 +166,95 @@ def print_summary(
         print("\n✓ All validation checks passed!")
 
     if cross_violations:
-        print(f"\n⚠️  Cross-division ground sharing violations: {len(cross_violations)}")
+        print(f"\n⚠️  Cross-division ground sharing and venue conflict violations: {len(cross_violations)}")
         for v in cross_violations[:10]:
             print(f"   - {v}")
         if len(cross_violations) > 10:
             print(f"   ... and {len(cross_violations) - 10} more")
     else:
-        print("✓ No cross-division ground sharing violations!")
+        print("✓ No cross-division ground sharing or venue conflict violations!")
 
 
-def print_fixture_grids(
-    fixtures: list[Fixture],
+def _halves(half_weeks: int) -> list[tuple[int, int, str]]:
+    """(first week, week after the last, name) of each half of the season."""
+    return [(1, half_weeks + 1, "First"), (half_weeks + 1, 2 * half_weeks + 1, "Second")]
+
+
+def render_grids(
+    fixtures: Iterable[Fixture] | Schedule | FixtureIndex,
     divisions: list[Division],
-    output_file: Path | None = None,
     seed: int | None = None,
-) -> None:
-    """Print a grid of fixtures for each division, organized by week."""
+) -> str:
+    """Text grid of fixtures for each division, organized by week.
+
+    Each half of the season (see fix_gen.season) gets one column per week and
+    one row per match a division can play in a week.
+    """
+    index = FixtureIndex.of(fixtures, divisions)
+    half_weeks = index.half_weeks
     lines: list[str] = []
 
-    def output(text: str = ""):
-        print(text)
-        lines.append(text)
-
     # Print seed at the top if provided
     if seed is not None:
-        output(f"Generated with seed: {seed}")
-        output()
-
-    # Group fixtures by division
-    by_division: dict[str, list[Fixture]] = defaultdict(list)
-    for f in fixtures:
-        by_division[f.division].append(f)
+        lines.append(f"Generated with seed: {seed}")
+        lines.append("")
 
     # Calculate column width based on longest team code
     max_team_len = max(len(t.code) for div in divisions for t in div.teams)
     col_width = max_team_len * 2 + 1 + 2  # "TEAM1-TEAM2" + padding
 
     for div in divisions:
-        div_fixtures = by_division[div.name]
+        lines.append("")
+        lines.append("=" * 100)
+        lines.append(f" {div.name}")
+        lines.append("=" * 100)
 
-        # Group by week
-        by_week: dict[int, list[Fixture]] = defaultdict(list)
-        for f in div_fixtures:
-            by_week[f.week].append(f)
+        for start_week, end_week, half_name in _halves(half_weeks):
+            lines.append(f"\n  {half_name} Half (Weeks {start_week}-{end_week - 1})")
 
-        output()
-        output("=" * 100)
-        output(f" {div.name}")
-        output("=" * 100)
-
-        # Print in two halves: weeks 1-9 then 10-18
-        for half, week_range in enumerate([(1, 10), (10, 19)]):
-            start_week, end_week = week_range
-            half_label = "First Half (Weeks 1-9)" if half == 0 else "Second Half (Weeks 10-18)"
-            output(f"\n  {half_label}")
-
-            # Print header row with week numbers
+            # Header row with week numbers
             header = "     "
             for week in range(start_week, end_week):
                 header += f"{'Wk' + str(week):^{col_width}}"
-            output(header)
-            output("     " + "-" * (col_width * 9))
+            lines.append(header)
+            lines.append("     " + "-" * (col_width * half_weeks))
 
-            # Each week has 5 matches (10 teams / 2)
-            for match_idx in range(5):
+            weeks = [index.matches(div.name, week) for week in range(start_week, end_week)]
+            for match_idx in range(len(div.teams) // 2):
                 row = f"  {match_idx + 1}  "
-                for week in range(start_week, end_week):
-                    week_fixtures = sorted(by_week[week], key=lambda x: x.home_team)
-                    if match_idx < len(week_fixtures):
-                        f = week_fixtures[match_idx]
-                        fixture_str = f"{f.home_team}-{f.away_team}"
-                    else:
-                        fixture_str = ""
-                    row += f"{fixture_str:^{col_width}}"
-                output(row)
-
-        output()
+                for matches in weeks:
+                    cell = "-".join(matches[match_idx]) if match_idx < len(matches) else ""
+                    row += f"{cell:^{col_width}}"
+                lines.append(row)
+
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def print_fixture_grids(
+    fixtures: Iterable[Fixture] | Schedule | FixtureIndex,
+    divisions: list[Division],
+    output_file: Path | None = None,
+    seed: int | None = None,
+) -> None:
+    """Print the text fixture grids (see render_grids), and write them to a file if given."""
+    text = render_grids(fixtures, divisions, seed)
+    print(text)
 
     # Write to file if path provided
     if output_file:
-        output_file.write_text("\n".join(lines))
+        write_atomic(output_file, text)
         print(f"\nFixture grids written to {output_file}")
 
 
-def write_fixtures_html(
-    fixtures: list[Fixture],
+def render_html(
+    fixtures: Iterable[Fixture] | Schedule | FixtureIndex,
     divisions: list[Division],
-    output_file: Path,
     seed: int | None = None,
-) -> None:
-    """Write fixtures to HTML file with clean, minimal formatting."""
-    # Group fixtures by division
-    by_division: dict[str, list[Fixture]] = defaultdict(list)
-    for f in fixtures:
-        by_division[f.division].append(f)
+) -> str:
+    """HTML page with clean, minimal fixture grids."""
+    index = FixtureIndex.of(fixtures, divisions)
 
     # Build title with seed if provided
     title = "Cricket League Fixtures"
@@ -179,20 +287,10 @@ def write_fixtures_html(
         html_parts.append(f"<p class='seed'>Generated with seed: {seed}</p>")
 
     for div in divisions:
-        div_fixtures = by_division[div.name]
-
-        # Group by week
-        by_week: dict[int, list[Fixture]] = defaultdict(list)
-        for f in div_fixtures:
-            by_week[f.week].append(f)
-
         html_parts.append(f"<h2>{div.name}</h2>")
 
-        # Two halves
-        for half, week_range in enumerate([(1, 10), (10, 19)]):
-            start_week, end_week = week_range
-            half_label = "Weeks 1-9" if half == 0 else "Weeks 10-18"
-            html_parts.append(f"<h3>{half_label}</h3>")
+        for start_week, end_week, _ in _halves(index.half_weeks):
+            html_parts.append(f"<h3>Weeks {start_week}-{end_week - 1}</h3>")
             html_parts.append("<table>")
 
             # Header row
@@ -202,21 +300,72 @@ def write_fixtures_html(
             html_parts.append("</tr>")
 
             # Match rows
-            for match_idx in range(5):
+            weeks = [index.matches(div.name, week) for week in range(start_week, end_week)]
+            for match_idx in range(len(div.teams) // 2):
                 html_parts.append("<tr>")
-                for week in range(start_week, end_week):
-                    week_fixtures = sorted(by_week[week], key=lambda x: x.home_team)
-                    if match_idx < len(week_fixtures):
-                        fix = week_fixtures[match_idx]
-                        cell = f"{fix.home_team}-{fix.away_team}"
-                    else:
-                        cell = ""
+                for matches in weeks:
+                    cell = "-".join(matches[match_idx]) if match_idx < len(matches) else ""
                     html_parts.append(f"<td>{cell}</td>")
                 html_parts.append("</tr>")
 
             html_parts.append("</table>")
 
     html_parts.extend(["</body>", "</html>"])
+    return "\n".join(html_parts)
 
-    output_file.write_text("\n".join(html_parts))
+
+def write_fixtures_html(
+    fixtures: Iterable[Fixture] | Schedule | FixtureIndex,
+    divisions: list[Division],
+    output_file: Path,
+    seed: int | None = None,
+) -> None:
+    """Write fixtures to HTML file with clean, minimal formatting."""
+    write_atomic(output_file, render_html(fixtures, divisions, seed))
     print(f"Fixtures HTML written to {output_file}")
+
+
+def render_outputs(
+    fixtures: Iterable[Fixture] | Schedule | FixtureIndex,
+    divisions: list[Division],
+    seed: int | None = None,
+    formats: Iterable[str] = OUTPUT_FILES,
+) -> dict[str, str]:
+    """Render a schedule in several formats ("csv", "html", "txt") from one index."""
+    index = FixtureIndex.of(fixtures, divisions)
+    renderers = {
+        "csv": lambda: render_csv(index, seed),
+        "html": lambda: render_html(index, divisions, seed),
+        "txt": lambda: render_grids(index, divisions, seed),
+    }
+    return {fmt: renderers[fmt]() for fmt in formats}
+
+
+def write_outputs(
+    fixtures: Iterable[Fixture] | Schedule | FixtureIndex,
+    divisions: list[Division],
+    output_dir: Path,
+    seed: int | None = None,
+    formats: Iterable[str] = OUTPUT_FILES,
+) -> dict[str, Path]:
+    """Render and write each format (see OUTPUT_FILES) concurrently, atomically.
+
+    Each format is rendered from one shared index and written in its own
+    thread. Returns the path written for each format.
+    """
+    index = FixtureIndex.of(fixtures, divisions)
+    formats = list(dict.fromkeys(formats))
+    unknown = set(formats) - set(OUTPUT_FILES)
+    if unknown:
+        raise ValueError(f"Unknown output formats: {sorted(unknown)} (expected some of {list(OUTPUT_FILES)})")
+    paths = {fmt: Path(output_dir) / OUTPUT_FILES[fmt] for fmt in formats}
+
+    def write(fmt: str) -> None:
+        (text,) = render_outputs(index, divisions, seed, formats=[fmt]).values()
+        # The CSV rows already end in \r\n, as written by the csv module
+        write_atomic(paths[fmt], text, newline="" if fmt == "csv" else None)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(formats))) as pool:
+        # list() re-raises the first error from a worker
+        list(pool.map(write, formats))
+    return paths
@@ -0,0 +1,42 @@
+"""
+Home/away pattern precomputation.
+
+With a mirrored season (week W + half_weeks is week W reversed) a team that
+plays every week has its whole season determined by its first-half home/away
+pattern. Only a small subset of the 2^half_weeks possible patterns satisfies
+the no-4-in-a-row rule, including the windows that run from the end of the
+first half into the second. These are enumerated once
+and scored for the soft 3-in-a-row penalty, so models can restrict each team
+to the table instead of building the window constraints by hand.
+"""
+
+from functools import cache
+from itertools import product
+
+# First-half home flags (1 = home)
+Pattern = tuple[int, ...]
+
+
+def _season(pattern: Pattern) -> Pattern:
+    """Home flags for the whole mirrored season of a first-half pattern."""
+    return pattern + tuple(1 - h for h in pattern)
+
+
+@cache
+def legal_patterns(half_weeks: int) -> list[tuple[Pattern, int]]:
+    """All first-half patterns that satisfy the hard sequence rules.
+
+    No 4-week window of the season may be all home or all away; the windows
+    starting in the first half cover every distinct case (later windows are
+    their reverses). Returns (pattern, number of 3-in-a-row windows starting
+    in the first half), which is exactly what the soft consecutive
+    constraints count.
+    """
+    patterns = []
+    for pattern in product((0, 1), repeat=half_weeks):
+        season = _season(pattern)
+        if any(len(set(season[start:start + 4])) == 1 for start in range(half_weeks)):
+            continue
+        runs = sum(1 for start in range(half_weeks) if len(set(season[start:start + 3])) == 1)
+        patterns.append((pattern, runs))
+    return patterns
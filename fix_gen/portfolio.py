@@ -0,0 +1,215 @@
+"""
+Multi-seed portfolio: run many seeded solves in parallel processes and keep
+the best schedules.
+
+Different seeds shuffle the matchup order and the solver's search, so they
+reach different local optima. Each seed builds its own shuffled model and
+starts from its own warm start draft: the solution store's hints would start
+every seed from the same point, so the store only records the solutions. Running them side by side, each with a share
+of the machine's cores, explores far more of the solution space in the same
+wall-clock time than running main.py once per seed.
+"""
+
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from .config import (
+    LEAN_BUILD,
+    MIRRORED_SEASON,
+    MODEL_ENGINE,
+    OBJECTIVE_MODE,
+    SEQUENCE_MODE,
+    SOFT_ENCODING,
+    SOLVER_TIME_LIMIT,
+    SYMMETRY_BREAKING,
+    WARM_START,
+)
+from .generator import FixtureGenerator
+from .instrumentation import SolveTrace
+from .models import Division, FixedMatch, Fixture, VenueRequirement
+from .solution_store import SolutionStore
+from .stopping import StoppingPolicy
+
+
+@dataclass
+class PortfolioResult:
+    seed: int
+    status: str | None
+    objective: float | None
+    fixtures: list[Fixture]
+    trace: SolveTrace | None = None
+
+
+def parse_seeds(spec: str) -> list[int]:
+    """Parse a seed list such as "1-32" or "1-8,12,20-21"."""
+    seeds = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            seeds.extend(range(int(first), int(last) + 1))
+        else:
+            seeds.append(int(part))
+    if not seeds:
+        raise ValueError(f"No seeds in: {spec!r}")
+    return seeds
+
+
+def _solve_seed(
+    divisions: list[Division],
+    fixed_matches: list[FixedMatch],
+    venue_requirements: list[VenueRequirement],
+    venue_conflicts: list[set[str]],
+    seed: int,
+    engine: str,
+    sequence_mode: str,
+    symmetry_breaking: bool,
+    warm_start: bool,
+    time_limit: float,
+    stopping: StoppingPolicy | None,
+    solution_store: SolutionStore | None,
+    mirrored: bool,
+    lean: bool,
+    soft_encoding: str,
+    objective_mode: str,
+    num_workers: int,
+) -> PortfolioResult:
+    """Run one seeded solve (runs in a worker process)."""
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements, venue_conflicts)
+    with contextlib.redirect_stdout(io.StringIO()):
+        fixtures = generator.generate(
+            seed=seed,
+            engine=engine,
+            sequence_mode=sequence_mode,
+            symmetry_breaking=symmetry_breaking,
+            warm_start=warm_start,
+            time_limit=time_limit,
+            stopping=stopping,
+            solution_store=solution_store,
+            store_hints=False,
+            mirrored=mirrored,
+            lean=lean,
+            soft_encoding=soft_encoding,
+            objective_mode=objective_mode,
+            num_workers=num_workers,
+        )
+    return PortfolioResult(
+        seed=seed,
+        status=generator.status,
+        objective=generator.objective,
+        fixtures=fixtures,
+        trace=generator.trace,
+    )
+
+
+class PortfolioRunner:
+    """Runs the unified model for many seeds in a process pool."""
+
+    def __init__(
+        self,
+        divisions: list[Division],
+        fixed_matches: list[FixedMatch],
+        venue_requirements: list[VenueRequirement],
+        venue_conflicts: list[set[str]] | None = None,
+    ):
+        self.divisions = divisions
+        self.fixed_matches = fixed_matches
+        self.venue_requirements = venue_requirements
+        self.venue_conflicts = venue_conflicts or []
+
+    def run(
+        self,
+        seeds: list[int],
+        engine: str = MODEL_ENGINE,
+        sequence_mode: str = SEQUENCE_MODE,
+        symmetry_breaking: bool = SYMMETRY_BREAKING,
+        warm_start: bool = WARM_START,
+        time_limit: float = SOLVER_TIME_LIMIT,
+        stopping: StoppingPolicy | None = None,
+        solution_store: SolutionStore | None = None,
+        mirrored: bool = MIRRORED_SEASON,
+        lean: bool = LEAN_BUILD,
+        soft_encoding: str = SOFT_ENCODING,
+        objective_mode: str = OBJECTIVE_MODE,
+        processes: int | None = None,
+        top_k: int = 1,
+    ) -> list[PortfolioResult]:
+        """Solve every seed and return the best `top_k` distinct schedules, best first.
+
+        Args:
+            seeds: Seeds to solve. engine, sequence_mode, symmetry_breaking,
+                warm_start, mirrored, lean, soft_encoding and objective_mode are passed to
+                FixtureGenerator.generate.
+            time_limit: Solver time limit for each seed.
+            stopping: Early stopping rules for each seed; its time_limit
+                replaces `time_limit` when given.
+            solution_store: Store every seed's solution is recorded in (see
+                fix_gen.solution_store); it does not hint the seeds.
+            processes: Worker processes (default: one per core, at most one per seed).
+                The cores are split evenly, so each solve gets
+                cpu_count // processes search workers.
+            top_k: Number of distinct schedules to keep.
+        """
+        cpu_count = os.cpu_count() or 1
+        processes = max(1, min(processes or cpu_count, len(seeds)))
+        workers_per_solve = max(1, cpu_count // processes)
+        print(f"Running {len(seeds)} seeds in {processes} processes ({workers_per_solve} search workers each)...")
+
+        results: list[PortfolioResult] = []
+        best: float | None = None
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [
+                pool.submit(
+                    _solve_seed,
+                    self.divisions,
+                    self.fixed_matches,
+                    self.venue_requirements,
+                    self.venue_conflicts,
+                    seed,
+                    engine,
+                    sequence_mode,
+                    symmetry_breaking,
+                    warm_start,
+                    time_limit,
+                    stopping,
+                    solution_store,
+                    mirrored,
+                    lean,
+                    soft_encoding,
+                    objective_mode,
+                    workers_per_solve,
+                )
+                for seed in seeds
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                marker = ""
+                if result.objective is not None and (best is None or result.objective < best):
+                    best = result.objective
+                    marker = "  <- best so far"
+                objective = "-" if result.objective is None else f"{result.objective:.0f}"
+                print(f"  [{len(results)}/{len(seeds)}] seed {result.seed}: {result.status}, penalty {objective}{marker}")
+
+        return select_distinct(results, top_k)
+
+
+def select_distinct(results: list[PortfolioResult], top_k: int) -> list[PortfolioResult]:
+    """The `top_k` lowest-penalty results with pairwise different schedules."""
+    solved = sorted((r for r in results if r.fixtures), key=lambda r: (r.objective, r.seed))
+    kept: list[PortfolioResult] = []
+    seen: set[frozenset] = set()
+    for result in solved:
+        schedule = frozenset((f.week, f.home_team, f.away_team) for f in result.fixtures)
+        if schedule in seen:
+            continue
+        seen.add(schedule)
+        kept.append(result)
+        if len(kept) == top_k:
+            break
+    return kept
@@ -0,0 +1,145 @@
+"""
+Compact schedule representation.
+
+A Schedule holds fixtures as four integer columns with one row per stored
+match: week, home and away team (indices into an interned team-code table)
+and division (index into the division names). In a mirrored season the
+second half is not stored at all: each row also stands for its venue-swapped
+copy half_weeks later.
+
+Validation, the cross-division check and the output writers work on the
+columns directly, and grouping by division is an index lookup. Iterating a
+Schedule yields Fixture objects one at a time in (week, division, home team)
+order, so a large schedule can be streamed to disk (see
+fix_gen.output.stream_fixtures_csv) without building or sorting a fixture
+list.
+"""
+
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+
+from .models import Division, Fixture
+
+
+class Schedule:
+    """Read-only, re-iterable fixture list backed by integer columns."""
+
+    __slots__ = ("teams", "division_names", "week", "home", "away", "division", "mirror_weeks", "_order", "_groups")
+
+    def __init__(
+        self,
+        teams: list[str],
+        division_names: list[str],
+        week: np.ndarray,
+        home: np.ndarray,
+        away: np.ndarray,
+        division: np.ndarray,
+        mirror_weeks: int = 0,
+    ):
+        """
+        Args:
+            teams: Team codes indexed by the home and away columns.
+            division_names: Division names indexed by the division column.
+            week, home, away, division: One entry per stored match.
+            mirror_weeks: If non-zero, every stored match is also played
+                this many weeks later with the venues swapped.
+        """
+        self.teams = teams
+        self.division_names = division_names
+        self.week = np.asarray(week, dtype=np.int64)
+        self.home = np.asarray(home, dtype=np.int64)
+        self.away = np.asarray(away, dtype=np.int64)
+        self.division = np.asarray(division, dtype=np.int64)
+        self.mirror_weeks = mirror_weeks
+        self._order: np.ndarray | None = None
+        self._groups: dict[str, np.ndarray] | None = None
+
+    @classmethod
+    def from_fixtures(cls, fixtures: Iterable[Fixture], divisions: list[Division] | None = None) -> "Schedule":
+        """Intern a fixture list; rows keep the list's order.
+
+        With divisions, their teams and names come first in the tables, in
+        league order; codes not in them are appended as they appear.
+        """
+        if isinstance(fixtures, Schedule):
+            return fixtures
+        teams = [t.code for div in divisions for t in div.teams] if divisions else []
+        names = [div.name for div in divisions] if divisions else []
+        team_index = {code: i for i, code in enumerate(teams)}
+        division_index = {name: d for d, name in enumerate(names)}
+
+        def intern(table: list[str], index: dict[str, int], value: str) -> int:
+            i = index.get(value)
+            if i is None:
+                i = index[value] = len(table)
+                table.append(value)
+            return i
+
+        week, home, away, division = [], [], [], []
+        for f in fixtures:
+            week.append(f.week)
+            home.append(intern(teams, team_index, f.home_team))
+            away.append(intern(teams, team_index, f.away_team))
+            division.append(intern(names, division_index, f.division))
+        return cls(teams, names, week, home, away, division)
+
+    def __len__(self) -> int:
+        return len(self.week) * (2 if self.mirror_weeks else 1)
+
+    def team_index(self) -> dict[str, int]:
+        """Team code -> index into the team table."""
+        return {code: i for i, code in enumerate(self.teams)}
+
+    def columns(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(week, home, away, division) of every fixture, mirrored ones last."""
+        if not self.mirror_weeks:
+            return self.week, self.home, self.away, self.division
+        return (
+            np.concatenate((self.week, self.week + self.mirror_weeks)),
+            np.concatenate((self.home, self.away)),
+            np.concatenate((self.away, self.home)),
+            np.concatenate((self.division, self.division)),
+        )
+
+    def order(self) -> np.ndarray:
+        """Row order of columns() sorted by week, division name and home team code."""
+        if self._order is None:
+            week, home, _, division = self.columns()
+            # lexsort sorts by the last key first
+            self._order = np.lexsort((_ranks(self.teams)[home], _ranks(self.division_names)[division], week))
+        return self._order
+
+    def division_rows(self, name: str) -> np.ndarray:
+        """Rows of columns() in a division, in (week, home team) order."""
+        if self._groups is None:
+            order = self.order()
+            division_of = self.columns()[3][order]
+            # A stable sort keeps each division's rows in (week, home team) order
+            by_division = order[np.argsort(division_of, kind="stable")]
+            counts = np.bincount(division_of, minlength=len(self.division_names))
+            groups = np.split(by_division, np.cumsum(counts)[:-1]) if len(counts) else []
+            self._groups = dict(zip(self.division_names, groups))
+        return self._groups.get(name, np.empty(0, dtype=np.int64))
+
+    def fixtures(self, rows: np.ndarray) -> Iterator[Fixture]:
+        """Fixture objects for rows of columns()."""
+        week, home, away, division = self.columns()
+        teams, names = self.teams, self.division_names
+        for row in rows.tolist():
+            yield Fixture(
+                week=int(week[row]),
+                home_team=teams[home[row]],
+                away_team=teams[away[row]],
+                division=names[division[row]],
+            )
+
+    def __iter__(self) -> Iterator[Fixture]:
+        return self.fixtures(self.order())
+
+
+def _ranks(names: list[str]) -> np.ndarray:
+    """Position of each name in sorted order."""
+    ranks = np.empty(len(names), dtype=np.int64)
+    ranks[sorted(range(len(names)), key=names.__getitem__)] = np.arange(len(names))
+    return ranks
@@ -0,0 +1,113 @@
+"""
+Season geometry: how many weeks the season has and how divisions fit into it.
+
+Every division plays a double round robin: each pair meets once in each half
+of the season, with the venues swapped. A division of n teams needs n - 1
+rounds per half, or n rounds when n is odd (one team rests each round). A
+half is as long as the largest division needs, so smaller and odd-sized
+divisions get bye weeks instead of being padded with dummy teams.
+
+In a mirrored season week W + half_weeks repeats week W with the venues
+swapped, so only the first half is scheduled. Otherwise the second half is
+scheduled freely, with each pair's second meeting at least two weeks after
+its first.
+"""
+
+from dataclasses import dataclass
+
+from ortools.sat.python import cp_model
+
+from .config import MIRRORED_SEASON
+from .models import Division
+
+
+def rounds_per_half(num_teams: int) -> int:
+    """Rounds a division needs to play everyone once."""
+    return num_teams if num_teams % 2 else max(num_teams - 1, 0)
+
+
+@dataclass(frozen=True)
+class Season:
+    half_weeks: int
+    mirrored: bool = MIRRORED_SEASON
+
+    @classmethod
+    def for_divisions(cls, divisions: list[Division], mirrored: bool = MIRRORED_SEASON) -> "Season":
+        """The shortest season that fits every division."""
+        return cls(max((rounds_per_half(len(div.teams)) for div in divisions), default=0), mirrored)
+
+    @property
+    def weeks(self) -> int:
+        return 2 * self.half_weeks
+
+    def has_byes(self, division: Division) -> bool:
+        """Whether the division's teams rest in some weeks."""
+        return len(division.teams) - 1 < self.half_weeks
+
+    def scheduled_weeks(self) -> list[list[int]]:
+        """Weeks modelled by each leg: the first half only when mirrored, else both halves."""
+        first = list(range(1, self.half_weeks + 1))
+        if self.mirrored:
+            return [first]
+        return [first, list(range(self.half_weeks + 1, self.weeks + 1))]
+
+    def scheduled_week(self, week: int) -> tuple[int, bool]:
+        """The modelled week that decides a season week, and whether its venues are swapped."""
+        if self.mirrored and week > self.half_weeks:
+            return week - self.half_weeks, True
+        return week, False
+
+    def leg(self, week: int) -> int:
+        """Index into scheduled_weeks() of the leg a season week belongs to."""
+        if self.mirrored:
+            return 0
+        return 0 if week <= self.half_weeks else 1
+
+    def window_starts(self, length: int) -> range:
+        """First weeks of the distinct windows of `length` consecutive weeks.
+
+        In a mirrored season the windows starting in the second half are
+        venue-swapped copies of ones starting in the first half.
+        """
+        last = self.weeks - length + 1
+        return range(1, min(self.half_weeks, last) + 1 if self.mirrored else last + 1)
+
+
+class VenueLiterals:
+    """
+    Home and away literals of every team in every week of the season.
+
+    Built on the modelled is_home variables: away is the negation of home for
+    teams that play every week, and a separate is_away variable for teams with
+    byes. Weeks of a mirrored second half map to the opposite literal of their
+    first-half week.
+    """
+
+    def __init__(
+        self,
+        season: Season,
+        is_home: dict[tuple[str, int], cp_model.IntVar],
+        is_away: dict[tuple[str, int], cp_model.IntVar],
+    ):
+        self.season = season
+        self.is_home = is_home
+        self.is_away = is_away
+
+    def home(self, team: str, week: int):
+        week, swapped = self.season.scheduled_week(week)
+        return self._away(team, week) if swapped else self.is_home[(team, week)]
+
+    def away(self, team: str, week: int):
+        week, swapped = self.season.scheduled_week(week)
+        return self.is_home[(team, week)] if swapped else self._away(team, week)
+
+    def plays_every_week(self, team: str) -> bool:
+        """True if the team has no byes (away is the negation of home)."""
+        return (team, 1) not in self.is_away
+
+    def venue(self, team: str, week: int, home: bool):
+        return self.home(team, week) if home else self.away(team, week)
+
+    def _away(self, team: str, week: int):
+        away = self.is_away.get((team, week))
+        return away if away is not None else self.is_home[(team, week)].Not()
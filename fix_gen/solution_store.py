@@ -0,0 +1,157 @@
+"""
+SQLite store of every schedule the generator produces.
+
+Each solution is recorded with the fingerprint of the input data, the
+weights, seed, engine, solver status, penalty and validation results. Later
+runs on the same inputs and weights hint the solver from the best stored
+schedule (falling back to the best schedule for the same divisions, season
+shape and weights when the requirements changed), and an optimal schedule can be returned without
+solving at all.
+"""
+
+import json
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+from .config import MIRRORED_SEASON, WEIGHTS
+from .model_cache import canonical_inputs, fingerprint
+from .models import Division, FixedMatch, Fixture, VenueRequirement
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    input_fingerprint TEXT NOT NULL,
+    league_fingerprint TEXT NOT NULL,
+    weights TEXT NOT NULL,
+    seed INTEGER,
+    engine TEXT NOT NULL,
+    status TEXT NOT NULL,
+    objective REAL NOT NULL,
+    violations INTEGER NOT NULL,
+    cross_violations INTEGER NOT NULL,
+    fixtures TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS solutions_by_input ON solutions (input_fingerprint, weights, objective);
+CREATE INDEX IF NOT EXISTS solutions_by_league ON solutions (league_fingerprint, weights, objective);
+"""
+
+
+@dataclass
+class StoredSolution:
+    seed: int | None
+    engine: str
+    status: str
+    objective: float
+    violations: int
+    cross_violations: int
+    fixtures: list[Fixture]
+    same_inputs: bool  # False when found for the same divisions but other requirements
+
+
+def input_fingerprint(
+    divisions: list[Division],
+    fixed_matches: list[FixedMatch],
+    venue_requirements: list[VenueRequirement],
+    venue_conflicts: list[set[str]],
+    mirrored: bool = MIRRORED_SEASON,
+) -> str:
+    """Hash of the loaded input data and the season shape."""
+    return fingerprint({
+        **canonical_inputs(divisions, fixed_matches, venue_requirements, venue_conflicts),
+        "mirrored": mirrored,
+    })
+
+
+def league_fingerprint(divisions: list[Division], mirrored: bool = MIRRORED_SEASON) -> str:
+    """Hash of the divisions, their teams and the season shape only."""
+    return fingerprint({"divisions": canonical_inputs(divisions, [], [], [])["divisions"], "mirrored": mirrored})
+
+
+def weights_key(weights: dict[str, int] | None = None) -> str:
+    return json.dumps(weights if weights is not None else WEIGHTS, sort_keys=True)
+
+
+class SolutionStore:
+    """
+    Solutions in an SQLite database. A connection is opened per call, so a
+    store can be passed to worker processes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def record(
+        self,
+        input_key: str,
+        league_key: str,
+        seed: int | None,
+        engine: str,
+        status: str,
+        objective: float,
+        violations: list[str],
+        cross_violations: list[str],
+        fixtures: list[Fixture],
+    ) -> None:
+        """Store a solution under the current WEIGHTS."""
+        rows = [[f.week, f.home_team, f.away_team, f.division] for f in fixtures]
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO solutions (created, input_fingerprint, league_fingerprint, weights, seed, engine, "
+                "status, objective, violations, cross_violations, fixtures) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.time(), input_key, league_key, weights_key(), seed, engine, status, objective,
+                    len(violations), len(cross_violations), json.dumps(rows),
+                ),
+            )
+
+    def best(self, input_key: str, optimal_only: bool = False) -> StoredSolution | None:
+        """Lowest-penalty valid solution for the same inputs and WEIGHTS."""
+        query = (
+            "SELECT seed, engine, status, objective, violations, cross_violations, fixtures FROM solutions "
+            "WHERE input_fingerprint = ? AND weights = ? AND violations = 0"
+        )
+        if optimal_only:
+            query += " AND status = 'OPTIMAL'"
+        return self._first(query + " ORDER BY objective, id LIMIT 1", (input_key, weights_key()), same_inputs=True)
+
+    def best_similar(self, league_key: str) -> StoredSolution | None:
+        """Lowest-penalty solution for the same league and WEIGHTS, under any requirements.
+
+        Penalties are only comparable under the same weights and season
+        shape, so other weights are never ranked against them.
+        """
+        query = (
+            "SELECT seed, engine, status, objective, violations, cross_violations, fixtures FROM solutions "
+            "WHERE league_fingerprint = ? AND weights = ? ORDER BY violations, objective, id LIMIT 1"
+        )
+        return self._first(query, (league_key, weights_key()), same_inputs=False)
+
+    def _first(self, query: str, params: tuple, same_inputs: bool) -> StoredSolution | None:
+        with closing(self._connect()) as conn:
+            row = conn.execute(query, params).fetchone()
+        if row is None:
+            return None
+        seed, engine, status, objective, violations, cross_violations, fixtures = row
+        return StoredSolution(
+            seed=seed,
+            engine=engine,
+            status=status,
+            objective=objective,
+            violations=violations,
+            cross_violations=cross_violations,
+            fixtures=[
+                Fixture(week=week, home_team=home, away_team=away, division=division)
+                for week, home, away, division in json.loads(fixtures)
+            ],
+            same_inputs=same_inputs,
+        )
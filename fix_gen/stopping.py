@@ -0,0 +1,48 @@
+"""
+Stopping policies for the CP-SAT solve.
+
+Instead of always running to SOLVER_TIME_LIMIT, a solve can stop as soon as
+the relative gap is small enough, a target penalty is reached, or no better
+solution has been found for a while. The checks run in the solution
+callback (fix_gen.instrumentation.ProgressRecorder), which calls StopSearch();
+the time limit stays as a hard cap.
+"""
+
+from dataclasses import dataclass
+
+from .config import SOLVER_TIME_LIMIT, STOP_GAP, STOP_STALL_SECONDS, STOP_TARGET_OBJECTIVE
+
+# Stop reasons reported in SolveTrace.stop_reason
+STOP_OPTIMAL = "optimal"
+STOP_GAP_REACHED = "gap"
+STOP_TARGET_REACHED = "target objective"
+STOP_STALLED = "stall"
+STOP_TIME_LIMIT = "time limit"
+STOP_INFEASIBLE = "infeasible"
+STOP_LOCAL_OPTIMUM = "local optimum"  # Large neighbourhood search: no neighbourhood improves
+
+
+@dataclass
+class StoppingPolicy:
+    gap: float | None = STOP_GAP  # Stop once (objective - bound) / objective <= gap
+    stall_seconds: float | None = STOP_STALL_SECONDS  # Stop after this long without improvement
+    target_objective: float | None = STOP_TARGET_OBJECTIVE  # Stop once the penalty is <= target
+    time_limit: float = SOLVER_TIME_LIMIT  # Hard cap on solver time
+
+    def check(self, objective: float, gap: float) -> str | None:
+        """Reason to stop after an improving solution, or None to continue."""
+        if self.target_objective is not None and objective <= self.target_objective:
+            return STOP_TARGET_REACHED
+        if self.gap is not None and gap <= self.gap:
+            return STOP_GAP_REACHED
+        return None
+
+    def describe(self) -> str:
+        rules = [f"time limit {self.time_limit:g}s"]
+        if self.gap is not None:
+            rules.append(f"gap {self.gap:g}")
+        if self.stall_seconds is not None:
+            rules.append(f"stall {self.stall_seconds:g}s")
+        if self.target_objective is not None:
+            rules.append(f"target {self.target_objective:g}")
+        return ", ".join(rules)
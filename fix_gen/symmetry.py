@@ -0,0 +1,71 @@
+"""
+Symmetry detection for the fixture model.
+
+Two kinds of symmetry leave every constraint and the objective unchanged, so
+the solver would otherwise explore many equivalent schedules:
+
+- Interchangeable teams: two teams of the same division that are in no ground
+  sharing or venue conflict pair and have no fixed match or venue requirement
+  can swap places throughout the schedule.
+- Season rotation/reversal: the mirrored season is anti-periodic (week W+9 is
+  week W reversed), so rotating all 18 weeks cyclically or reversing their
+  order keeps every schedule legal with the same penalties. This only holds for
+  a group of divisions moved together, so it applies to each set of divisions
+  connected by shared venues in which no team has a pinned requirement.
+"""
+
+from collections.abc import Iterable
+
+from .models import Division, FixedMatch, VenueRequirement
+
+
+def pinned_teams(fixed_matches: list[FixedMatch], venue_requirements: list[VenueRequirement]) -> set[str]:
+    """Teams with a fixed match or venue requirement."""
+    teams = {req.team for req in venue_requirements}
+    for fm in fixed_matches:
+        teams.update((fm.team1, fm.team2))
+    return teams
+
+
+def interchangeable_teams(
+    divisions: list[Division],
+    coupled_pairs: Iterable[tuple[str, str]],
+    pinned: set[str],
+) -> dict[str, list[str]]:
+    """Groups of interchangeable teams per division (only groups of 2 or more)."""
+    coupled = {t for pair in coupled_pairs for t in pair}
+    groups = {}
+    for div in divisions:
+        free = [t.code for t in div.teams if t.code not in coupled and t.code not in pinned]
+        if len(free) >= 2:
+            groups[div.name] = free
+    return groups
+
+
+def unpinned_components(
+    divisions: list[Division],
+    coupled_pairs: Iterable[tuple[str, str]],
+    pinned: set[str],
+) -> list[list[Division]]:
+    """Sets of divisions connected by coupled pairs in which no team is pinned."""
+    team_to_div = {t.code: div.name for div in divisions for t in div.teams}
+    parent = {div.name: div.name for div in divisions}
+
+    def find(name: str) -> str:
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    for t1, t2 in coupled_pairs:
+        if t1 in team_to_div and t2 in team_to_div:
+            parent[find(team_to_div[t1])] = find(team_to_div[t2])
+
+    components: dict[str, list[Division]] = {}
+    for div in divisions:
+        components.setdefault(find(div.name), []).append(div)
+
+    return [
+        divs for divs in components.values()
+        if not any(t.code in pinned for div in divs for t in div.teams)
+    ]
@@ -0,0 +1,124 @@
+"""
+Synthetic leagues for benchmarks and tests.
+
+A league has N divisions of M teams spread over tiers (1st XI, 2nd XI, ...),
+with a configurable share of each tier's clubs also fielding a team in the
+tier above, which is what creates ground sharing pairs. Fixed matches and
+venue requirements are sampled from a constructive draft schedule of the
+league (see fix_gen.construction), so they are mutually consistent and the
+instances are normally feasible for a mirrored season. Venue conflict groups
+join teams of different clubs.
+"""
+
+import random
+from dataclasses import dataclass
+from itertools import product
+from string import ascii_uppercase
+
+from .construction import QuickGenerator
+from .models import Division, FixedMatch, VenueRequirement
+from .season import Season
+
+TIER_NAMES = {1: "1st XI", 2: "2nd XI", 3: "3rd XI"}
+
+
+@dataclass
+class SyntheticLeague:
+    divisions: list[Division]
+    fixed_matches: list[FixedMatch]
+    venue_requirements: list[VenueRequirement]
+    venue_conflicts: list[set[str]]
+
+    def describe(self) -> str:
+        teams = sum(len(div.teams) for div in self.divisions)
+        return (
+            f"{len(self.divisions)} divisions, {teams} teams, {len(self.fixed_matches)} fixed matches, "
+            f"{len(self.venue_requirements)} venue requirements, {len(self.venue_conflicts)} venue conflict groups"
+        )
+
+
+def _club_codes():
+    """AAA, AAB, ... (letters only, as team codes are club letters plus team number)."""
+    for letters in product(ascii_uppercase, repeat=3):
+        yield "".join(letters)
+
+
+def synthetic_league(
+    num_divisions: int,
+    teams_per_division: int,
+    divisions_per_tier: int = 4,
+    club_overlap: float = 0.8,
+    fixed_match_density: float = 0.02,
+    venue_requirement_density: float = 0.05,
+    venue_conflict_groups: int = 0,
+    seed: int = 0,
+) -> SyntheticLeague:
+    """Build a random league.
+
+    Args:
+        num_divisions: Number of divisions (N).
+        teams_per_division: Teams in every division (M).
+        divisions_per_tier: Divisions per tier; tier t's teams are numbered t.
+        club_overlap: Share of a tier's clubs that also have a team in the
+            tier above (0 = no ground sharing, 1 = every club in every tier).
+        fixed_match_density: Fixed matches per team.
+        venue_requirement_density: Venue requirements per team.
+        venue_conflict_groups: Number of groups of 2-3 teams from different
+            clubs that share pitches.
+        seed: Random seed; the same arguments and seed give the same league.
+    """
+    rng = random.Random(seed)
+    codes = _club_codes()
+    tiers = (num_divisions + divisions_per_tier - 1) // divisions_per_tier
+    divisions: list[Division] = []
+    previous_clubs: list[str] = []
+
+    for tier in range(1, tiers + 1):
+        count = min(divisions_per_tier, num_divisions - len(divisions))
+        needed = count * teams_per_division
+        shared = rng.sample(previous_clubs, min(len(previous_clubs), round(club_overlap * needed)))
+        clubs = shared + [next(codes) for _ in range(needed - len(shared))]
+        rng.shuffle(clubs)
+
+        tier_name = TIER_NAMES.get(tier, f"{tier}th XI")
+        for d in range(count):
+            name = f"{tier_name} Premier" if d == 0 else f"{tier_name} Div {d}"
+            members = clubs[d * teams_per_division:(d + 1) * teams_per_division]
+            divisions.append(Division.from_row([name] + [f"{club}{tier}" for club in members]))
+        previous_clubs = clubs
+
+    # Pins are drawn from a draft's first half, each moved to the mirrored week half the time
+    teams = [t.code for div in divisions for t in div.teams]
+    half_weeks = Season.for_divisions(divisions).half_weeks
+    draft = QuickGenerator(divisions, [], []).first_half(seed) if teams else []
+
+    def sample(density: float) -> list[tuple[int, str, str]]:
+        picked = []
+        for f in rng.sample(draft, min(len(draft), round(density * len(teams)))):
+            if rng.random() < 0.5:
+                picked.append((f.week + half_weeks, f.away_team, f.home_team))
+            else:
+                picked.append((f.week, f.home_team, f.away_team))
+        return picked
+
+    fixed_matches = [
+        FixedMatch(week=week, team1=home, team2=away) for week, home, away in sample(fixed_match_density)
+    ]
+    venue_requirements = []
+    for week, home, away in sample(venue_requirement_density):
+        at_home = rng.random() < 0.5
+        venue_requirements.append(
+            VenueRequirement(team=home if at_home else away, venue="h" if at_home else "a", week=week)
+        )
+
+    club_of = {t.code: t.club for div in divisions for t in div.teams}
+    venue_conflicts = []
+    for _ in range(venue_conflict_groups):
+        group: set[str] = set()
+        for team in rng.sample(teams, min(len(teams), rng.choice((2, 3)))):
+            if club_of[team] not in {club_of[t] for t in group}:
+                group.add(team)
+        if len(group) >= 2:
+            venue_conflicts.append(group)
+
+    return SyntheticLeague(divisions, fixed_matches, venue_requirements, venue_conflicts)
@@ -2,108 +2,199 @@
 Validation functions for generated fixtures.
 """
 
-from collections import defaultdict
-from itertools import combinations
+from collections.abc import Iterable
 
-from .ground_sharing import build_ground_sharing_pairs
+import numpy as np
+
+from .ground_sharing import build_shared_venue_pairs
 from .models import Division, Fixture
+from .schedule import Schedule
+from .season import Season
+
 
+class FixtureValidator:
+    """
+    Validates fixture lists against the per-division rules with array operations.
+
+    Every team must play each team of its division twice, once at home, in a
+    season as long as Season.for_divisions gives (num_weeks overrides it).
+    Fixtures are converted once into dense integer arrays, padded to the
+    largest division: hosts[d, i, j] counts how often team i hosts team j,
+    week_sums/week_squares[d, i, j] (i < j) sum the weeks the pair meets, and
+    venue[d, i, w] is +1 (home), -1 (away) or 0 (no game). Every rule is then a
+    vectorized check over all divisions at once. The team index is built in the
+    constructor, so one validator can check many candidate schedules.
+    """
 
-def validate_fixtures(fixtures: list[Fixture], divisions: list[Division]) -> list[str]:
+    def __init__(self, divisions: list[Division], num_weeks: int | None = None):
+        self.divisions = divisions
+        self.num_weeks = num_weeks if num_weeks is not None else Season.for_divisions(divisions).weeks
+        self.division_index = {div.name: d for d, div in enumerate(divisions)}
+        self.team_codes = [[t.code for t in div.teams] for div in divisions]
+        # Team code -> (division index, index within the division)
+        self.team_position = {code: (d, i) for d, codes in enumerate(self.team_codes) for i, code in enumerate(codes)}
+        self.sizes = np.array([len(codes) for codes in self.team_codes], dtype=np.int64)
+        # One extra slot per division collects teams not listed in it
+        self.width = int(self.sizes.max(initial=0)) + 1
+
+    def validate(self, fixtures: Iterable[Fixture] | Schedule) -> list[str]:
+        """Validate the fixtures against all constraints."""
+        schedule = Schedule.from_fixtures(fixtures, self.divisions)
+        week, home, away, division = schedule.columns()
+
+        # The schedule's division and team tables mapped onto the validator's:
+        # division index (-1 if unknown), and each team's division and index in it
+        division_map = np.array(
+            [self.division_index.get(name, -1) for name in schedule.division_names], dtype=np.int64
+        )
+        team_division = np.full(len(schedule.teams), -1, dtype=np.int64)
+        team_position = np.zeros(len(schedule.teams), dtype=np.int64)
+        for i, code in enumerate(schedule.teams):
+            if code in self.team_position:
+                team_division[i], team_position[i] = self.team_position[code]
+
+        division = division_map[division]
+        known = division >= 0
+        division, home, away, week = division[known], home[known], away[known], week[known]
+        # Teams not in the fixture's division take the division's "unknown" slot
+        unknown = self.sizes[division]
+        return self.validate_arrays(
+            division,
+            np.where(team_division[home] == division, team_position[home], unknown),
+            np.where(team_division[away] == division, team_position[away], unknown),
+            week,
+        )
+
+    def validate_arrays(
+        self,
+        division: np.ndarray,
+        home: np.ndarray,
+        away: np.ndarray,
+        week: np.ndarray,
+    ) -> list[str]:
+        """
+        Validate fixtures given as parallel integer arrays: division index,
+        home and away team index within the division (len(teams) for teams
+        not in the division) and week.
+        """
+        num_divs, n = len(self.divisions), self.width
+        num_weeks = self.num_weeks
+        # Per division: every other team twice, half of those games at home
+        expected_home = np.maximum(self.sizes - 1, 0)
+        expected_games = 2 * expected_home
+
+        size = num_divs * n * n
+        hosts = np.bincount((division * n + home) * n + away, minlength=size).reshape(num_divs, n, n)
+
+        # Sum and sum of squares of the meeting weeks per unordered pair: for a
+        # pair meeting twice in weeks w1 and w2, (w1 - w2)^2 = 2 * squares - sums^2
+        pair = (division * n + np.minimum(home, away)) * n + np.maximum(home, away)
+        week_sums = np.bincount(pair, weights=week, minlength=size).reshape(num_divs, n, n)
+        week_squares = np.bincount(pair, weights=week * week, minlength=size).reshape(num_divs, n, n)
+
+        last_week = int(week.max(initial=num_weeks))
+        # Home and away entries interleaved in fixture order, so a team with two
+        # games in one week takes the venue of the later fixture
+        venue = np.zeros((num_divs, n, max(last_week, num_weeks) + 1), dtype=np.int8)
+        keep = week >= 0
+        venue[
+            np.repeat(division[keep], 2),
+            np.column_stack((home[keep], away[keep])).ravel(),
+            np.repeat(week[keep], 2),
+        ] = np.tile(np.array([1, -1], dtype=np.int8), int(keep.sum()))
+
+        # Only real teams (not padding or the unknown slot) are checked
+        team_mask = np.arange(n)[None, :] < self.sizes[:, None]
+        pair_mask = team_mask[:, :, None] & team_mask[:, None, :] & np.triu(np.ones((n, n), dtype=bool), 1)
+
+        home_games = hosts.sum(axis=2)
+        away_games = hosts.sum(axis=1)
+        wrong_games = team_mask & (home_games + away_games != expected_games[:, None])
+        wrong_home = team_mask & (home_games != expected_home[:, None])
+        wrong_away = team_mask & (away_games != expected_home[:, None])
+
+        meetings = hosts + hosts.transpose(0, 2, 1)
+        wrong_meetings = pair_mask & (meetings != 2)
+        same_home = pair_mask & (meetings == 2) & ((hosts == 2) | (hosts.transpose(0, 2, 1) == 2))
+        consecutive = pair_mask & (meetings == 2) & (2 * week_squares - week_sums**2 == 1)
+
+        windows = np.lib.stride_tricks.sliding_window_view(venue[:, :, 1:num_weeks + 1], 4, axis=2).sum(axis=3)
+        four_home = team_mask[:, :, None] & (windows == 4)
+        four_away = team_mask[:, :, None] & (windows == -4)
+
+        flagged = (
+            wrong_games.any(axis=1) | wrong_home.any(axis=1) | wrong_away.any(axis=1)
+            | wrong_meetings.any(axis=(1, 2)) | same_home.any(axis=(1, 2)) | consecutive.any(axis=(1, 2))
+            | four_home.any(axis=(1, 2)) | four_away.any(axis=(1, 2))
+        )
+
+        issues = []
+        for d in np.flatnonzero(flagged):
+            teams = self.team_codes[d]
+            for i in np.flatnonzero(wrong_games[d]):
+                issues.append(
+                    f"{teams[i]}: plays {home_games[d, i] + away_games[d, i]} games, expected {expected_games[d]}"
+                )
+            for i in np.flatnonzero(wrong_home[d] | wrong_away[d]):
+                if wrong_home[d, i]:
+                    issues.append(f"{teams[i]}: {home_games[d, i]} home games, expected {expected_home[d]}")
+                if wrong_away[d, i]:
+                    issues.append(f"{teams[i]}: {away_games[d, i]} away games, expected {expected_home[d]}")
+            for i, j in zip(*np.nonzero(wrong_meetings[d] | same_home[d])):
+                if wrong_meetings[d, i, j]:
+                    issues.append(f"{teams[i]} vs {teams[j]}: {meetings[d, i, j]} matches, expected 2")
+                else:
+                    issues.append(f"{teams[i]} vs {teams[j]}: same home team in both matches")
+            for i, j in zip(*np.nonzero(consecutive[d])):
+                earlier = int(week_sums[d, i, j]) // 2
+                weeks = [earlier, earlier + 1]
+                issues.append(f"{teams[i]} vs {teams[j]}: consecutive reverse fixtures in weeks {weeks}")
+            for i, w in zip(*np.nonzero(four_home[d] | four_away[d])):
+                kind = "home" if four_home[d, i, w] else "away"
+                issues.append(f"{teams[i]}: 4 consecutive {kind} games starting week {w + 1}")
+
+        return issues
+
+
+def validate_fixtures(fixtures: Iterable[Fixture] | Schedule, divisions: list[Division]) -> list[str]:
     """Validate the generated fixtures against all constraints."""
-    issues = []
-
-    # Group fixtures by division
-    by_division: dict[str, list[Fixture]] = defaultdict(list)
-    for f in fixtures:
-        by_division[f.division].append(f)
-
-    for div in divisions:
-        div_fixtures = by_division[div.name]
-        teams = [t.code for t in div.teams]
-
-        # Check each team plays 18 games
-        for team in teams:
-            games = [f for f in div_fixtures if f.home_team == team or f.away_team == team]
-            if len(games) != 18:
-                issues.append(f"{team}: plays {len(games)} games, expected 18")
-
-        # Check each team plays 9 home and 9 away
-        for team in teams:
-            home_games = [f for f in div_fixtures if f.home_team == team]
-            away_games = [f for f in div_fixtures if f.away_team == team]
-            if len(home_games) != 9:
-                issues.append(f"{team}: {len(home_games)} home games, expected 9")
-            if len(away_games) != 9:
-                issues.append(f"{team}: {len(away_games)} away games, expected 9")
-
-        # Check each pair plays twice (once each way)
-        for t1, t2 in combinations(teams, 2):
-            h2h = [f for f in div_fixtures
-                   if (f.home_team == t1 and f.away_team == t2) or
-                      (f.home_team == t2 and f.away_team == t1)]
-            if len(h2h) != 2:
-                issues.append(f"{t1} vs {t2}: {len(h2h)} matches, expected 2")
-            elif len(h2h) == 2:
-                homes = [f.home_team for f in h2h]
-                if homes[0] == homes[1]:
-                    issues.append(f"{t1} vs {t2}: same home team in both matches")
-
-        # Check no consecutive reverse fixtures
-        for t1, t2 in combinations(teams, 2):
-            h2h = [f for f in div_fixtures
-                   if (f.home_team == t1 and f.away_team == t2) or
-                      (f.home_team == t2 and f.away_team == t1)]
-            if len(h2h) == 2:
-                weeks = sorted([f.week for f in h2h])
-                if weeks[1] - weeks[0] == 1:
-                    issues.append(f"{t1} vs {t2}: consecutive reverse fixtures in weeks {weeks}")
-
-        # Check no 4+ consecutive home or away
-        for team in teams:
-            week_venue = {}
-            for f in div_fixtures:
-                if f.home_team == team:
-                    week_venue[f.week] = "H"
-                elif f.away_team == team:
-                    week_venue[f.week] = "A"
-
-            sequence = [week_venue.get(w, "?") for w in range(1, 19)]
-
-            for i in range(15):
-                window = sequence[i:i+4]
-                if window == ["H", "H", "H", "H"]:
-                    issues.append(f"{team}: 4 consecutive home games starting week {i+1}")
-                elif window == ["A", "A", "A", "A"]:
-                    issues.append(f"{team}: 4 consecutive away games starting week {i+1}")
-
-    return issues
+    return FixtureValidator(divisions).validate(fixtures)
 
 
 class CrossDivisionCoordinator:
     """
-    Coordinates ground sharing across divisions.
-    Checks and reports cross-division ground sharing violations.
+    Coordinates ground sharing and venue conflicts across divisions.
+    Checks and reports pairs sharing a venue that are both at home in a week.
     """
 
-    def __init__(self, divisions: list[Division]):
+    def __init__(self, divisions: list[Division], venue_conflicts: list[set[str]] | None = None):
         self.divisions = divisions
-        self.ground_sharing_pairs = build_ground_sharing_pairs(divisions)
-
-    def check_violations(self, fixtures: list[Fixture]) -> list[str]:
-        """Check for ground sharing violations across divisions."""
-        team_home_weeks: dict[str, set[int]] = defaultdict(set)
-        for f in fixtures:
-            team_home_weeks[f.home_team].add(f.week)
+        self.shared_venue_pairs = build_shared_venue_pairs(divisions, venue_conflicts)
+
+    def check_violations(self, fixtures: Iterable[Fixture] | Schedule) -> list[str]:
+        """Check for ground sharing and venue conflict violations across divisions."""
+        schedule = Schedule.from_fixtures(fixtures, self.divisions)
+        week, home, _, _ = schedule.columns()
+        team_index = schedule.team_index()
+
+        # home_weeks[team, week] is true when the team is at home that week
+        home_weeks = np.zeros((len(schedule.teams), int(week.max(initial=0)) + 1), dtype=bool)
+        home_weeks[home, week] = True
+
+        pairs = [
+            (t1, t2, weights)
+            for (t1, t2), weights in self.shared_venue_pairs.items()
+            if t1 in team_index and t2 in team_index
+        ]
+        first = np.array([team_index[t1] for t1, _, _ in pairs], dtype=np.int64)
+        second = np.array([team_index[t2] for _, t2, _ in pairs], dtype=np.int64)
+        both_home = home_weeks[first] & home_weeks[second]
 
         violations = []
-        for t1, t2, max_tier in self.ground_sharing_pairs:
-            t1_home = team_home_weeks[t1]
-            t2_home = team_home_weeks[t2]
-            conflict_weeks = t1_home & t2_home
-            if conflict_weeks:
-                violations.append(
-                    f"Ground sharing conflict: {t1} and {t2} both home in weeks {sorted(conflict_weeks)}"
-                )
+        for (t1, t2, weights), clash_weeks in zip(pairs, both_home):
+            conflict_weeks = np.flatnonzero(clash_weeks)
+            if len(conflict_weeks):
+                kind = "Venue conflict" if weights == ["venue_conflicts"] else "Ground sharing conflict"
+                violations.append(f"{kind}: {t1} and {t2} both home in weeks {conflict_weeks.tolist()}")
 
         return violations
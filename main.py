@@ -11,16 +11,51 @@ import argparse
 from pathlib import Path
 
 from fix_gen import (
+    COORDINATION_TIME_LIMIT,
+    DIVISION_TIME_LIMIT,
+    INCREMENTAL_TIME_LIMIT,
+    LEAN_BUILD,
+    MIRRORED_SEASON,
+    MODEL_CACHE,
+    MODEL_ENGINE,
+    OBJECTIVE_MODE,
+    OUTPUT_FORMATS,
+    PRINT_GRIDS,
+    SEQUENCE_MODE,
+    SOFT_ENCODING,
+    SOLUTION_STORE,
+    SOLVER_TIME_LIMIT,
+    STOP_GAP,
+    STOP_STALL_SECONDS,
+    STOP_TARGET_OBJECTIVE,
+    SYMMETRY_BREAKING,
+    WARM_START,
+    BatchRunner,
     CrossDivisionCoordinator,
+    DecomposedGenerator,
     FixtureGenerator,
+    FixtureIndex,
+    LNSImprover,
+    ModelCache,
+    PortfolioRunner,
+    QuickGenerator,
+    SolutionStore,
+    StoppingPolicy,
+    affected_divisions,
+    input_fingerprint,
     load_divisions,
     load_fixed_matches,
+    load_fixtures,
+    load_manifest,
+    load_venue_conflicts,
     load_venue_requirements,
-    print_fixture_grids,
+    parse_seeds,
     print_summary,
+    render_grids,
     validate_fixtures,
     write_fixtures_csv,
-    write_fixtures_html,
+    write_outputs,
+    write_summary,
 )
 
 
@@ -32,44 +67,419 @@ def main():
         default=None,
         help="Random seed for reproducible fixture generation. Different seeds produce different valid fixtures.",
     )
+    parser.add_argument(
+        "--engine",
+        choices=["boolean", "week_var"],
+        default=MODEL_ENGINE,
+        help="Matchup formulation for the CP-SAT model (default: %(default)s). "
+        "'week_var' is the original formulation, kept for comparison.",
+    )
+    parser.add_argument(
+        "--sequence-mode",
+        choices=["linear", "table"],
+        default=SEQUENCE_MODE,
+        help="How consecutive home/away rules are modelled (default: %(default)s). "
+        "'table' restricts each team to the precomputed legal patterns.",
+    )
+    parser.add_argument(
+        "--decompose",
+        action="store_true",
+        help="Solve each division independently in parallel, then coordinate "
+        "cross-division ground sharing in a small second model.",
+    )
+    parser.add_argument(
+        "--symmetry-breaking",
+        action=argparse.BooleanOptionalAction,
+        default=SYMMETRY_BREAKING,
+        help="Add constraints that remove equivalent schedules (interchangeable "
+        "teams, season rotation/reversal) from the search (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--warm-start",
+        action=argparse.BooleanOptionalAction,
+        default=WARM_START,
+        help="Hint the solver with the constructive circle-method schedule (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--mirrored",
+        action=argparse.BooleanOptionalAction,
+        default=MIRRORED_SEASON,
+        help="Mirror the first half of the season into the second with venues swapped; "
+        "--no-mirrored schedules the second half freely (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--lean",
+        action=argparse.BooleanOptionalAction,
+        default=LEAN_BUILD,
+        help="Build the model without variable names to save memory on large leagues; "
+        "--no-lean names them for debugging (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--soft-encoding",
+        choices=["half", "full"],
+        default=SOFT_ENCODING,
+        help="How ground sharing and 3-in-a-row penalties are encoded (default: %(default)s). "
+        "'full' is the original fully reified encoding, kept for comparison.",
+    )
+    parser.add_argument(
+        "--objective-mode",
+        choices=["weighted", "lexicographic"],
+        default=OBJECTIVE_MODE,
+        help="Minimise the weighted penalty, or each penalty level in priority order "
+        "(config.OBJECTIVE_LEVELS) with the time limit split between them (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=["csv", "html", "txt"],
+        default=OUTPUT_FORMATS,
+        help="Output files to write to output/ (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--print-grids",
+        action=argparse.BooleanOptionalAction,
+        default=PRINT_GRIDS,
+        help="Print the fixture grids to stdout (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--model-cache",
+        action=argparse.BooleanOptionalAction,
+        default=MODEL_CACHE,
+        help="Load the built model from .cache/models when the inputs and options are unchanged, "
+        "or store it there (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--solution-store",
+        action=argparse.BooleanOptionalAction,
+        default=SOLUTION_STORE,
+        help="Record every solution in .cache/solutions.sqlite and hint new solves from the best "
+        "stored schedule (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--reuse",
+        action="store_true",
+        help="Return the stored optimal schedule for the same inputs and weights, if any, without solving.",
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Skip the solver and write the constructive draft schedule (about 0.5s; it may "
+        "leave ground sharing clashes).",
+    )
+    parser.add_argument(
+        "--incremental",
+        nargs="?",
+        type=Path,
+        const=Path(__file__).parent / "output" / "fixtures.csv",
+        default=None,
+        metavar="FIXTURES_CSV",
+        help="Re-solve from a previous fixture list (default: output/fixtures.csv), "
+        "keeping divisions that still satisfy every requirement unchanged.",
+    )
+    parser.add_argument(
+        "--lns",
+        nargs="?",
+        type=Path,
+        const=Path(__file__).parent / "output" / "fixtures.csv",
+        default=None,
+        metavar="FIXTURES_CSV",
+        help="Improve a previous fixture list (default: output/fixtures.csv) by large neighbourhood "
+        "search: re-solve one club, division or window of weeks at a time in parallel processes.",
+    )
+    parser.add_argument(
+        "--free-neighbours",
+        action="store_true",
+        help="With --incremental, also re-solve divisions sharing grounds with an affected division.",
+    )
+    parser.add_argument(
+        "--seeds",
+        type=parse_seeds,
+        default=None,
+        metavar="SEEDS",
+        help="Portfolio mode: solve every seed (e.g. '1-32' or '1-8,12') in parallel processes "
+        "and keep the best schedule.",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=1,
+        help="With --seeds, also write the next best distinct schedules to output/alternatives/ "
+        "(default: %(default)s).",
+    )
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        default=None,
+        metavar="MANIFEST",
+        help="Batch mode: solve every scenario directory listed in MANIFEST (laid out like data/) "
+        "in parallel processes, writing output/batch/<scenario>/ and output/batch/summary.csv.",
+    )
+    parser.add_argument(
+        "--cpus",
+        type=int,
+        default=None,
+        help="With --batch, CPU budget split between the scenario processes (default: every core).",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="With --batch, number of scenarios solved at once (default: one per CPU).",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=f"Hard cap on solver time (default: {SOLVER_TIME_LIMIT}s, or "
+        f"{INCREMENTAL_TIME_LIMIT}s with --incremental). With --decompose, the limit of each "
+        f"coordination solve and the first limit of each division solve (default: "
+        f"{COORDINATION_TIME_LIMIT}s and {DIVISION_TIME_LIMIT}s).",
+    )
+    parser.add_argument(
+        "--stop-gap",
+        type=float,
+        default=STOP_GAP,
+        metavar="GAP",
+        help="Stop once the relative gap to the best bound is at most GAP, e.g. 0.01.",
+    )
+    parser.add_argument(
+        "--stop-stall",
+        type=float,
+        default=STOP_STALL_SECONDS,
+        metavar="SECONDS",
+        help="Stop after SECONDS without an improving solution.",
+    )
+    parser.add_argument(
+        "--stop-target",
+        type=float,
+        default=STOP_TARGET_OBJECTIVE,
+        metavar="PENALTY",
+        help="Stop once a schedule with penalty at most PENALTY is found.",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Write a solve trace (phase timings, model statistics, improving solutions) "
+        "as JSON, or the improving solutions as CSV if PATH ends in .csv.",
+    )
     args = parser.parse_args()
+    if args.reuse and not args.solution_store:
+        parser.error("--reuse needs the solution store")
+    if not args.mirrored and (args.quick or args.decompose):
+        parser.error("--quick and --decompose build mirrored seasons only")
+    if args.decompose and args.sequence_mode != SEQUENCE_MODE:
+        parser.error("--decompose always works from the pattern table, --sequence-mode does not apply")
+    if args.decompose and (args.stop_gap, args.stop_stall, args.stop_target) != (
+        STOP_GAP, STOP_STALL_SECONDS, STOP_TARGET_OBJECTIVE
+    ):
+        parser.error("--decompose takes no --stop-* rules, bound it with --time-limit")
 
     data_dir = Path(__file__).parent / "data"
     output_dir = Path(__file__).parent / "output"
     output_dir.mkdir(exist_ok=True)
+    cache_dir = Path(__file__).parent / ".cache"
+    model_cache = ModelCache(cache_dir / "models") if args.model_cache else None
+    solution_store = SolutionStore(cache_dir / "solutions.sqlite") if args.solution_store else None
+
+    if args.batch:
+        batch_dir = output_dir / "batch"
+        scenarios = load_manifest(args.batch)
+        results = BatchRunner(scenarios, batch_dir).run(
+            seed=args.seed,
+            engine=args.engine,
+            sequence_mode=args.sequence_mode,
+            symmetry_breaking=args.symmetry_breaking,
+            warm_start=args.warm_start,
+            stopping=StoppingPolicy(
+                gap=args.stop_gap,
+                stall_seconds=args.stop_stall,
+                target_objective=args.stop_target,
+                time_limit=args.time_limit if args.time_limit is not None else SOLVER_TIME_LIMIT,
+            ),
+            model_cache=model_cache,
+            solution_store=solution_store,
+            mirrored=args.mirrored,
+            lean=args.lean,
+            soft_encoding=args.soft_encoding,
+            objective_mode=args.objective_mode,
+            formats=args.formats,
+            cpus=args.cpus,
+            processes=args.processes,
+        )
+        batch_dir.mkdir(exist_ok=True)
+        write_summary(results, batch_dir / "summary.csv")
+        failed = sum(result.error is not None or result.objective is None for result in results)
+        print(f"\n{len(results) - failed}/{len(results)} scenarios solved, summary written to {batch_dir / 'summary.csv'}")
+        return
 
     # Load data
     print("Loading data...")
     divisions = load_divisions(data_dir / "divisions.csv")
     fixed_matches = load_fixed_matches(data_dir / "fixReq.csv")
     venue_requirements = load_venue_requirements(data_dir / "venReq.csv")
+    venue_conflicts = load_venue_conflicts(data_dir / "venConflicts.csv")
 
     print(f"Loaded {len(divisions)} divisions")
     print(f"Loaded {len(fixed_matches)} fixed match requirements")
     print(f"Loaded {len(venue_requirements)} venue requirements")
+    print(f"Loaded {len(venue_conflicts)} venue conflict groups")
+
+    default_time_limit = INCREMENTAL_TIME_LIMIT if args.incremental else SOLVER_TIME_LIMIT
+    stopping = StoppingPolicy(
+        gap=args.stop_gap,
+        stall_seconds=args.stop_stall,
+        target_objective=args.stop_target,
+        time_limit=args.time_limit if args.time_limit is not None else default_time_limit,
+    )
+
+    reused = None
+    if args.reuse:
+        reused = solution_store.best(
+            input_fingerprint(divisions, fixed_matches, venue_requirements, venue_conflicts, args.mirrored), optimal_only=True
+        )
+        if reused is None:
+            print("No stored optimal schedule for these inputs and weights, solving")
 
     # Generate fixtures
-    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements)
-    fixtures = generator.generate(seed=args.seed)
+    trace = None
+    if reused is not None:
+        print(f"Reusing stored optimal schedule (seed {reused.seed}, penalty {reused.objective:.0f})")
+        args.seed = reused.seed
+        fixtures = reused.fixtures
+    elif args.quick:
+        generator = QuickGenerator(divisions, fixed_matches, venue_requirements, venue_conflicts)
+        fixtures = generator.generate(seed=args.seed)
+    elif args.incremental:
+        previous = load_fixtures(args.incremental)
+        affected = affected_divisions(
+            previous,
+            divisions,
+            fixed_matches,
+            venue_requirements,
+            include_neighbours=args.free_neighbours,
+            mirrored=args.mirrored,
+            venue_conflicts=venue_conflicts,
+        )
+        print(f"Loaded {len(previous)} previous fixtures, {len(affected)} divisions affected")
+        for name in sorted(affected):
+            print(f"  {name}")
+        generator = FixtureGenerator(divisions, fixed_matches, venue_requirements, venue_conflicts)
+        fixtures = generator.generate(
+            seed=args.seed,
+            engine=args.engine,
+            sequence_mode=args.sequence_mode,
+            previous=previous,
+            frozen_divisions={div.name for div in divisions} - affected,
+            stopping=stopping,
+            mirrored=args.mirrored,
+            lean=args.lean,
+            soft_encoding=args.soft_encoding,
+            objective_mode=args.objective_mode,
+            lazy=True,
+        )
+        trace = generator.trace
+    elif args.lns:
+        previous = load_fixtures(args.lns)
+        print(f"Loaded {len(previous)} previous fixtures")
+        improver = LNSImprover(divisions, fixed_matches, venue_requirements, venue_conflicts)
+        fixtures = improver.improve(
+            previous,
+            seed=args.seed,
+            engine=args.engine,
+            sequence_mode=args.sequence_mode,
+            stopping=stopping,
+            mirrored=args.mirrored,
+            lean=args.lean,
+            soft_encoding=args.soft_encoding,
+            lazy=True,
+        )
+        trace = improver.trace
+    elif args.seeds:
+        runner = PortfolioRunner(divisions, fixed_matches, venue_requirements, venue_conflicts)
+        results = runner.run(
+            args.seeds,
+            engine=args.engine,
+            sequence_mode=args.sequence_mode,
+            symmetry_breaking=args.symmetry_breaking,
+            warm_start=args.warm_start,
+            stopping=stopping,
+            solution_store=solution_store,
+            mirrored=args.mirrored,
+            lean=args.lean,
+            soft_encoding=args.soft_encoding,
+            objective_mode=args.objective_mode,
+            top_k=args.top_k,
+        )
+        if not results:
+            print("  WARNING: No seed found a solution!")
+            return
+        print(f"\nBest seed: {results[0].seed} (penalty {results[0].objective:.0f})")
+        args.seed = results[0].seed
+        fixtures = results[0].fixtures
+        trace = results[0].trace
+
+        alternatives_dir = output_dir / "alternatives"
+        for rank, result in enumerate(results[1:], start=2):
+            alternatives_dir.mkdir(exist_ok=True)
+            path = alternatives_dir / f"fixtures_{rank}_seed{result.seed}.csv"
+            write_fixtures_csv(result.fixtures, path, seed=result.seed)
+            print(f"  #{rank}: seed {result.seed} (penalty {result.objective:.0f}) written to {path}")
+    elif args.decompose:
+        generator = DecomposedGenerator(divisions, fixed_matches, venue_requirements, venue_conflicts)
+        limits = {}
+        if args.time_limit is not None:
+            limits = {"coordination_time_limit": args.time_limit, "division_time_limit": args.time_limit}
+        fixtures = generator.generate(seed=args.seed, engine=args.engine, **limits)
+    else:
+        generator = FixtureGenerator(divisions, fixed_matches, venue_requirements, venue_conflicts)
+        fixtures = generator.generate(
+            seed=args.seed,
+            engine=args.engine,
+            sequence_mode=args.sequence_mode,
+            symmetry_breaking=args.symmetry_breaking,
+            warm_start=args.warm_start,
+            stopping=stopping,
+            model_cache=model_cache,
+            solution_store=solution_store,
+            mirrored=args.mirrored,
+            lean=args.lean,
+            soft_encoding=args.soft_encoding,
+            objective_mode=args.objective_mode,
+            lazy=True,
+        )
+        trace = generator.trace
+
+    if not fixtures:
+        print(f"\n  WARNING: No fixtures generated, existing outputs in {output_dir} left unchanged")
+        return
 
     # Validate
     print("\nValidating fixtures...")
     violations = validate_fixtures(fixtures, divisions)
 
     # Check cross-division ground sharing
-    coordinator = CrossDivisionCoordinator(divisions)
+    coordinator = CrossDivisionCoordinator(divisions, venue_conflicts)
     cross_violations = coordinator.check_violations(fixtures)
 
-    # Output
-    write_fixtures_csv(fixtures, output_dir / "fixtures.csv", seed=args.seed)
-    write_fixtures_html(fixtures, divisions, output_dir / "fixtures.html", seed=args.seed)
-    print(f"\nFixtures written to {output_dir}")
+    # Output: every format rendered from one (division, week) index, written concurrently
+    index = FixtureIndex(fixtures, divisions)
+    paths = write_outputs(index, divisions, output_dir, seed=args.seed, formats=args.formats)
+    print(f"\nFixtures written to {', '.join(str(path) for path in paths.values())}")
+    if args.trace:
+        if trace is None:
+            print("No solve trace recorded in this mode")
+        else:
+            trace.write(args.trace)
+            print(f"Solve trace written to {args.trace}")
 
     # Summary
-    print_summary(fixtures, violations, cross_violations)
+    print_summary(fixtures, violations, cross_violations, stop_reason=trace.stop_reason if trace else None)
 
-    # Print fixture grids and write to file
-    print_fixture_grids(fixtures, divisions, output_dir / "fixtures.txt", seed=args.seed)
+    if args.print_grids:
+        print(render_grids(index, divisions, seed=args.seed))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,707 @@
+"""
+Tests for the CP-SAT fixture generator on a small league.
+"""
+
+import json
+
+import pytest
+from ortools.sat.python import cp_model
+
+from fix_gen import (
+    MODEL_ENGINE,
+    OBJECTIVE_LEVELS,
+    WEIGHTS,
+    BatchRunner,
+    CrossDivisionCoordinator,
+    DecomposedGenerator,
+    Division,
+    FixedMatch,
+    Fixture,
+    FixtureGenerator,
+    FixtureIndex,
+    FixtureValidator,
+    LNSImprover,
+    ModelCache,
+    PortfolioRunner,
+    QuickGenerator,
+    Schedule,
+    Season,
+    SolutionStore,
+    StoppingPolicy,
+    VenueRequirement,
+    affected_divisions,
+    input_fingerprint,
+    league_fingerprint,
+    load_fixtures,
+    load_manifest,
+    parse_seeds,
+    print_fixture_grids,
+    render_outputs,
+    stream_fixtures_csv,
+    synthetic_league,
+    validate_fixtures,
+    write_fixtures_csv,
+    write_fixtures_html,
+    write_outputs,
+)
+from fix_gen.construction import circle_round_robin
+from fix_gen.decomposition import _solve_division
+from fix_gen.ground_sharing import build_ground_sharing_pairs, build_shared_venue_pairs
+from fix_gen.patterns import legal_patterns
+from fix_gen.symmetry import interchangeable_teams, pinned_teams, unpinned_components
+
+
+def make_division(name: str, clubs: list[str], number: int) -> Division:
+    """Build a division from a list of club codes, all with the same team number."""
+    return Division.from_row([name] + [f"{club}{number}" for club in clubs])
+
+
+def fixture_set(fixtures: list, division: str) -> set[tuple[int, str, str]]:
+    """(week, home, away) of a division's fixtures."""
+    return {(f.week, f.home_team, f.away_team) for f in fixtures if f.division == division}
+
+
+CLUBS = ["AAA", "BBB", "CCC", "DDD", "EEE", "FFF", "GGG", "HHH", "III", "JJJ"]
+
+
+@pytest.fixture
+def divisions():
+    return [
+        make_division("1st XI Premier", CLUBS, 1),
+        make_division("2nd XI Premier", CLUBS, 2),
+    ]
+
+
+@pytest.fixture
+def fixed_matches():
+    return [FixedMatch(week=3, team1="AAA1", team2="BBB1")]
+
+
+@pytest.fixture
+def venue_requirements():
+    return [
+        VenueRequirement(team="CCC2", venue="h", week=2),
+        VenueRequirement(team="DDD1", venue="a", week=12),
+    ]
+
+
+@pytest.mark.parametrize("engine", ["boolean", "week_var"])
+def test_generate_valid_schedule(engine, divisions, fixed_matches, venue_requirements):
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements)
+    fixtures = generator.generate(seed=7, engine=engine)
+
+    assert len(fixtures) == 2 * 90
+    assert validate_fixtures(fixtures, divisions) == []
+
+    by_week_teams = {(f.week, frozenset((f.home_team, f.away_team))) for f in fixtures}
+    assert (3, frozenset(("AAA1", "BBB1"))) in by_week_teams
+
+    venue = {(f.home_team, f.week): "h" for f in fixtures}
+    venue.update({(f.away_team, f.week): "a" for f in fixtures})
+    assert venue[("CCC2", 2)] == "h"
+    assert venue[("DDD1", 12)] == "a"
+
+
+def test_fixed_matches_by_team_pair(divisions):
+    fixed_matches = [
+        FixedMatch(week=4, team1="DDD2", team2="CCC2"),
+        FixedMatch(week=5, team1="AAA1", team2="AAA2"),  # Different divisions: no matchup to fix
+        FixedMatch(week=6, team1="EEE1", team2="ZZZ1"),  # Unknown team
+    ]
+    generator = FixtureGenerator(divisions, fixed_matches, [VenueRequirement(team="ZZZ1", venue="h", week=1)])
+    fixtures = generator.generate(seed=2, time_limit=10)
+
+    assert validate_fixtures(fixtures, divisions) == []
+    assert (4, frozenset(("CCC2", "DDD2"))) in {(f.week, frozenset((f.home_team, f.away_team))) for f in fixtures}
+
+
+@pytest.mark.parametrize("mirrored", [True, False])
+@pytest.mark.parametrize("engine", ["boolean", "week_var"])
+def test_mixed_size_divisions(engine, mirrored):
+    divisions = [
+        make_division("1st XI", CLUBS[:6], 1),
+        make_division("2nd XI", CLUBS[:5], 2),
+        make_division("3rd XI", CLUBS[:4], 3),
+    ]
+    fixed_matches = [FixedMatch(week=2, team1="AAA1", team2="BBB1")]
+    venue_requirements = [VenueRequirement(team="CCC2", venue="h", week=8)]
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements)
+    fixtures = generator.generate(seed=3, engine=engine, mirrored=mirrored, time_limit=30)
+
+    # 5 rounds per half: the 5-team division rests once a half, the 4-team division twice
+    assert Season.for_divisions(divisions).weeks == 10
+    assert len(fixtures) == 2 * (15 + 10 + 6)
+    assert validate_fixtures(fixtures, divisions) == []
+    assert affected_divisions(fixtures, divisions, fixed_matches, venue_requirements, mirrored=mirrored) == set()
+    assert max(f.week for f in fixtures) <= 10
+    games = {(t, f.week) for f in fixtures for t in (f.home_team, f.away_team)}
+    assert len(games) == 2 * len(fixtures)
+    assert ("CCC2", 8) in {(f.home_team, f.week) for f in fixtures}
+
+
+@pytest.mark.parametrize("mirrored", [True, False])
+def test_lazy_schedule(tmp_path, mirrored, divisions, fixed_matches, venue_requirements):
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements)
+    schedule = generator.generate(seed=1, mirrored=mirrored, lazy=True)
+    fixtures = list(schedule)
+
+    assert isinstance(schedule, Schedule)
+    assert len(schedule) == len(fixtures) == sum(len(div.teams) * (len(div.teams) - 1) for div in divisions)
+    assert fixtures == sorted(fixtures, key=lambda f: (f.week, f.division, f.home_team))
+    assert validate_fixtures(schedule, divisions) == []
+
+    # The schedule streams in CSV order, so both writers give the same file
+    stream_fixtures_csv(schedule, tmp_path / "streamed.csv", seed=1)
+    write_fixtures_csv(fixtures, tmp_path / "sorted.csv", seed=1)
+    assert (tmp_path / "streamed.csv").read_text() == (tmp_path / "sorted.csv").read_text()
+
+
+def test_render_outputs(tmp_path, capsys, divisions):
+    fixtures = QuickGenerator(divisions, [], []).generate(seed=1)
+    index = FixtureIndex(fixtures, divisions)
+
+    for (division, week), matches in index.groups.items():
+        assert matches == sorted(
+            (f.home_team, f.away_team) for f in fixtures if (f.division, f.week) == (division, week)
+        )
+
+    # Every format renders from the one index, matching the file writers
+    outputs = render_outputs(index, divisions, seed=3)
+    write_fixtures_csv(fixtures, tmp_path / "fixtures.csv", seed=3)
+    write_fixtures_html(fixtures, divisions, tmp_path / "fixtures.html", seed=3)
+    print_fixture_grids(fixtures, divisions, tmp_path / "fixtures.txt", seed=3)
+    assert outputs["csv"].encode() == (tmp_path / "fixtures.csv").read_bytes()
+    assert outputs["html"] == (tmp_path / "fixtures.html").read_text()
+    assert outputs["txt"] == (tmp_path / "fixtures.txt").read_text()
+    assert f"{index.matches('1st XI Premier', 1)[0][0]}-" in capsys.readouterr().out
+
+
+def test_write_outputs(tmp_path, divisions):
+    fixtures = QuickGenerator(divisions, [], []).generate(seed=1)
+    (tmp_path / "fixtures.csv").write_text("stale")
+    (tmp_path / "fixtures.csv").chmod(0o600)
+
+    paths = write_outputs(fixtures, divisions, tmp_path, seed=3, formats=["csv", "txt"])
+    outputs = render_outputs(fixtures, divisions, seed=3, formats=["csv", "txt"])
+
+    assert paths == {"csv": tmp_path / "fixtures.csv", "txt": tmp_path / "fixtures.txt"}
+    assert (tmp_path / "fixtures.csv").read_bytes() == outputs["csv"].encode()
+    assert (tmp_path / "fixtures.txt").read_text() == outputs["txt"]
+    # Only the finished files are left, no temporary files
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["fixtures.csv", "fixtures.txt"]
+    # A replaced file keeps its mode, a new one is readable by all
+    assert (tmp_path / "fixtures.csv").stat().st_mode & 0o777 == 0o600
+    assert (tmp_path / "fixtures.txt").stat().st_mode & 0o777 == 0o644
+    with pytest.raises(ValueError, match="pdf"):
+        write_outputs(fixtures, divisions, tmp_path, formats=["pdf"])
+
+
+@pytest.mark.parametrize("mirrored", [True, False])
+def test_soft_encodings_agree(mirrored, divisions, fixed_matches, venue_requirements):
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements, [{"AAA1", "BBB2"}])
+    results = {}
+    for encoding in ("half", "full"):
+        fixtures = generator.generate(seed=1, soft_encoding=encoding, mirrored=mirrored, time_limit=10)
+        assert validate_fixtures(fixtures, divisions) == []
+        results[encoding] = (generator.status, generator.objective, generator.trace.model_stats)
+
+    (half_status, half, half_stats), (full_status, full, full_stats) = results["half"], results["full"]
+    if half_status == full_status == "OPTIMAL":
+        assert half == full
+    assert half_stats["constraints"] < full_stats["constraints"]
+    assert half_stats["variables"] <= full_stats["variables"]
+
+    with pytest.raises(ValueError):
+        generator.generate(soft_encoding="quarter")
+
+
+def test_lexicographic_objective(tmp_path, divisions, fixed_matches, venue_requirements):
+    cache = ModelCache(tmp_path / "models")
+    store = SolutionStore(tmp_path / "solutions.sqlite")
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements, [{"AAA1", "BBB2"}])
+    for _ in range(2):  # Build, then load the objective levels from the cache
+        fixtures = generator.generate(
+            seed=1, objective_mode="lexicographic", model_cache=cache, solution_store=store, time_limit=20
+        )
+        assert validate_fixtures(fixtures, divisions) == []
+        levels = generator.trace.levels
+        assert list(levels) == [name for name in OBJECTIVE_LEVELS if name in levels]
+        assert generator.objective == sum(WEIGHTS[name] * value for name, value in levels.items())
+        assert generator.status in ("LEXICOGRAPHIC_OPTIMAL", "FEASIBLE")
+        assert generator.trace.stop_reason is not None
+        # Each stage's improving solutions, tagged with its level, on one clock
+        points = generator.trace.solutions
+        assert points and {p.level for p in points} <= set(levels)
+        assert [p.wall_time for p in points] == sorted(p.wall_time for p in points)
+    assert "load_model" in generator.trace.phases
+
+    # Lexicographic optimality is not weighted optimality: --reuse must not return it
+    key = input_fingerprint(divisions, fixed_matches, venue_requirements, [{"AAA1", "BBB2"}])
+    assert store.best(key) is not None
+    assert store.best(key, optimal_only=True) is None
+
+    class Counter(cp_model.CpSolverSolutionCallback):
+        def __init__(self):
+            super().__init__()
+            self.solutions = 0
+
+        def on_solution_callback(self):
+            self.solutions += 1
+
+    counter = Counter()
+    generator.generate(seed=1, objective_mode="lexicographic", solution_callback=counter, time_limit=20)
+    assert counter.solutions >= len(generator.trace.levels)
+
+    # The target applies to the weighted penalty, checked after each stage
+    fixtures = generator.generate(
+        seed=1, objective_mode="lexicographic", stopping=StoppingPolicy(target_objective=1e9, time_limit=20)
+    )
+    assert validate_fixtures(fixtures, divisions) == []
+    assert generator.trace.stop_reason == "target objective"
+    assert len(generator.trace.levels) == 1
+    assert generator.status == "FEASIBLE"
+
+    with pytest.raises(ValueError):
+        generator.generate(objective_mode="pareto")
+
+
+def test_table_mode_needs_mirrored_season(divisions):
+    generator = FixtureGenerator(divisions, [], [])
+    with pytest.raises(ValueError):
+        generator.generate(sequence_mode="table", mirrored=False)
+
+
+def test_pattern_table_mode(tmp_path, divisions, fixed_matches, venue_requirements):
+    cache = ModelCache(tmp_path / "models")
+    store = SolutionStore(tmp_path / "solutions.sqlite")
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements)
+    fixtures = generator.generate(seed=3, sequence_mode="table", model_cache=cache, solution_store=store)
+
+    assert len(fixtures) == 2 * 90
+    assert validate_fixtures(fixtures, divisions) == []
+
+    # A schedule hints the cached model's pattern literals too: one per team,
+    # consistent with the hinted venues
+    (proto_path,) = (tmp_path / "models").glob("*.txt")
+    season = Season.for_divisions(divisions, mirrored=True)
+    built = cache.load(proto_path.stem, MODEL_ENGINE, season)
+    generator._add_schedule_hints(built, fixtures)
+    proto = built.model.Proto()
+    hints = dict(zip(proto.solution_hint.vars, proto.solution_hint.values))
+    for choice in built.pattern_choice.values():
+        assert sum(hints[lit.Index()] for lit in choice) == 1
+    solver = cp_model.CpSolver()
+    solver.parameters.fix_variables_to_their_hinted_value = True
+    solver.parameters.symmetry_level = 0
+    assert solver.Solve(built.model) in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+
+def test_boolean_engine_avoids_ground_sharing(divisions, fixed_matches, venue_requirements):
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements)
+    fixtures = generator.generate(seed=1, engine="boolean")
+
+    coordinator = CrossDivisionCoordinator(divisions)
+    assert coordinator.check_violations(fixtures) == []
+
+
+def test_shared_venue_pairs_merge_conflicts(divisions):
+    conflicts = [{"AAA1", "AAA2", "BBB2"}, {"BBB2", "AAA1", "ZZZ1"}]
+    pairs = build_shared_venue_pairs(divisions, conflicts)
+    assert len(pairs) == 10 + 2  # One per club, plus AAA1-BBB2 and AAA2-BBB2
+    assert pairs[("AAA1", "AAA2")] == ["ground_sharing_1st_xi", "venue_conflicts"]
+    assert pairs[("AAA1", "BBB2")] == ["venue_conflicts"]
+
+    fixtures = [Fixture(1, "AAA1", "CCC1", "1st XI Premier"), Fixture(1, "BBB2", "CCC2", "2nd XI Premier")]
+    assert CrossDivisionCoordinator(divisions).check_violations(fixtures) == []
+    assert CrossDivisionCoordinator(divisions, conflicts).check_violations(fixtures) == [
+        "Venue conflict: AAA1 and BBB2 both home in weeks [1]"
+    ]
+
+    # A conflict between ground sharing teams adds no clash literals
+    generator = FixtureGenerator(divisions, [], [], [{"AAA1", "AAA2"}])
+    generator.generate(seed=1, time_limit=1)
+    stats = generator.trace.model_stats
+    generator = FixtureGenerator(divisions, [], [])
+    generator.generate(seed=1, time_limit=1)
+    assert generator.trace.model_stats == stats
+
+
+def test_symmetry_breaking_keeps_requirements(divisions, fixed_matches, venue_requirements):
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements)
+    fixtures = generator.generate(seed=2, symmetry_breaking=True)
+
+    assert validate_fixtures(fixtures, divisions) == []
+    by_week_teams = {(f.week, frozenset((f.home_team, f.away_team))) for f in fixtures}
+    assert (3, frozenset(("AAA1", "BBB1"))) in by_week_teams
+
+
+def test_symmetry_breaking_anchors_unpinned_league(divisions):
+    generator = FixtureGenerator(divisions, [], [])
+    fixtures = generator.generate(seed=2, symmetry_breaking=True)
+
+    assert validate_fixtures(fixtures, divisions) == []
+    assert any(f.week == 1 and f.home_team == "AAA1" and f.away_team == "BBB1" for f in fixtures)
+
+
+def test_symmetry_groups():
+    divisions = [make_division("1st XI Premier", ["AAA", "BBB", "CCC", "DDD"], 1)]
+    pinned = pinned_teams([FixedMatch(week=3, team1="AAA1", team2="BBB1")], [])
+
+    assert interchangeable_teams(divisions, [("CCC1", "XXX1")], pinned) == {}
+    assert interchangeable_teams(divisions, [], pinned) == {"1st XI Premier": ["CCC1", "DDD1"]}
+    assert unpinned_components(divisions, [], pinned) == []
+    assert unpinned_components(divisions, [], set()) == [divisions]
+
+
+def test_circle_round_robin():
+    teams = [f"{club}1" for club in CLUBS]
+    rounds = circle_round_robin(teams)
+
+    assert len(rounds) == len(teams) - 1
+    assert all(sorted(t for pair in pairs for t in pair) == sorted(teams) for pairs in rounds)
+    met = [frozenset(pair) for pairs in rounds for pair in pairs]
+    assert len(set(met)) == len(met) == len(teams) * (len(teams) - 1) // 2
+
+
+@pytest.mark.parametrize("seed", [None, 5])
+def test_quick_generator(seed, divisions, fixed_matches, venue_requirements):
+    fixtures = QuickGenerator(divisions, fixed_matches, venue_requirements).generate(seed=seed)
+
+    assert len(fixtures) == 2 * 90
+    assert validate_fixtures(fixtures, divisions) == []
+    by_week_teams = {(f.week, frozenset((f.home_team, f.away_team))) for f in fixtures}
+    assert (3, frozenset(("AAA1", "BBB1"))) in by_week_teams
+    venue = {(f.home_team, f.week): "h" for f in fixtures}
+    venue.update({(f.away_team, f.week): "a" for f in fixtures})
+    assert venue[("CCC2", 2)] == "h"
+    assert venue[("DDD1", 12)] == "a"
+
+
+def test_quick_generator_with_byes():
+    divisions = [make_division("1st XI", CLUBS[:6], 1), make_division("2nd XI", CLUBS[:5], 2)]
+    fixtures = QuickGenerator(divisions, [], []).generate(seed=2)
+
+    assert len(fixtures) == 2 * (15 + 10)
+    assert {f.week for f in fixtures} == set(range(1, 11))
+    games = {(t, f.week) for f in fixtures for t in (f.home_team, f.away_team)}
+    assert len(games) == 2 * len(fixtures)
+    assert not [issue for issue in validate_fixtures(fixtures, divisions) if "consecutive" not in issue]
+
+
+def test_validator_reports_broken_schedule(divisions, fixed_matches, venue_requirements):
+    fixtures = QuickGenerator(divisions, fixed_matches, venue_requirements).generate(seed=1)
+    first = next(f for f in fixtures if f.division == "1st XI Premier")
+    h, a, week = first.home_team, first.away_team, first.week
+    reverse = next(f for f in fixtures if (f.home_team, f.away_team) == (a, h))
+    dropped = next(f for f in fixtures if f.division == "2nd XI Premier")
+
+    broken = [f for f in fixtures if f not in (first, reverse, dropped)]
+    broken.append(Fixture(week=week, home_team=a, away_team=h, division=first.division))
+    broken.append(Fixture(week=week + 1, home_team=h, away_team=a, division=first.division))
+    issues = validate_fixtures(broken, divisions)
+
+    assert {
+        f"{dropped.home_team}: plays 17 games, expected 18",
+        f"{dropped.away_team}: 8 away games, expected 9",
+        f"{min(h, a)} vs {max(h, a)}: consecutive reverse fixtures in weeks {[week, week + 1]}",
+    } <= set(issues)
+    assert FixtureValidator(divisions).validate(fixtures) == []
+    assert validate_fixtures(Schedule.from_fixtures(broken, divisions), divisions) == issues
+
+
+def test_schedule_from_fixtures(divisions):
+    fixtures = QuickGenerator(divisions, [], []).generate(seed=1)
+    schedule = Schedule.from_fixtures(fixtures, divisions)
+
+    assert not hasattr(fixtures[0], "__dict__")
+    assert schedule.teams[:len(divisions[0].teams)] == [t.code for t in divisions[0].teams]
+    assert list(schedule) == sorted(fixtures, key=lambda f: (f.week, f.division, f.home_team))
+    for div in divisions:
+        rows = list(schedule.fixtures(schedule.division_rows(div.name)))
+        assert rows == sorted((f for f in fixtures if f.division == div.name), key=lambda f: (f.week, f.home_team))
+    assert len(schedule.division_rows("No such division")) == 0
+    assert CrossDivisionCoordinator(divisions).check_violations(schedule) == (
+        CrossDivisionCoordinator(divisions).check_violations(fixtures)
+    )
+
+
+@pytest.mark.parametrize("engine", ["boolean", "week_var"])
+def test_generate_without_warm_start(engine, divisions, fixed_matches, venue_requirements):
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements)
+    fixtures = generator.generate(seed=4, engine=engine, warm_start=False)
+
+    assert validate_fixtures(fixtures, divisions) == []
+
+
+@pytest.mark.parametrize("engine", ["boolean", "week_var"])
+def test_incremental_resolve(engine, tmp_path, divisions, fixed_matches, venue_requirements):
+    previous = FixtureGenerator(divisions, fixed_matches, venue_requirements).generate(seed=1)
+    write_fixtures_csv(previous, tmp_path / "fixtures.csv", seed=1)
+    previous = load_fixtures(tmp_path / "fixtures.csv")
+    assert affected_divisions(previous, divisions, fixed_matches, venue_requirements) == set()
+
+    # EEE2 must now be at the opposite venue in week 5
+    was_home = any(f.week == 5 and f.home_team == "EEE2" for f in previous)
+    new_requirements = venue_requirements + [VenueRequirement(team="EEE2", venue="a" if was_home else "h", week=5)]
+    affected = affected_divisions(previous, divisions, fixed_matches, new_requirements)
+    assert affected == {"2nd XI Premier"}
+    assert affected_divisions(previous, divisions, fixed_matches, new_requirements, include_neighbours=True) == {
+        "1st XI Premier",
+        "2nd XI Premier",
+    }
+
+    generator = FixtureGenerator(divisions, fixed_matches, new_requirements)
+    fixtures = generator.generate(
+        engine=engine,
+        previous=previous,
+        frozen_divisions={"1st XI Premier"},
+    )
+
+    assert validate_fixtures(fixtures, divisions) == []
+    assert affected_divisions(fixtures, divisions, fixed_matches, new_requirements) == set()
+    assert fixture_set(fixtures, "1st XI Premier") == fixture_set(previous, "1st XI Premier")
+
+
+@pytest.mark.parametrize("engine", ["boolean", "week_var"])
+def test_lns_improves_schedule(engine, divisions, fixed_matches, venue_requirements):
+    draft = QuickGenerator(divisions, fixed_matches, venue_requirements).generate(seed=1)
+    improver = LNSImprover(divisions, fixed_matches, venue_requirements)
+    fixtures = improver.improve(
+        draft, seed=1, engine=engine, stopping=StoppingPolicy(time_limit=10), neighbourhood_time_limit=2, processes=1
+    )
+
+    assert validate_fixtures(fixtures, divisions) == []
+    points = improver.trace.solutions
+    assert improver.objective == points[-1].objective <= points[0].objective
+    assert [p.objective for p in points] == sorted((p.objective for p in points), reverse=True)
+    # No target was set: a zero penalty is reported as optimal
+    assert improver.trace.stop_reason != "target objective"
+    assert (improver.trace.stop_reason == "optimal") == (improver.objective == 0)
+
+
+def test_lns_rejects_incomplete_schedule(divisions, fixed_matches, venue_requirements):
+    draft = QuickGenerator(divisions, fixed_matches, venue_requirements).generate(seed=1)
+    with pytest.raises(ValueError):
+        LNSImprover(divisions, fixed_matches, venue_requirements).improve(draft[1:], processes=1)
+
+
+def test_parse_seeds():
+    assert parse_seeds("1-4") == [1, 2, 3, 4]
+    assert parse_seeds("1-2, 7,10-11") == [1, 2, 7, 10, 11]
+    with pytest.raises(ValueError):
+        parse_seeds(",")
+
+
+def test_portfolio_keeps_best_distinct(tmp_path, divisions, fixed_matches, venue_requirements):
+    # A stored best schedule must not become every seed's starting point
+    store = SolutionStore(tmp_path / "solutions.sqlite")
+    FixtureGenerator(divisions, fixed_matches, venue_requirements).generate(
+        seed=1, time_limit=10, solution_store=store, model_cache=ModelCache(tmp_path / "models")
+    )
+
+    runner = PortfolioRunner(divisions, fixed_matches, venue_requirements)
+    results = runner.run([1, 2, 3, 4], time_limit=10, processes=2, top_k=3, solution_store=store)
+
+    assert len(results) == 3
+    assert results == sorted(results, key=lambda r: r.objective)
+    for result in results:
+        assert validate_fixtures(result.fixtures, divisions) == []
+    schedules = [{(f.week, f.home_team, f.away_team) for f in result.fixtures} for result in results]
+    assert len({frozenset(schedule) for schedule in schedules}) == 3
+
+
+def test_batch_runner(tmp_path, divisions):
+    for name, rows in [("small", divisions[:1]), ("full", divisions), ("broken", divisions * 2)]:
+        scenario_dir = tmp_path / "scenarios" / name
+        scenario_dir.mkdir(parents=True)
+        lines = [",".join([div.name] + [t.code for t in div.teams]) for div in rows]
+        (scenario_dir / "divisions.csv").write_text("\n".join(lines) + "\n")
+    (tmp_path / "scenarios" / "full" / "venReq.csv").write_text("CCC2,h,2\n")
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# scenarios\nscenarios/small\n\nscenarios/full\nscenarios/broken\n")
+
+    scenarios = load_manifest(manifest)
+    assert [s.name for s in scenarios] == ["small", "full", "broken"]
+    results = BatchRunner(scenarios, tmp_path / "out").run(time_limit=10, formats=["csv"], cpus=2)
+
+    assert [r.name for r in results] == ["small", "full", "broken"]
+    small, full, broken = results
+    assert (small.teams, small.fixtures, small.violations) == (10, 90, 0)
+    assert (full.teams, full.fixtures, full.violations) == (20, 180, 0)
+    assert full.objective is not None
+    assert broken.error is not None and broken.objective is None
+    assert (tmp_path / "out" / "full" / "fixtures.csv").exists()
+    assert not (tmp_path / "out" / "broken").exists()
+
+
+def test_solve_trace(tmp_path, divisions, fixed_matches, venue_requirements):
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements)
+    generator.generate(seed=1, engine="week_var")
+    trace = generator.trace
+
+    assert {"variables", "linkage", "one_per_week", "soft_constraints", "solve"} <= set(trace.phases)
+    assert trace.model_stats["variables"] > 0
+    assert 0 < trace.memory["build"] <= trace.memory["solve"]
+    assert trace.model_stats["constraints"] == sum(
+        count for name, count in trace.model_stats.items() if name.startswith("constraints_")
+    )
+    assert trace.solutions
+    assert [s.objective for s in trace.solutions] == sorted((s.objective for s in trace.solutions), reverse=True)
+    assert trace.solutions[-1].objective == trace.objective == generator.objective
+
+    trace.write(tmp_path / "trace.json")
+    trace.write(tmp_path / "trace.csv")
+    assert json.loads((tmp_path / "trace.json").read_text())["status"] == generator.status
+    assert len((tmp_path / "trace.csv").read_text().splitlines()) == len(trace.solutions) + 1
+
+
+@pytest.mark.parametrize("engine", ["boolean", "week_var"])
+def test_model_cache(tmp_path, engine, divisions, fixed_matches, venue_requirements):
+    cache = ModelCache(tmp_path)
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements)
+    generator.generate(seed=1, engine=engine, model_cache=cache)
+    assert "variables" in generator.trace.phases
+    built_stats = generator.trace.model_stats
+
+    fixtures = generator.generate(seed=1, engine=engine, model_cache=cache)
+    assert "load_model" in generator.trace.phases
+    assert "variables" not in generator.trace.phases
+    assert generator.trace.model_stats == built_stats
+    assert validate_fixtures(fixtures, divisions) == []
+    assert (3, "AAA1", "BBB1") in fixture_set(fixtures, "1st XI Premier") | {
+        (w, a, h) for w, h, a in fixture_set(fixtures, "1st XI Premier")
+    }
+
+    # Another seed shuffles the build, so it has its own entry
+    generator.generate(seed=2, engine=engine, model_cache=cache)
+    assert "variables" in generator.trace.phases
+
+    # Different inputs use a different cache entry
+    generator = FixtureGenerator(divisions, [], venue_requirements)
+    generator.generate(seed=1, engine=engine, model_cache=cache)
+    assert "variables" in generator.trace.phases
+
+
+@pytest.mark.parametrize("engine", ["boolean", "week_var"])
+def test_lean_build(tmp_path, engine, divisions, fixed_matches, venue_requirements):
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements)
+    for lean in (True, False):
+        cache = ModelCache(tmp_path / str(lean))
+        fixtures = generator.generate(seed=1, engine=engine, model_cache=cache, lean=lean)
+        assert validate_fixtures(fixtures, divisions) == []
+
+        # Only the debug build names its variables
+        (exported,) = (tmp_path / str(lean)).glob("*.txt")
+        assert ('name: "home_AAA1_1"' in exported.read_text()) is not lean
+
+
+def test_solution_store(tmp_path, capsys, monkeypatch, divisions, fixed_matches, venue_requirements):
+    store = SolutionStore(tmp_path / "solutions.sqlite")
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements)
+    fixtures = generator.generate(seed=1, solution_store=store)
+
+    best = store.best(input_fingerprint(divisions, fixed_matches, venue_requirements, []))
+    assert best.seed == 1
+    assert best.objective == generator.objective
+    assert best.violations == 0
+    assert fixture_set(best.fixtures, "2nd XI Premier") == fixture_set(fixtures, "2nd XI Premier")
+    assert (store.best(input_fingerprint(divisions, fixed_matches, venue_requirements, []), optimal_only=True)
+            is not None) == (generator.status == "OPTIMAL")
+
+    # Changed requirements: no exact match, hinted from the same divisions' schedule
+    assert store.best(input_fingerprint(divisions, [], venue_requirements, [])) is None
+    capsys.readouterr()
+    FixtureGenerator(divisions, [], venue_requirements).generate(solution_store=store)
+    assert "hints from stored solution for other requirements" in capsys.readouterr().out
+
+    # A seeded run keeps to its own draft, so the seed reproduces its schedule
+    FixtureGenerator(divisions, [], venue_requirements).generate(seed=2, solution_store=store)
+    assert "hints from stored solution" not in capsys.readouterr().out
+
+    # Other weights or season shape: penalties are not comparable, so no fallback
+    league = league_fingerprint(divisions)
+    assert store.best_similar(league) is not None
+    assert store.best_similar(league_fingerprint(divisions, mirrored=False)) is None
+    monkeypatch.setitem(WEIGHTS, "consecutive_3", 60)
+    assert store.best_similar(league) is None
+
+
+def test_stopping_policy_target(divisions, fixed_matches, venue_requirements):
+    generator = FixtureGenerator(divisions, fixed_matches, venue_requirements)
+    fixtures = generator.generate(seed=1, warm_start=False, stopping=StoppingPolicy(target_objective=1e9))
+
+    assert generator.trace.stop_reason == "target objective"
+    assert generator.trace.solutions
+    assert validate_fixtures(fixtures, divisions) == []
+
+
+def test_stopping_policy_check():
+    policy = StoppingPolicy(gap=0.05, target_objective=100)
+    assert policy.check(objective=100, gap=0.5) == "target objective"
+    assert policy.check(objective=1000, gap=0.05) == "gap"
+    assert policy.check(objective=1000, gap=0.5) is None
+    assert StoppingPolicy().check(objective=0, gap=0) is None
+
+
+def test_unknown_engine_rejected(divisions):
+    generator = FixtureGenerator(divisions, [], [])
+    with pytest.raises(ValueError):
+        generator.generate(engine="nope")
+
+
+def test_decomposed_generator(divisions, fixed_matches, venue_requirements):
+    generator = DecomposedGenerator(divisions, fixed_matches, venue_requirements)
+    fixtures = generator.generate(seed=1, coordination_time_limit=10, processes=1)
+
+    assert len(fixtures) == 2 * 90
+    assert validate_fixtures(fixtures, divisions) == []
+    assert generator.objective is not None
+
+    by_week_teams = {(f.week, frozenset((f.home_team, f.away_team))) for f in fixtures}
+    assert (3, frozenset(("AAA1", "BBB1"))) in by_week_teams
+    venue = {(f.home_team, f.week): "h" for f in fixtures}
+    venue.update({(f.away_team, f.week): "a" for f in fixtures})
+    assert venue[("CCC2", 2)] == "h"
+    assert venue[("DDD1", 12)] == "a"
+
+
+def test_decomposed_division_status(divisions):
+    # Every team at home in week 1 can never be a round robin: proven infeasible, so it is cut
+    patterns = {t.code: (1,) + (0, 1) * 4 for t in divisions[0].teams}
+    name, status, fixtures = _solve_division(divisions[0], [], patterns, "boolean", 10, 1)
+    assert (name, status, fixtures) == ("1st XI Premier", "INFEASIBLE", [])
+
+    # Division solves that run out of time are retried rather than cut
+    generator = DecomposedGenerator(divisions, [], [])
+    fixtures = generator.generate(seed=1, coordination_time_limit=10, division_time_limit=0.001, processes=1)
+    assert validate_fixtures(fixtures, divisions) == []
+
+
+def test_legal_patterns_respect_sequence_rules():
+    patterns = legal_patterns(9)
+    assert patterns
+    for pattern, runs in patterns:
+        season = pattern + tuple(1 - h for h in pattern)
+        assert all(len(set(season[i:i + 4])) == 2 for i in range(len(season) - 3))
+        assert runs >= 0
+
+
+def test_synthetic_league():
+    options = {"club_overlap": 1.0, "venue_requirement_density": 0.2, "venue_conflict_groups": 3, "seed": 4}
+    league = synthetic_league(6, 8, **options)
+
+    assert [len(div.teams) for div in league.divisions] == [8] * 6
+    assert synthetic_league(6, 8, **options) == league
+    teams = {t.code for div in league.divisions for t in div.teams}
+    assert len(teams) == 48
+    # Every 2nd XI team's club also has a 1st XI team
+    assert len(build_ground_sharing_pairs(league.divisions)) == 16
+    assert not build_ground_sharing_pairs(synthetic_league(6, 8, club_overlap=0.0).divisions)
+    assert len(league.venue_requirements) == round(0.2 * 48)
+    assert all(len(group) >= 2 and group <= teams for group in league.venue_conflicts)
+
+    generator = FixtureGenerator(
+        league.divisions, league.fixed_matches, league.venue_requirements, league.venue_conflicts
+    )
+    fixtures = generator.generate(seed=1, time_limit=30)
+    assert validate_fixtures(fixtures, league.divisions) == []